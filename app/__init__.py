@@ -2,10 +2,16 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from config import Config
+from app.cache import ResponseCache
+from app.engines import engine_config, tune_engine, make_read_session
 
 # Initialize extensions (unbound to any specific app yet)
 db = SQLAlchemy()
 migrate = Migrate()
+cache = ResponseCache()
+
+# Read-only session for the dashboard, search and API read paths
+read_session = make_read_session(db)
 
 def create_app(config_class=Config):
     """
@@ -17,17 +23,60 @@ def create_app(config_class=Config):
     # Load configuration from config.py
     app.config.from_object(config_class)
 
+    # Engine profile (pool sizes, SQLite pragmas) plus the read-only 'read' bind
+    app.config.update(engine_config(app.config))
+
     # Bind extensions to the app instance
     db.init_app(app)
+    with app.app_context():
+        for key, engine in db.engines.items():
+            tune_engine(engine, app.config['DB_PROFILE'], read_only=key == 'read')
+    app.teardown_appcontext(lambda exc: read_session.remove())
     migrate.init_app(app, db)
+    cache.init_app(app)
 
     # Import and register Blueprints (Routes)
     # We do the import INSIDE the function to avoid circular import errors
     from app.routes import main_bp
+    from app.api import api_bp
     app.register_blueprint(main_bp)
+    app.register_blueprint(api_bp)
 
-    # Create tables automatically if they don't exist (optional, good for dev)
-    with app.app_context():
-        db.create_all()
+    # Register CLI commands (e.g. 'flask --app run skills add Terraform')
+    from app.cli import (schema_cli, skills_cli, stats_cli, dedupe_cli, pipeline_cli,
+                         export_cli, retention_cli)
+    app.cli.add_command(schema_cli)
+    app.cli.add_command(skills_cli)
+    app.cli.add_command(stats_cli)
+    app.cli.add_command(dedupe_cli)
+    app.cli.add_command(pipeline_cli)
+    app.cli.add_command(export_cli)
+    app.cli.add_command(retention_cli)
+
+    # No database work here: every worker process runs this on boot, so the
+    # schema is created once per deploy instead ('flask --app run schema init')
+    return app
+
+
+def init_schema():
+    """
+    Creates missing tables, indexes and the full-text search index.
+    Idempotent; must run inside an app context. Databases managed by
+    'flask db upgrade' only need it for the search index, which is kept
+    out of the migrations.
+    """
+    db.create_all()
+
+    # create_all() skips indexes on tables that already existed
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+
+    # Full-text search index (tsvector on Postgres, FTS5 on SQLite)
+    from app.search import ensure_search_index
+    ensure_search_index()
 
-    return app
\ No newline at end of file
+    # Dashboard stats: computed here and by the writers, never by a read
+    from app.stats import ensure_stats
+    if ensure_stats():
+        db.session.commit()
@@ -0,0 +1,300 @@
+import threading
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+
+from . import read_session
+from .models import AppCounter, ArchiveRollup, JobFingerprint, JobPosting, Skill, job_skills, JOBS_COUNTER
+
+# Salary percentiles reported per group
+PERCENTILES = (25, 50, 75, 90)
+
+# Groups with fewer salaries than this are left out (too noisy to compare)
+MIN_SAMPLES = 5
+
+# Rows per one-hot block when building the co-occurrence matrix
+COOCCURRENCE_CHUNK = 100_000
+
+PERIODS = {'week': 'W', 'month': 'M'}
+
+
+def _canonical_ids():
+    """Near-duplicates (reposts) are left out, like on the dashboard."""
+    return select(JobFingerprint.job_id).where(JobFingerprint.canonical_id.isnot(None))
+
+
+def _frame(stmt, columns):
+    """
+    Runs `stmt` and returns its rows as a DataFrame. Rows are read straight
+    from the DBAPI cursor: no ORM objects, no Row wrappers and no per-value
+    type processing (dates may arrive as strings; pandas parses them in bulk).
+    """
+    result = read_session.connection().execute(stmt)
+    try:
+        return pd.DataFrame.from_records(result.cursor.fetchall(), columns=columns)
+    finally:
+        result.close()
+
+
+def salary_frame():
+    """
+    One row per posting with a salary: id, location, date_posted, salary.
+    `salary` is the midpoint of the advertised range (or whichever end exists).
+    """
+    jobs = _frame(
+        select(JobPosting.id, JobPosting.location, JobPosting.date_posted,
+               JobPosting.salary_min, JobPosting.salary_max)
+        .where((JobPosting.salary_min.isnot(None)) | (JobPosting.salary_max.isnot(None)))
+        .where(JobPosting.id.not_in(_canonical_ids())),
+        ['id', 'location', 'date_posted', 'salary_min', 'salary_max'],
+    )
+    low = jobs['salary_min'].astype(float).to_numpy()
+    high = jobs['salary_max'].astype(float).to_numpy()
+    # Midpoint of the range, or whichever end is present
+    salary = np.where(np.isnan(low), high, np.where(np.isnan(high), low, (low + high) / 2))
+    jobs['salary'] = salary
+    jobs = jobs[np.isfinite(salary) & (salary > 0)]
+    return jobs.drop(columns=['salary_min', 'salary_max'])
+
+
+def skill_frame():
+    """
+    One row per (posting, skill) tag: job_id, skill.
+    Only integer ids come from the database; names are mapped in pandas.
+    """
+    tags = _frame(
+        select(job_skills.c.job_id, job_skills.c.skill_id)
+        .where(job_skills.c.job_id.not_in(_canonical_ids())),
+        ['job_id', 'skill_id'],
+    )
+    names = dict(read_session.execute(select(Skill.id, Skill.name)).all())
+    tags['skill'] = tags.pop('skill_id').map(names).astype('category')
+    return tags
+
+
+def posting_dates():
+    """date_posted per posting id (a Series), for joining onto skill tags."""
+    dates = _frame(select(JobPosting.id, JobPosting.date_posted)
+                   .where(JobPosting.id.not_in(_canonical_ids())), ['id', 'date_posted'])
+    return pd.to_datetime(dates.set_index('id')['date_posted'], format='ISO8601')
+
+
+def _week_start(dates):
+    """Monday 00:00 of each date's ISO week (vectorised)."""
+    return (dates - pd.to_timedelta(dates.dt.weekday, unit='D')).dt.normalize()
+
+
+def _period_start(dates, period):
+    if period == 'week':
+        return _week_start(dates)
+    return dates.dt.to_period(PERIODS[period]).dt.start_time
+
+
+def _percentile_table(frame, key, min_samples):
+    """[{key, count, mean, p25, ...}] per group."""
+    grouped = frame.groupby(key, sort=False, observed=True)['salary']
+    summary = grouped.agg(['count', 'mean'])
+    quantiles = grouped.quantile([p / 100 for p in PERCENTILES]).unstack()
+    quantiles.columns = [f'p{p}' for p in PERCENTILES]
+    summary = summary.join(quantiles)
+    summary = summary[summary['count'] >= min_samples]
+    # Time series read oldest first, categories biggest first
+    summary = summary.sort_index() if key == 'week' else summary.sort_values(['count', 'mean'], ascending=False)
+
+    rounded = summary.drop(columns='count').round(0)
+    return [
+        {key: name.isoformat() if hasattr(name, 'isoformat') else name,
+         'count': int(count), **{col: float(value) for col, value in values.items()}}
+        for name, count, values in zip(summary.index, summary['count'], rounded.to_dict('records'))
+    ]
+
+
+def salary_percentiles(by, min_samples=MIN_SAMPLES):
+    """
+    Salary distribution per skill, location or posting week.
+
+    Args:
+        by (str): 'skill', 'location' or 'week'.
+        min_samples (int): Minimum salaries for a group to be reported.
+
+    Returns:
+        list: [{<by>: value, 'count', 'mean', 'p25', 'p50', 'p75', 'p90'}]
+    """
+    salaries = salary_frame()
+    if by == 'skill':
+        frame = salaries.merge(skill_frame(), left_on='id', right_on='job_id')
+    elif by == 'location':
+        frame = salaries.assign(location=salaries['location'].fillna('Unknown'))
+    elif by == 'week':
+        frame = salaries.assign(week=_week_start(pd.to_datetime(salaries['date_posted'], format='ISO8601')).dt.date)
+    else:
+        raise ValueError(f"Unknown grouping: {by}")
+    if frame.empty:
+        return []
+    return _percentile_table(frame, by, min_samples)
+
+
+def skill_cooccurrence(top=20):
+    """
+    How often each pair of the `top` most demanded skills is asked for in
+    the same posting. The diagonal holds each skill's own posting count.
+
+    Returns:
+        dict: {'skills': [names], 'counts': [[int]], 'jaccard': [[float]]}
+    """
+    tags = skill_frame()
+    if tags.empty:
+        return {'skills': [], 'counts': [], 'jaccard': []}
+
+    skills = list(tags['skill'].value_counts().index[:top])
+    tags = tags[tags['skill'].isin(skills)]
+    job_codes, _ = pd.factorize(tags['job_id'])
+    skill_codes = pd.Categorical(tags['skill'], categories=skills).codes
+
+    # counts = M.T @ M over a jobs x skills one-hot matrix, built in blocks
+    counts = np.zeros((len(skills), len(skills)), dtype=np.int64)
+    n_jobs = job_codes.max() + 1
+    for start in range(0, n_jobs, COOCCURRENCE_CHUNK):
+        in_block = (job_codes >= start) & (job_codes < start + COOCCURRENCE_CHUNK)
+        block = np.zeros((min(COOCCURRENCE_CHUNK, n_jobs - start), len(skills)), dtype=np.float32)
+        block[job_codes[in_block] - start, skill_codes[in_block]] = 1.0
+        counts += (block.T @ block).astype(np.int64)
+
+    totals = np.diag(counts)
+    union = totals[:, None] + totals[None, :] - counts
+    jaccard = np.divide(counts, union, out=np.zeros(counts.shape), where=union > 0)
+    return {
+        'skills': skills,
+        'counts': counts.tolist(),
+        'jaccard': jaccard.round(3).tolist(),
+    }
+
+
+def rollup_frame():
+    """
+    Monthly rollups of archived postings (etl/retention.py): month, skill
+    (None on the totals row), jobs, tagged_jobs, salaried, salary_sum,
+    salary_min, salary_max.
+    """
+    rollups = _frame(
+        select(ArchiveRollup.month, ArchiveRollup.skill_id, ArchiveRollup.jobs, ArchiveRollup.tagged_jobs,
+               ArchiveRollup.salaried, ArchiveRollup.salary_sum, ArchiveRollup.salary_min,
+               ArchiveRollup.salary_max),
+        ['month', 'skill_id', 'jobs', 'tagged_jobs', 'salaried', 'salary_sum', 'salary_min', 'salary_max'],
+    )
+    names = dict(read_session.execute(select(Skill.id, Skill.name)).all())
+    rollups = rollups.astype({'jobs': 'int64', 'tagged_jobs': 'int64', 'salaried': 'int64',
+                              'salary_sum': float, 'salary_min': float, 'salary_max': float})
+    rollups['month'] = pd.to_datetime(rollups['month'], format='ISO8601')
+    rollups['skill'] = rollups.pop('skill_id').map(names)
+    return rollups
+
+
+def skill_demand(period='week', top=10):
+    """
+    Postings per period for the `top` most demanded skills, with each
+    skill's share of all skill-tagged postings in that period. Monthly
+    series include the archived months.
+
+    Returns:
+        dict: {'periods': [iso dates], 'series': {skill: [int]}, 'share': {skill: [float]}}
+    """
+    if period not in PERIODS:
+        raise ValueError(f"Unknown period: {period}")
+    tags = skill_frame()
+    periods_by_job = _period_start(posting_dates(), period)
+    tags['period'] = tags['job_id'].map(periods_by_job)
+    tags = tags.dropna(subset=['period'])
+    tags['skill'] = tags['skill'].astype(object)
+    counts = tags.groupby(['period', 'skill']).size()
+    postings = tags.groupby('period')['job_id'].nunique()
+
+    if period == 'month':
+        # Archived postings only survive as monthly rollups
+        rollups = rollup_frame()
+        totals = rollups['skill'].isna()
+        counts = counts.add(rollups[~totals].set_index(['month', 'skill'])['jobs']
+                            .rename_axis(['period', 'skill']), fill_value=0)
+        postings = postings.add(rollups[totals].set_index('month')['tagged_jobs'], fill_value=0)
+    if counts.empty:
+        return {'periods': [], 'series': {}, 'share': {}}
+
+    by_skill = counts.groupby(level='skill').sum()
+    skills = list(by_skill.sort_values(ascending=False, kind='stable').index[:top])
+    counts = counts.unstack(fill_value=0)
+
+    # Every period in range, including ones with no postings
+    step = 'W-MON' if period == 'week' else 'MS'
+    periods = pd.date_range(counts.index.min(), counts.index.max(), freq=step)
+    counts = counts.reindex(index=periods, columns=skills, fill_value=0)
+    postings = postings.reindex(periods, fill_value=0).to_numpy()
+    share = np.divide(counts.to_numpy(), postings[:, None], out=np.zeros(counts.shape),
+                      where=postings[:, None] > 0)
+
+    return {
+        'periods': [p.date().isoformat() for p in periods],
+        'series': {skill: counts[skill].astype(int).tolist() for skill in skills},
+        'share': {skill: share[:, i].round(4).tolist() for i, skill in enumerate(skills)},
+    }
+
+
+def salary_trend():
+    """
+    Advertised salary per posting month over the full history: live
+    postings plus the archived months' rollups. Percentiles can't be
+    rebuilt from rollups, so this reports count, mean, min and max.
+
+    Returns:
+        list: [{'month', 'count', 'mean', 'min', 'max'}], oldest first
+    """
+    salaries = salary_frame()
+    months = pd.to_datetime(salaries['date_posted'], format='ISO8601').dt.to_period('M').dt.start_time
+    live = salaries.groupby(months)['salary'].agg(['count', 'sum', 'min', 'max'])
+
+    rollups = rollup_frame()
+    rollups = rollups[rollups['skill'].isna() & (rollups['salaried'] > 0)]
+    archived = (rollups.set_index('month')[['salaried', 'salary_sum', 'salary_min', 'salary_max']]
+                .set_axis(['count', 'sum', 'min', 'max'], axis=1))
+
+    # A month can be partly archived: add the counts, combine the extremes
+    both = pd.concat([live, archived])
+    trend = both.groupby(level=0).agg({'count': 'sum', 'sum': 'sum', 'min': 'min', 'max': 'max'}).sort_index()
+    return [
+        {'month': month.date().isoformat(), 'count': int(row['count']),
+         'mean': round(float(row['sum'] / row['count']), 0),
+         'min': float(row['min']), 'max': float(row['max'])}
+        for month, row in trend.iterrows() if row['count']
+    ]
+
+
+class AnalyticsCache:
+    """
+    Analytics results of the current job-data generation. The loader bumps
+    the generation with every commit, so a result is computed once after
+    each load and then served from memory. Checking costs one tiny SELECT.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.generation = None
+        self._results = {}
+
+    def get(self, compute, *args):
+        # Read where the data is read, so results match the generation they're cached under
+        generation = AppCounter.get(JOBS_COUNTER, read_session) or 0
+        key = (compute.__name__, args)
+        with self._lock:
+            if generation != self.generation:
+                self.generation, self._results = generation, {}
+            if key not in self._results:
+                self._results[key] = compute(*args)
+            return self._results[key]
+
+
+_cache = AnalyticsCache()
+
+
+def cached(compute, *args):
+    """`compute(*args)`, served from the per-generation cache."""
+    return _cache.get(compute, *args)
@@ -0,0 +1,273 @@
+import base64
+import hashlib
+import json
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify, url_for
+from sqlalchemy import select, tuple_, func
+
+from app import read_session
+from app.models import AppCounter, JobFingerprint, JobPosting, Skill, job_skills, JOBS_COUNTER
+
+# JSON API for downstream consumers
+api_bp = Blueprint('api', __name__, url_prefix='/api')
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+# Fields a caller may ask for with ?fields=...; 'skills' is resolved separately
+JOB_FIELDS = {
+    'id': JobPosting.id,
+    'title': JobPosting.title,
+    'company': JobPosting.company,
+    'location': JobPosting.location,
+    'is_remote': JobPosting.is_remote,
+    'salary_min': JobPosting.salary_min,
+    'salary_max': JobPosting.salary_max,
+    'currency': JobPosting.currency,
+    'url': JobPosting.url,
+    'source_site': JobPosting.source_site,
+    'date_posted': JobPosting.date_posted,
+    'description': JobPosting.description,
+}
+DEFAULT_FIELDS = ['id', 'title', 'company', 'location', 'is_remote', 'salary_min',
+                  'salary_max', 'currency', 'url', 'source_site', 'date_posted', 'skills']
+
+
+class ApiError(Exception):
+    """Raised for bad query parameters; rendered as a 400 JSON response."""
+
+
+@api_bp.errorhandler(ApiError)
+def handle_api_error(error):
+    return jsonify({"status": "error", "message": str(error)}), 400
+
+
+def encode_cursor(date_posted, job_id):
+    raw = json.dumps([date_posted.isoformat(), job_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        date_str, job_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(date_str), int(job_id)
+    except (ValueError, TypeError):
+        raise ApiError("Invalid cursor")
+
+
+def _parse_bool(value):
+    if value.lower() in ('1', 'true', 'yes'):
+        return True
+    if value.lower() in ('0', 'false', 'no'):
+        return False
+    raise ApiError(f"Invalid boolean: {value}")
+
+
+def _parse_fields(value):
+    if not value:
+        return DEFAULT_FIELDS
+    fields = [f.strip() for f in value.split(',') if f.strip()]
+    unknown = [f for f in fields if f not in JOB_FIELDS and f != 'skills']
+    if unknown:
+        raise ApiError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def _filtered_query(args, columns):
+    """Builds the SELECT for /api/jobs from the query-string filters."""
+    stmt = select(*columns).where(JobPosting.date_posted.isnot(None))
+
+    skills = [s.lower() for s in args.getlist('skill') if s]
+    if skills:
+        # Jobs tagged with ANY of the requested skills
+        # (skill ids first, so job_skills is read through its skill_id index)
+        stmt = stmt.where(JobPosting.id.in_(
+            select(job_skills.c.job_id).where(job_skills.c.skill_id.in_(
+                select(Skill.id).where(func.lower(Skill.name).in_(skills))
+            ))
+        ))
+
+    if args.get('location'):
+        stmt = stmt.where(JobPosting.location.ilike(f"%{args['location']}%"))
+    if args.get('remote'):
+        stmt = stmt.where(JobPosting.is_remote == _parse_bool(args['remote']))
+    if args.get('source'):
+        stmt = stmt.where(JobPosting.source_site == args['source'])
+    if args.get('distinct') and _parse_bool(args['distinct']):
+        # Hide reposts / syndicated copies, keeping the canonical posting
+        stmt = stmt.where(JobPosting.id.not_in(
+            select(JobFingerprint.job_id).where(JobFingerprint.canonical_id.isnot(None))
+        ))
+
+    # Salary range: keep postings whose advertised range overlaps the request
+    try:
+        salary_min = args.get('salary_min', type=float)
+        salary_max = args.get('salary_max', type=float)
+    except ValueError:
+        raise ApiError("Salary bounds must be numbers")
+    if salary_min is not None:
+        stmt = stmt.where(func.coalesce(JobPosting.salary_max, JobPosting.salary_min) >= salary_min)
+    if salary_max is not None:
+        stmt = stmt.where(func.coalesce(JobPosting.salary_min, JobPosting.salary_max) <= salary_max)
+
+    return stmt
+
+
+def _skills_for(job_ids):
+    """Returns {job_id: [skill names]} for a page of jobs in one query."""
+    skills = {job_id: [] for job_id in job_ids}
+    rows = read_session.execute(
+        select(job_skills.c.job_id, Skill.name).join(Skill, Skill.id == job_skills.c.skill_id)
+        .where(job_skills.c.job_id.in_(job_ids)).order_by(Skill.name)
+    )
+    for job_id, name in rows:
+        skills[job_id].append(name)
+    return skills
+
+
+def _serialize(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+@api_bp.route('/jobs')
+def list_jobs():
+    """
+    Lists job postings, newest first, with keyset pagination.
+
+    Query parameters:
+        cursor        Opaque value from a previous response's 'next_cursor'
+        limit         Page size (default 50, max 200)
+        skill         Skill name, repeatable (matches any)
+        location      Case-insensitive substring of the location
+        remote        true / false
+        salary_min    Lower bound of the wanted salary range
+        salary_max    Upper bound of the wanted salary range
+        source        Exact source site, e.g. 'Adzuna'
+        distinct      true: leave out near-duplicates of other postings
+        fields        Comma-separated list of fields to return
+
+    Responses carry an ETag tied to the job-data generation, so polling
+    clients can send If-None-Match and get a cheap 304 until new data lands.
+    """
+    # 1. Conditional GET: answer before touching job_postings. The generation
+    #    comes from the same (possibly replica) session as the rows below.
+    generation = AppCounter.get(JOBS_COUNTER, read_session) or 0
+    canonical_args = sorted(request.args.items(multi=True))
+    etag = hashlib.sha1(json.dumps([generation, canonical_args]).encode()).hexdigest()
+    if etag in request.if_none_match:
+        response = jsonify()
+        response.status_code = 304
+        response.set_etag(etag)
+        return response
+
+    # 2. Parse parameters
+    limit = min(max(request.args.get('limit', DEFAULT_LIMIT, type=int), 1), MAX_LIMIT)
+    fields = _parse_fields(request.args.get('fields'))
+    column_names = [f for f in fields if f != 'skills']
+    # id and date_posted are always needed to build the cursor
+    select_names = list(dict.fromkeys(column_names + ['id', 'date_posted']))
+
+    # 3. Keyset pagination on (date_posted, id) - no OFFSET scans
+    stmt = _filtered_query(request.args, [JOB_FIELDS[name] for name in select_names])
+    if request.args.get('cursor'):
+        cursor_date, cursor_id = decode_cursor(request.args['cursor'])
+        stmt = stmt.where(tuple_(JobPosting.date_posted, JobPosting.id) < tuple_(cursor_date, cursor_id))
+    stmt = stmt.order_by(JobPosting.date_posted.desc(), JobPosting.id.desc()).limit(limit + 1)
+
+    rows = read_session.execute(stmt).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # 4. Build the payload
+    skills = _skills_for([row.id for row in rows]) if 'skills' in fields and rows else {}
+    data = []
+    for row in rows:
+        item = {name: _serialize(getattr(row, name)) for name in column_names}
+        if 'skills' in fields:
+            item['skills'] = skills.get(row.id, [])
+        data.append(item)
+
+    next_cursor = encode_cursor(rows[-1].date_posted, rows[-1].id) if has_more else None
+    payload = {
+        "data": data,
+        "count": len(data),
+        "next_cursor": next_cursor,
+        "next": url_for('api.list_jobs', **{**request.args.to_dict(flat=False), 'cursor': next_cursor},
+                        _external=True) if next_cursor else None,
+    }
+
+    response = jsonify(payload)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+# --- Analytics (computed once per data load, see app/analytics.py) ---
+# pandas/NumPy are imported by the first analytics request, not at worker boot
+
+SALARY_GROUPINGS = ('skill', 'location', 'week')
+
+
+def _bounded_int(name, default, low, high):
+    value = request.args.get(name, default, type=int)
+    return min(max(value, low), high)
+
+
+@api_bp.route('/analytics/salaries')
+def salary_analytics():
+    """
+    Salary percentiles (p25/p50/p75/p90) of the advertised range midpoint.
+
+    Query parameters:
+        by            skill (default), location or week
+        min_samples   Smallest group reported (default 5)
+    """
+    from app.analytics import cached, salary_percentiles
+
+    by = request.args.get('by', 'skill')
+    if by not in SALARY_GROUPINGS:
+        raise ApiError(f"'by' must be one of: {', '.join(SALARY_GROUPINGS)}")
+    min_samples = _bounded_int('min_samples', 5, 1, 10_000)
+    data = cached(salary_percentiles, by, min_samples)
+    return jsonify({"by": by, "count": len(data), "data": data})
+
+
+@api_bp.route('/analytics/salaries/monthly')
+def salary_trend_analytics():
+    """Salary count, mean, min and max per posting month, archived months included."""
+    from app.analytics import cached, salary_trend
+
+    data = cached(salary_trend)
+    return jsonify({"count": len(data), "data": data})
+
+
+@api_bp.route('/analytics/skills/cooccurrence')
+def skill_cooccurrence_analytics():
+    """
+    Pairwise co-occurrence counts (and Jaccard index) of the most demanded skills.
+
+    Query parameters:
+        top           Number of skills (default 20, max 100)
+    """
+    from app.analytics import cached, skill_cooccurrence
+
+    return jsonify(cached(skill_cooccurrence, _bounded_int('top', 20, 1, 100)))
+
+
+@api_bp.route('/analytics/skills/demand')
+def skill_demand_analytics():
+    """
+    Postings per week or month for the most demanded skills.
+
+    Query parameters:
+        period        week (default) or month
+        top           Number of skills (default 10, max 50)
+    """
+    from app.analytics import cached, skill_demand, PERIODS
+
+    period = request.args.get('period', 'week')
+    if period not in PERIODS:
+        raise ApiError(f"'period' must be one of: {', '.join(PERIODS)}")
+    return jsonify({"period": period, **cached(skill_demand, period, _bounded_int('top', 10, 1, 50))})
@@ -0,0 +1,156 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import request, make_response
+
+
+class MemoryBackend:
+    """In-process LRU cache with a per-entry TTL. Each worker has its own."""
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def size(self):
+        return len(self._data)
+
+
+class RedisBackend:
+    """Shared cache in a Redis-compatible server (needs the 'redis' package)."""
+
+    def __init__(self, url, prefix='devpulse:'):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=max(int(ttl), 1))
+
+    def size(self):
+        return None
+
+
+class ResponseCache:
+    """
+    Caches whole rendered responses, keyed by data generation, route and
+    normalised query string.
+
+    The loader bumps the generation counter in the same transaction as its
+    inserts, so the first request after a pipeline commit sees a new key
+    and re-renders; stale entries simply age out of the LRU / TTL.
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.default_ttl = 300
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.default_ttl = app.config.get('CACHE_DEFAULT_TTL', 300)
+        backend = app.config.get('CACHE_BACKEND', 'memory')
+
+        if backend == 'redis':
+            try:
+                self.backend = RedisBackend(app.config['CACHE_REDIS_URL'])
+            except Exception as e:
+                print(f"WARNING: Redis cache unavailable, using in-process cache: {e}")
+                backend = 'memory'
+        if backend == 'memory':
+            self.backend = MemoryBackend(app.config.get('CACHE_MAX_ENTRIES', 512))
+        elif backend != 'redis':
+            self.backend = None  # 'none' disables caching
+
+    @staticmethod
+    def generation():
+        # Through the read session: the cached pages read their rows there
+        from app import read_session
+        from app.models import AppCounter, JOBS_COUNTER
+        return AppCounter.get(JOBS_COUNTER, read_session) or 0
+
+    @staticmethod
+    def _normalised_args():
+        """
+        Sorted query args with whitespace noise removed from values. Case is
+        kept: the cached page echoes the query back in its search box.
+        """
+        items = []
+        for key, value in sorted(request.args.items(multi=True)):
+            items.append(f"{key}={' '.join(value.split())}")
+        return '&'.join(items)
+
+    def _record(self, endpoint, hit):
+        with self._stats_lock:
+            counts = self._stats.setdefault(endpoint, {'hits': 0, 'misses': 0})
+            counts['hits' if hit else 'misses'] += 1
+
+    def metrics(self):
+        """Hit/miss counters per route for this worker process."""
+        with self._stats_lock:
+            routes = {}
+            for endpoint, counts in self._stats.items():
+                total = counts['hits'] + counts['misses']
+                routes[endpoint] = {**counts, 'hit_ratio': round(counts['hits'] / total, 3) if total else 0.0}
+        return {
+            'backend': type(self.backend).__name__ if self.backend else None,
+            'entries': self.backend.size() if self.backend else 0,
+            'default_ttl': self.default_ttl,
+            'routes': routes,
+        }
+
+    def cached(self, ttl=None):
+        """Decorator for GET views whose output only changes with the data."""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if self.backend is None or request.method != 'GET':
+                    return view(*args, **kwargs)
+
+                key = f"{self.generation()}:{request.endpoint}:{self._normalised_args()}"
+                entry = self.backend.get(key)
+                if entry is not None:
+                    self._record(request.endpoint, hit=True)
+                    body, status, mimetype = entry
+                    response = make_response(body, status)
+                    response.mimetype = mimetype
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+
+                self._record(request.endpoint, hit=False)
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200:
+                    self.backend.set(key, (response.get_data(), response.status_code, response.mimetype),
+                                     ttl or self.default_ttl)
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return wrapper
+        return decorator
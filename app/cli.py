@@ -0,0 +1,175 @@
+import click
+from flask.cli import AppGroup
+
+# Usage: flask --app run schema init
+schema_cli = AppGroup('schema', help='Create the database schema.')
+
+
+@schema_cli.command('init')
+def init_schema_command():
+    """Create missing tables, indexes and the full-text search index."""
+    from app import init_schema
+
+    init_schema()
+    click.echo("Schema is up to date.")
+
+
+# Usage: flask --app run skills <command>
+skills_cli = AppGroup('skills', help='Manage the skill taxonomy.')
+
+
+@skills_cli.command('add')
+@click.argument('name')
+@click.option('--category', help="e.g. 'Cloud', 'Language'")
+@click.option('--alias', 'aliases', multiple=True, help='Alternative spelling (repeatable)')
+@click.option('--retag', is_flag=True, help='Re-tag stored jobs afterwards')
+def add_skill_command(name, category, aliases, retag):
+    """Add a skill (or new aliases for an existing one)."""
+    from etl.taxonomy import add_skill, retag_jobs
+
+    skill = add_skill(name, category=category, aliases=aliases)
+    click.echo(f"Saved {skill['name']} (taxonomy v{skill['version']}), aliases: {', '.join(skill['aliases']) or '-'}")
+    if retag:
+        retag_jobs()
+
+
+@skills_cli.command('retag')
+@click.option('--batch-size', default=500, show_default=True)
+def retag_command(batch_size):
+    """Re-run skill matching over every stored job."""
+    from etl.taxonomy import retag_jobs
+
+    totals = retag_jobs(batch_size=batch_size)
+    click.echo(f"Re-tagged {totals['jobs']} jobs with {totals['links']} skill links.")
+
+
+@skills_cli.command('list')
+def list_command():
+    """Show the current taxonomy."""
+    from etl.taxonomy import load_taxonomy
+    from app.models import Skill
+
+    version, names, aliases = load_taxonomy()
+    categories = dict(Skill.query.with_entities(Skill.name, Skill.category).all())
+    click.echo(f"Taxonomy v{version} ({len(names)} skills)")
+    for name in names:
+        extra = f" [{', '.join(aliases[name])}]" if name in aliases else ''
+        click.echo(f"  {name:<20} {categories.get(name) or '-':<12}{extra}")
+
+
+# Usage: flask --app run stats refresh
+stats_cli = AppGroup('stats', help='Maintain the pre-computed dashboard statistics.')
+
+
+@stats_cli.command('refresh')
+def refresh_stats_command():
+    """Recompute all dashboard statistics from scratch."""
+    from app import db
+    from app.stats import refresh_stats, get_dashboard_stats
+
+    refresh_stats()
+    db.session.commit()
+    stats = get_dashboard_stats()
+    click.echo(f"{stats['total_jobs']} jobs, {stats['total_skills']} skills (as of {stats['updated_at']:%Y-%m-%d %H:%M})")
+
+
+# Usage: flask --app run dedupe backfill
+dedupe_cli = AppGroup('dedupe', help='Near-duplicate posting detection.')
+
+
+@dedupe_cli.command('backfill')
+@click.option('--batch-size', default=1000, show_default=True)
+def dedupe_backfill_command(batch_size):
+    """Fingerprint stored postings and link near-duplicates."""
+    from app import db
+    from app.stats import refresh_stats
+    from etl.dedupe import backfill_fingerprints
+
+    totals = backfill_fingerprints(batch_size=batch_size)
+    refresh_stats()
+    db.session.commit()
+    click.echo(f"Fingerprinted {totals['jobs']} jobs, {totals['duplicates']} linked as near-duplicates.")
+
+
+# Usage: flask --app run pipeline worker
+pipeline_cli = AppGroup('pipeline', help='Run queued pipeline jobs.')
+
+
+@pipeline_cli.command('worker')
+@click.option('--once', is_flag=True, help='Exit when the queue is empty')
+def worker_command(once):
+    """Process queued pipeline runs (e.g. as a separate service)."""
+    from flask import current_app
+    from app.runner import process_queue
+
+    click.echo("Pipeline worker started, waiting for queued runs...")
+    process_queue(current_app._get_current_object(), idle_exit=once)
+
+
+@pipeline_cli.command('enqueue')
+@click.option('--max-pages', type=int, help='Page limit per category')
+@click.option('--batch-size', type=int, help='Jobs committed per loader transaction')
+@click.option('--full-refresh', is_flag=True, help='Ignore the extraction watermarks')
+def enqueue_command(max_pages, batch_size, full_refresh):
+    """Queue a pipeline run for the worker."""
+    from app.runner import enqueue_run
+
+    options = {k: v for k, v in (('max_pages', max_pages), ('batch_size', batch_size)) if v is not None}
+    if full_refresh:
+        options['full_refresh'] = True
+    log, created = enqueue_run(**options)
+    click.echo(f"Queued run #{log.id}." if created else f"Run #{log.id} is already {log.status.lower()}.")
+
+
+# Usage: flask --app run export parquet --dir exports/jobs
+export_cli = AppGroup('export', help='Columnar snapshots of the job postings.')
+
+
+@export_cli.command('parquet')
+@click.option('--dir', 'directory', envvar='EXPORT_DIR', required=True,
+              help='Snapshot directory (default: $EXPORT_DIR)')
+@click.option('--chunk-size', default=5000, show_default=True, help='Rows per database fetch')
+def export_parquet_command(directory, chunk_size):
+    """Append postings stored since the last export as partitioned Parquet."""
+    from etl.export import export_jobs
+
+    try:
+        result = export_jobs(directory, chunk_size=chunk_size)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Exported {result['rows']} jobs into {result['files']} files "
+               f"in {result['seconds']}s ({result['rows_per_s']} rows/s), up to id {result['last_id']}.")
+
+
+# Usage: flask --app run retention archive --days 90
+retention_cli = AppGroup('retention', help='Archive postings older than the active window.')
+
+
+@retention_cli.command('archive')
+@click.option('--days', type=int, envvar='RETENTION_DAYS', default=90, show_default=True,
+              help='Active window (default: $RETENTION_DAYS or 90)')
+@click.option('--batch-size', default=2000, show_default=True, help='Postings moved per transaction')
+def archive_command(days, batch_size):
+    """Move expired postings and their skill links into the archive tables."""
+    from etl.retention import archive_expired
+
+    try:
+        result = archive_expired(days, batch_size=batch_size)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Archived {result['jobs']} jobs posted before {result['cutoff']:%Y-%m-%d} "
+               f"({result['skill_links']} skill links, {result['promoted']} duplicates promoted) "
+               f"in {result['seconds']}s ({result['rows_per_s']} rows/s).")
+
+
+@retention_cli.command('status')
+@click.option('--days', type=int, envvar='RETENTION_DAYS', default=90, show_default=True)
+def retention_status_command(days):
+    """Show how many postings are active, expired and archived."""
+    from etl.retention import retention_status
+
+    status = retention_status(days)
+    oldest = f"{status['oldest_active']:%Y-%m-%d}" if status['oldest_active'] else '-'
+    click.echo(f"{status['active']} active jobs (oldest {oldest}), {status['expired']} posted before "
+               f"{status['cutoff']:%Y-%m-%d}; {status['archived']} archived over "
+               f"{status['rollup_months']} rolled-up months.")
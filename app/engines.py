@@ -0,0 +1,137 @@
+"""
+Engine profiles per deployment mode, and the read-only session.
+
+Pick a profile with DB_PROFILE:
+
+    web   Gunicorn workers: short, read-mostly requests
+    etl   run_pipeline.py / 'flask pipeline worker': one long-running writer
+    dev   local development (flask run, scripts, benchmarks)
+
+On Postgres a profile sizes the connection pool, pre-pings pooled
+connections and caps read statements (a slow page query fails instead of
+tying up a worker; writes from an in-process pipeline run are not capped).
+On SQLite every connection switches to WAL with synchronous=NORMAL,
+memory-maps the file and waits `busy_timeout_ms` for a lock instead of
+failing at once.
+
+Read paths (dashboard, search, /api) go through `read_session`, bound to a
+separate 'read' engine: read-only connections, optionally pointed at a
+replica (DATABASE_READ_URL). Under WAL a reader works on the last committed
+snapshot, so a page never waits for a running load_jobs_to_db commit.
+"""
+from flask.globals import app_ctx
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+PROFILES = {
+    'web': {'pool_size': 5, 'max_overflow': 10, 'pool_timeout': 10,
+            'statement_timeout_ms': 15_000, 'busy_timeout_ms': 5_000},
+    'etl': {'pool_size': 2, 'max_overflow': 4, 'pool_timeout': 60,
+            'statement_timeout_ms': 0, 'busy_timeout_ms': 30_000},
+    'dev': {'pool_size': 2, 'max_overflow': 3, 'pool_timeout': 30,
+            'statement_timeout_ms': 0, 'busy_timeout_ms': 10_000},
+}
+
+# Compiled SQL kept per engine (SQLAlchemy's default is 500); the API's
+# filter combinations produce many distinct statements
+QUERY_CACHE_SIZE = 1200
+
+# Server-side prepared statements after this many runs (psycopg 3 only)
+PREPARE_THRESHOLD = 5
+
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+
+
+def _is_sqlite(url):
+    return make_url(url).get_backend_name() == 'sqlite'
+
+
+def _is_memory(url):
+    return _is_sqlite(url) and make_url(url).database in (None, '', ':memory:')
+
+
+def _options(url, profile, read_only=False):
+    """create_engine() keyword arguments for one engine."""
+    settings = PROFILES[profile]
+    options = {'query_cache_size': QUERY_CACHE_SIZE}
+    if _is_sqlite(url):
+        if not _is_memory(url):  # in-memory databases keep Flask-SQLAlchemy's StaticPool
+            options.update(pool_size=settings['pool_size'], max_overflow=settings['max_overflow'])
+        return options
+
+    # 1. Pool: sized per worker; pre-ping drops connections the server closed
+    options.update(pool_size=settings['pool_size'], max_overflow=settings['max_overflow'],
+                   pool_timeout=settings['pool_timeout'], pool_pre_ping=True, pool_recycle=1800)
+
+    # 2. Session defaults, sent once per new connection
+    server_options = []
+    if read_only:
+        server_options.append('-c default_transaction_read_only=on')
+        if settings['statement_timeout_ms']:
+            server_options.append(f"-c statement_timeout={settings['statement_timeout_ms']}")
+    connect_args = {'application_name': f"devpulse-{profile}{'-read' if read_only else ''}"}
+    if server_options:
+        connect_args['options'] = ' '.join(server_options)
+    if make_url(url).get_driver_name() == 'psycopg':
+        connect_args['prepare_threshold'] = PREPARE_THRESHOLD
+    options['connect_args'] = connect_args
+    return options
+
+
+def engine_config(config):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS and SQLALCHEMY_BINDS for `config`'s DB_PROFILE.
+    Must be applied before db.init_app().
+    """
+    profile = config['DB_PROFILE']
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown DB_PROFILE {profile!r}; expected one of: {', '.join(PROFILES)}")
+    url = config['SQLALCHEMY_DATABASE_URI']
+    binds = dict(config.get('SQLALCHEMY_BINDS') or {})
+
+    # Separate in-memory databases can't share data: reads stay on the main engine
+    if not _is_memory(url):
+        read_url = config.get('DATABASE_READ_URL') or url
+        binds['read'] = {'url': read_url, **_options(read_url, profile, read_only=True)}
+    return {
+        'SQLALCHEMY_ENGINE_OPTIONS': {**_options(url, profile), **config.get('SQLALCHEMY_ENGINE_OPTIONS', {})},
+        'SQLALCHEMY_BINDS': binds,
+    }
+
+
+def tune_engine(engine, profile, read_only=False):
+    """Registers the SQLite pragmas of `profile` for every new connection."""
+    if engine.dialect.name != 'sqlite':
+        return
+    busy_timeout_ms = PROFILES[profile]['busy_timeout_ms']
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # WAL: readers and the single writer no longer block each other
+        cursor.execute('PRAGMA journal_mode=WAL')
+        # Durable at checkpoints instead of every commit; safe with WAL
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute(f'PRAGMA mmap_size={SQLITE_MMAP_SIZE}')
+        cursor.execute(f'PRAGMA busy_timeout={busy_timeout_ms}')
+        if read_only:
+            cursor.execute('PRAGMA query_only=ON')
+        cursor.close()
+
+
+class ReadOnlySession(Session):
+    """A session that always uses the 'read' engine (or the main one when there is none)."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is not None:
+            return bind
+        engines = self._db.engines
+        return engines['read'] if 'read' in engines else engines[None]
+
+
+def make_read_session(db):
+    """A scoped ReadOnlySession per app context, like `db.session`."""
+    return scoped_session(sessionmaker(class_=ReadOnlySession, db=db, autoflush=False),
+                          scopefunc=lambda: id(app_ctx._get_current_object()))
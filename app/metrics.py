@@ -0,0 +1,148 @@
+from datetime import timezone
+
+from sqlalchemy import select, func
+
+from . import db
+from .models import PipelineLog, PipelineMetric
+from .runner import ACTIVE_STATES, SUCCESS, FAILED
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# How many finished runs the trend charts show
+TREND_RUNS = 20
+
+
+def _label_value(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+class _Exposition:
+    """Collects samples grouped by metric family, with one HELP/TYPE header each."""
+
+    def __init__(self):
+        self.lines = []
+
+    def family(self, name, kind, help_text):
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name, value, **labels):
+        if value is None:
+            return
+        if labels:
+            label_text = ','.join(f'{k}="{_label_value(v)}"' for k, v in labels.items())
+            name = f"{name}{{{label_text}}}"
+        value = value if isinstance(value, int) else repr(float(value))
+        self.lines.append(f"{name} {value}")
+
+    def render(self):
+        return '\n'.join(self.lines) + '\n'
+
+
+def last_finished_run():
+    return (PipelineLog.query.filter(PipelineLog.status.in_((SUCCESS, FAILED)))
+            .order_by(PipelineLog.id.desc()).first())
+
+
+def render_prometheus():
+    """
+    Renders run counters and the metrics of the last finished run in the
+    Prometheus text format. Per-category series carry category="all" for
+    the run total.
+    """
+    out = _Exposition()
+
+    # 1. Run counters
+    counts = dict(db.session.execute(
+        select(PipelineLog.status, func.count()).group_by(PipelineLog.status)
+    ).all())
+    out.family('devpulse_pipeline_runs_total', 'counter', 'Pipeline runs by final status.')
+    for status in (SUCCESS, FAILED):
+        out.sample('devpulse_pipeline_runs_total', counts.get(status, 0), status=status.lower())
+    out.family('devpulse_pipeline_active_runs', 'gauge', 'Pipeline runs queued or running.')
+    out.sample('devpulse_pipeline_active_runs', sum(counts.get(s, 0) for s in ACTIVE_STATES))
+
+    log = last_finished_run()
+    if log is None:
+        return out.render()
+
+    # 2. Last run as a whole
+    out.family('devpulse_pipeline_last_run_timestamp_seconds', 'gauge', 'Start time of the last finished run.')
+    out.sample('devpulse_pipeline_last_run_timestamp_seconds',
+               log.run_date.replace(tzinfo=timezone.utc).timestamp())
+    out.family('devpulse_pipeline_last_run_success', 'gauge', '1 if the last finished run succeeded.')
+    out.sample('devpulse_pipeline_last_run_success', 1 if log.status == SUCCESS else 0)
+
+    rows = PipelineMetric.query.filter_by(run_id=log.id).all()
+    total = next((m for m in rows if m.category is None), None)
+    if total is not None:
+        out.family('devpulse_pipeline_last_run_duration_seconds', 'gauge', 'Wall time of the last finished run.')
+        out.sample('devpulse_pipeline_last_run_duration_seconds', total.wall_s)
+        out.family('devpulse_pipeline_last_run_peak_rss_bytes', 'gauge', 'Peak resident memory of the last run.')
+        out.sample('devpulse_pipeline_last_run_peak_rss_bytes',
+                   int(total.peak_rss_mb * 1024 * 1024) if total.peak_rss_mb is not None else None)
+
+    # 3. Per stage and per category
+    out.family('devpulse_pipeline_stage_seconds', 'gauge', 'Time spent per stage in the last finished run.')
+    for m in rows:
+        for stage in ('extract', 'transform', 'load'):
+            out.sample('devpulse_pipeline_stage_seconds', getattr(m, f'{stage}_s'),
+                       stage=stage, category=m.category or 'all')
+
+    out.family('devpulse_pipeline_stage_rows_per_second', 'gauge', 'Throughput of the transform and load stages.')
+    for m in rows:
+        out.sample('devpulse_pipeline_stage_rows_per_second', m.transform_rows_per_s,
+                   stage='transform', category=m.category or 'all')
+        out.sample('devpulse_pipeline_stage_rows_per_second', m.load_rows_per_s,
+                   stage='load', category=m.category or 'all')
+
+    out.family('devpulse_pipeline_rows', 'gauge', 'Rows handled in the last finished run, by outcome.')
+    for m in rows:
+        for outcome in ('transformed', 'inserted', 'duplicates', 'failed'):
+            out.sample('devpulse_pipeline_rows', getattr(m, outcome),
+                       outcome=outcome, category=m.category or 'all')
+
+    out.family('devpulse_pipeline_pages', 'gauge', 'Result pages fetched in the last finished run.')
+    for m in rows:
+        out.sample('devpulse_pipeline_pages', m.pages, category=m.category or 'all')
+    out.family('devpulse_pipeline_http_errors', 'gauge', 'Pages that failed after all retries.')
+    for m in rows:
+        out.sample('devpulse_pipeline_http_errors', m.http_errors, category=m.category or 'all')
+
+    out.family('devpulse_pipeline_http_latency_seconds', 'gauge', 'HTTP latency percentiles per page.')
+    for m in rows:
+        for quantile, value in (('0.5', m.latency_p50_ms), ('0.95', m.latency_p95_ms)):
+            out.sample('devpulse_pipeline_http_latency_seconds',
+                       value / 1000 if value is not None else None,
+                       quantile=quantile, category=m.category or 'all')
+
+    return out.render()
+
+
+def pipeline_trends(limit=TREND_RUNS):
+    """
+    Run-total metrics of the last `limit` runs, oldest first, shaped for
+    the charts on the Pipeline Status page.
+
+    Returns:
+        dict: labels, extract_s, transform_s, load_s, transform_rps,
+              load_rps, latency_p95_ms, peak_rss_mb
+    """
+    rows = db.session.execute(
+        select(PipelineLog.run_date, PipelineMetric)
+        .join(PipelineMetric, PipelineMetric.run_id == PipelineLog.id)
+        .where(PipelineMetric.category.is_(None))
+        .order_by(PipelineMetric.run_id.desc()).limit(limit)  # walks ix_pipeline_metrics_run_id
+    ).all()[::-1]
+
+    return {
+        'labels': [run_date.strftime('%m-%d %H:%M') for run_date, _ in rows],
+        'extract_s': [m.extract_s for _, m in rows],
+        'transform_s': [m.transform_s for _, m in rows],
+        'load_s': [m.load_s for _, m in rows],
+        'transform_rps': [m.transform_rows_per_s for _, m in rows],
+        'load_rps': [m.load_rows_per_s for _, m in rows],
+        'latency_p95_ms': [m.latency_p95_ms for _, m in rows],
+        'peak_rss_mb': [m.peak_rss_mb for _, m in rows],
+    }
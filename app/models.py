@@ -4,11 +4,17 @@ from datetime import datetime
 # 1. Association Table (Many-to-Many Relationship)
 job_skills = db.Table('job_skills',
     db.Column('job_id', db.Integer, db.ForeignKey('job_postings.id'), primary_key=True),
-    db.Column('skill_id', db.Integer, db.ForeignKey('skills.id'), primary_key=True)
+    db.Column('skill_id', db.Integer, db.ForeignKey('skills.id'), primary_key=True),
+    # The PK serves job -> skills; this serves skill -> jobs and the per-skill counts
+    db.Index('ix_job_skills_skill_id_job_id', 'skill_id', 'job_id')
 )
 
 class JobPosting(db.Model):
     __tablename__ = 'job_postings'
+    __table_args__ = (
+        # Newest-first listings (dashboard, API keyset pages) walk this index
+        db.Index('ix_job_postings_date_posted_id', 'date_posted', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
@@ -23,7 +29,8 @@ class JobPosting(db.Model):
     date_posted = db.Column(db.DateTime, default=datetime.utcnow)
     description = db.Column(db.Text, nullable=True)
     
-    skills = db.relationship('Skill', secondary=job_skills, lazy='subquery',
+    # Loaded only when a query asks for it (selectinload); see TABLE_ROW_OPTIONS in app/search.py
+    skills = db.relationship('Skill', secondary=job_skills, lazy='select',
         backref=db.backref('jobs', lazy=True))
 
     def __repr__(self):
@@ -36,21 +43,276 @@ class Skill(db.Model):
     name = db.Column(db.String(50), unique=True, nullable=False)
     category = db.Column(db.String(50), nullable=True)
 
+    aliases = db.relationship('SkillAlias', backref='skill', lazy=True,
+        cascade='all, delete-orphan')
+
     def __repr__(self):
         return f'<Skill {self.name}>'
 
+class SkillAlias(db.Model):
+    """
+    Alternative spellings of a skill (e.g. 'k8s' -> Kubernetes).
+    The skill matcher treats an alias exactly like the canonical name.
+    """
+    __tablename__ = 'skill_aliases'
+
+    id = db.Column(db.Integer, primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skills.id'), nullable=False, index=True)
+    alias = db.Column(db.String(50), unique=True, nullable=False)
+
+    def __repr__(self):
+        return f'<SkillAlias {self.alias}>'
+
+# AppCounter bumped whenever the data behind the pages changes (loader
+# commits, pipeline runs). API ETags and the response cache key off it.
+JOBS_COUNTER = 'job_postings'
+
+class AppCounter(db.Model):
+    """
+    Named, monotonically increasing counters (e.g. the skill taxonomy version).
+    Caches compare their stored value with the current one to know when to rebuild.
+    """
+    __tablename__ = 'app_counters'
+
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    @classmethod
+    def get(cls, name, session=None):
+        """
+        Returns the counter value, or None if it was never set.
+        Pass the session the guarded data is read through (e.g. read_session),
+        so a lagging replica can't pair old rows with a new generation.
+        """
+        return (session or db.session).query(cls.value).filter_by(name=name).scalar()
+
+    @classmethod
+    def bump(cls, name):
+        """Increments the counter (creating it at 1). The caller commits."""
+        # A single UPDATE ... SET value = value + 1 keeps concurrent writers safe
+        result = db.session.execute(
+            db.update(cls).where(cls.name == name)
+            .values(value=cls.value + 1, updated_at=datetime.utcnow())
+        )
+        if result.rowcount == 0:
+            db.session.add(cls(name=name, value=1))
+            db.session.flush()
+        return cls.get(name)
+
+    def __repr__(self):
+        return f'<Counter {self.name}={self.value}>'
+
 class PipelineLog(db.Model):
     """
     Tracks the history of ETL runs.
     Useful for monitoring system health on the 'Pipeline Status' page.
     """
     __tablename__ = 'pipeline_logs'
+    __table_args__ = (
+        # At most one queued and one running pipeline at any time (run lock)
+        db.Index('uq_pipeline_logs_active_status', 'status', unique=True,
+                 sqlite_where=db.text("status IN ('Queued', 'Running')"),
+                 postgresql_where=db.text("status IN ('Queued', 'Running')")),
+        db.Index('ix_pipeline_logs_run_date', 'run_date'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     run_date = db.Column(db.DateTime, default=datetime.utcnow)
-    status = db.Column(db.String(20), nullable=False)  # 'Success', 'Failed'
+    status = db.Column(db.String(20), nullable=False)  # 'Queued', 'Running', 'Success', 'Failed'
     jobs_found = db.Column(db.Integer, default=0)
     details = db.Column(db.Text, nullable=True)        # Error messages or summary
 
+    progress = db.relationship('PipelineProgress', backref='log', uselist=False, lazy=True,
+        cascade='all, delete-orphan')
+    metrics = db.relationship('PipelineMetric', backref='log', lazy=True,
+        cascade='all, delete-orphan')
+
+    def __repr__(self):
+        return f'<Log {self.run_date} - {self.status}>'
+
+class PipelineProgress(db.Model):
+    """
+    Live progress and options of a background pipeline run (one row per PipelineLog).
+    The worker updates it after every loaded chunk; heartbeat_at tells a
+    crashed run apart from a slow one.
+    """
+    __tablename__ = 'pipeline_progress'
+
+    run_id = db.Column(db.Integer, db.ForeignKey('pipeline_logs.id'), primary_key=True)
+    options = db.Column(db.Text, nullable=True)         # JSON: batch_size, max_pages, ...
+    pages_fetched = db.Column(db.Integer, default=0)
+    rows_transformed = db.Column(db.Integer, default=0)
+    rows_inserted = db.Column(db.Integer, default=0)
+    heartbeat_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<Progress run={self.run_id} inserted={self.rows_inserted}>'
+
+class PipelineMetric(db.Model):
+    """
+    Stage timings and row counts of one pipeline run: one row per category
+    plus a run total (category NULL) that also carries wall time and peak RSS.
+    """
+    __tablename__ = 'pipeline_metrics'
+
+    id = db.Column(db.Integer, primary_key=True)
+    run_id = db.Column(db.Integer, db.ForeignKey('pipeline_logs.id'), nullable=False, index=True)
+    category = db.Column(db.String(100), nullable=True)  # NULL = whole run
+
+    pages = db.Column(db.Integer, default=0)
+    http_errors = db.Column(db.Integer, default=0)
+    latency_p50_ms = db.Column(db.Float, nullable=True)
+    latency_p95_ms = db.Column(db.Float, nullable=True)
+
+    extract_s = db.Column(db.Float, default=0.0)
+    transform_s = db.Column(db.Float, default=0.0)
+    load_s = db.Column(db.Float, default=0.0)
+    wall_s = db.Column(db.Float, nullable=True)
+
+    transformed = db.Column(db.Integer, default=0)
+    inserted = db.Column(db.Integer, default=0)
+    duplicates = db.Column(db.Integer, default=0)
+    failed = db.Column(db.Integer, default=0)
+    peak_rss_mb = db.Column(db.Float, nullable=True)
+
+    @property
+    def transform_rows_per_s(self):
+        return round(self.transformed / self.transform_s, 1) if self.transform_s else 0.0
+
+    @property
+    def load_rows_per_s(self):
+        return round((self.inserted + self.duplicates) / self.load_s, 1) if self.load_s else 0.0
+
+    def __repr__(self):
+        return f'<Metric run={self.run_id} {self.category or "total"}>'
+
+class DashboardStat(db.Model):
+    """
+    Pre-computed dashboard numbers ('total_jobs', 'total_skills').
+    Maintained incrementally by the loader; see app/stats.py.
+    """
+    __tablename__ = 'dashboard_stats'
+
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<Stat {self.name}={self.value}>'
+
+class SkillStat(db.Model):
+    """How many postings mention each skill (feeds the Top Skills chart)."""
+    __tablename__ = 'skill_stats'
+
+    skill_id = db.Column(db.Integer, db.ForeignKey('skills.id'), primary_key=True)
+    job_count = db.Column(db.Integer, nullable=False, default=0, index=True)
+
+    def __repr__(self):
+        return f'<SkillStat {self.skill_id}={self.job_count}>'
+
+class ExtractionWatermark(db.Model):
+    """
+    High-water mark of incremental extraction for one search category:
+    the newest 'created' timestamp loaded so far, plus the URLs posted at
+    exactly that instant (so ties on the boundary aren't fetched twice).
+    """
+    __tablename__ = 'extraction_watermarks'
+
+    category = db.Column(db.String(100), primary_key=True)
+    location = db.Column(db.String(100), primary_key=True)
+    latest_created = db.Column(db.DateTime, nullable=False)
+    boundary_urls = db.Column(db.Text, nullable=True)   # JSON list
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<Watermark {self.category} @ {self.latest_created}>'
+
+class JobFingerprint(db.Model):
+    """
+    MinHash signature of a posting's normalised title + company + description.
+    canonical_id points at the first posting of a near-duplicate group
+    (reposts, syndicated copies); it is NULL for canonical postings.
+    See etl/dedupe.py.
+    """
+    __tablename__ = 'job_fingerprints'
+
+    job_id = db.Column(db.Integer, db.ForeignKey('job_postings.id'), primary_key=True)
+    minhash = db.Column(db.LargeBinary, nullable=False)
+    canonical_id = db.Column(db.Integer, db.ForeignKey('job_postings.id'), nullable=True, index=True)
+
+    def __repr__(self):
+        return f'<Fingerprint job={self.job_id} canonical={self.canonical_id}>'
+
+class JobLshBucket(db.Model):
+    """
+    LSH band hashes of each canonical posting's fingerprint. Near-duplicate
+    candidates for a new posting come from an index lookup on `bucket`
+    instead of a table scan.
+    """
+    __tablename__ = 'job_lsh_buckets'
+
+    bucket = db.Column(db.BigInteger, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job_postings.id'), primary_key=True)
+
+    def __repr__(self):
+        return f'<LshBucket {self.bucket} job={self.job_id}>'
+
+# 2. Archive (etl/retention.py): postings older than the active window move
+# here in batches, out of the way of every dashboard, count and search query
+
+job_skills_archive = db.Table('job_skills_archive',
+    db.Column('job_id', db.Integer, db.ForeignKey('job_postings_archive.id'), primary_key=True),
+    db.Column('skill_id', db.Integer, db.ForeignKey('skills.id'), primary_key=True)
+)
+
+class ArchivedJobPosting(db.Model):
+    """
+    A posting moved out of job_postings after the active window. Keeps its
+    original id and columns, plus the near-duplicate link it had.
+    Nothing in the web app reads this table; trends survive in ArchiveRollup.
+    """
+    __tablename__ = 'job_postings_archive'
+    __table_args__ = (
+        db.Index('ix_job_postings_archive_date_posted', 'date_posted'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(255), nullable=False)
+    company = db.Column(db.String(255), nullable=False)
+    location = db.Column(db.String(255), nullable=True)
+    is_remote = db.Column(db.Boolean, default=False)
+    salary_min = db.Column(db.Float, nullable=True)
+    salary_max = db.Column(db.Float, nullable=True)
+    currency = db.Column(db.String(10), default='ZAR')
+    # Unique here too: the loader treats archived URLs as already known
+    url = db.Column(db.String(500), unique=True, nullable=False)
+    source_site = db.Column(db.String(50), nullable=False)
+    date_posted = db.Column(db.DateTime, nullable=True)
+    description = db.Column(db.Text, nullable=True)
+    canonical_id = db.Column(db.Integer, nullable=True)  # from job_fingerprints, no FK
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ArchivedJob {self.title} at {self.company}>'
+
+class ArchiveRollup(db.Model):
+    """
+    Skill and salary numbers of archived postings per posting month, taken
+    before the rows are moved (near-duplicates excluded, like the dashboard).
+    skill_id 0 holds the month's totals. Every column is additive, so each
+    archive batch adds to the rows of the months it touches.
+    """
+    __tablename__ = 'archive_rollups'
+
+    month = db.Column(db.Date, primary_key=True)          # first day of the month
+    skill_id = db.Column(db.Integer, primary_key=True)    # 0 = all postings
+    jobs = db.Column(db.Integer, nullable=False, default=0)
+    tagged_jobs = db.Column(db.Integer, nullable=False, default=0)  # with at least one skill
+    salaried = db.Column(db.Integer, nullable=False, default=0)     # with a salary
+    salary_sum = db.Column(db.Float, nullable=False, default=0.0)   # of range midpoints
+    salary_min = db.Column(db.Float, nullable=True)
+    salary_max = db.Column(db.Float, nullable=True)
+
     def __repr__(self):
-        return f'<Log {self.run_date} - {self.status}>'
\ No newline at end of file
+        return f'<Rollup {self.month} skill={self.skill_id} jobs={self.jobs}>'
@@ -1,44 +1,51 @@
-from flask import Blueprint, render_template, request, jsonify
-from app.models import JobPosting, Skill, PipelineLog
-from app import db
-from sqlalchemy import func
-import datetime
+from flask import (Blueprint, Response, current_app, render_template, request,
+                   stream_with_context, url_for)
+from app.models import JobPosting, PipelineLog
+from app import db, cache, read_session
+from app.runner import RETAG, enqueue_run, start_worker, run_status
+from app.metrics import render_prometheus, pipeline_trends, PROMETHEUS_CONTENT_TYPE
+from app.search import search_jobs, TABLE_ROW_OPTIONS
+from app.stats import get_dashboard_stats
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+import json
+import time
 
-# NOTE: We removed the ETL imports from here to prevent Circular Errors.
-# They are now inside the 'trigger_pipeline' function below.
+# NOTE: We keep the ETL imports out of this module to prevent Circular Errors.
+# The pipeline itself runs in app/runner.py, which imports them lazily.
 
 # Define the Blueprint
 main_bp = Blueprint('main', __name__)
 
 @main_bp.route('/')
 @main_bp.route('/dashboard')
+@cache.cached()
 def dashboard():
-    # 1. Search Logic
-    query = request.args.get('q') 
-    
-    base_query = JobPosting.query
+    # 1. Stats + Chart Data (pre-computed by the loader, see app/stats.py)
+    stats = get_dashboard_stats(top=5)
+
+    # 2. Search Logic
+    # Collapsed the way the cache key is, so a cached page echoes the same text
+    query = ' '.join(request.args.get('q', '').split())
+    page = request.args.get('page', 1, type=int)
+    has_next = False
     
     if query:
-        search_filter = f"%{query}%"
-        jobs = base_query.filter(
-            (JobPosting.title.ilike(search_filter)) | 
-            (JobPosting.description.ilike(search_filter))
-        ).order_by(JobPosting.date_posted.desc()).all()
+        # Ranked full-text search, one page at a time
+        jobs, has_next = search_jobs(query, page=page)
     else:
-        # Show top 50 recent jobs
-        jobs = base_query.order_by(JobPosting.date_posted.desc()).limit(50).all()
+        # Show top 50 recent jobs (table columns + skill names only)
+        jobs = read_session.execute(
+            select(JobPosting).options(*TABLE_ROW_OPTIONS)
+            .order_by(JobPosting.date_posted.desc(), JobPosting.id.desc()).limit(50)
+        ).scalars().all()
 
-    # 2. Stats
-    total_jobs = JobPosting.query.count()
-    total_skills = Skill.query.count()
+    # 3. Totals + Chart Data
+    total_jobs = stats['total_jobs']
+    total_skills = stats['total_skills']
 
-    # 3. Chart Data
-    top_skills_data = db.session.query(
-        Skill.name, func.count(Skill.id)
-    ).join(Skill.jobs).group_by(Skill.id).order_by(func.count(Skill.id).desc()).limit(5).all()
-    
-    skill_labels = [s[0] for s in top_skills_data]
-    skill_counts = [s[1] for s in top_skills_data]
+    skill_labels = [s[0] for s in stats['top_skills']]
+    skill_counts = [s[1] for s in stats['top_skills']]
 
     # PASS 'jobs' TO TEMPLATE
     return render_template('dashboard.html', 
@@ -46,73 +53,136 @@ def dashboard():
                            total_jobs=total_jobs, 
                            total_skills=total_skills,
                            search_query=query,
+                           page=page,
+                           has_next=has_next,
                            skill_labels=skill_labels,
-                           skill_counts=skill_counts)
+                           skill_counts=skill_counts,
+                           stats_updated_at=stats['updated_at'])
 
 @main_bp.route('/pipeline-status')
 def pipeline_status():
-    logs = PipelineLog.query.order_by(PipelineLog.run_date.desc()).limit(10).all()
-    return render_template('pipeline_status.html', logs=logs)
+    # Not cached: claims and progress updates change it without a new data
+    # generation, and it must show live run state (a handful of bounded queries)
+    # The table shows each run's progress and metrics: load them per page, not per row
+    logs = (PipelineLog.query
+            .options(selectinload(PipelineLog.progress), selectinload(PipelineLog.metrics))
+            .order_by(PipelineLog.run_date.desc()).limit(10).all())
+    return render_template('pipeline_status.html', logs=logs, trends=pipeline_trends())
+
+@main_bp.route('/metrics')
+def metrics():
+    """Pipeline metrics in the Prometheus text format (for scraping)."""
+    return Response(render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
 
 # --- SECRET ROUTE FOR REMOTE TRIGGER ---
-@main_bp.route('/admin/run-pipeline')
+@main_bp.route('/admin/run-pipeline', methods=['GET', 'POST'])
 def trigger_pipeline():
     """
     A secret route to force the ETL pipeline to run from the browser.
+    The run is queued and executed by a background worker; this returns
+    immediately with the run id and a URL to poll for progress.
     """
-    
-    # --- LAZY IMPORTS (The Fix) ---
-    # We import these HERE so the app can start without crashing.
-    from etl.extract import extract_jobs
-    from etl.transform import transform_jobs
-    from etl.load import load_jobs_to_db
-
     # Categories to search
     categories = ["Software Engineer", "Data Scientist", "IT Support"]
-    
-    log_details = []
-    total_count = 0
-
-    try:
-        # Loop through categories
-        for cat in categories:
-            # 1. Extract
-            raw_data = extract_jobs(query=cat, location="South Africa")
-            if not raw_data:
-                log_details.append(f"{cat}: No data")
-                continue
-            
-            # 2. Transform
-            clean_data = transform_jobs(raw_data)
-            
-            # 3. Load
-            load_jobs_to_db(clean_data)
-            count = len(clean_data)
-            total_count += count
-            log_details.append(f"{cat}: {count} jobs")
-
-        # 4. Log Success to DB
-        new_log = PipelineLog(
-            status='Success',
-            jobs_found=total_count,
-            details=", ".join(log_details)
-        )
-        db.session.add(new_log)
-        db.session.commit()
-
-        return {
-            "status": "success", 
-            "message": f"Pipeline finished. Found {total_count} jobs.",
-            "details": log_details
-        }, 200
-
-    except Exception as e:
-        # Log Failure
-        error_log = PipelineLog(
-            status='Failed',
-            jobs_found=0,
-            details=str(e)
-        )
-        db.session.add(error_log)
-        db.session.commit()
-        return {"status": "error", "message": str(e)}, 500
\ No newline at end of file
+
+    options = {'categories': categories}
+    if request.args.get('full_refresh') in ('1', 'true'):
+        options['full_refresh'] = True  # ignore the extraction watermarks
+
+    log, created = enqueue_run(**options)
+    start_worker(current_app._get_current_object())
+
+    return {
+        "status": "accepted",
+        "run_id": log.id,
+        "already_running": not created,
+        "status_url": url_for('main.pipeline_run_status', run_id=log.id),
+        "stream_url": url_for('main.pipeline_run_stream', run_id=log.id),
+    }, 202
+
+@main_bp.route('/admin/pipeline-runs/<int:run_id>')
+def pipeline_run_status(run_id):
+    """Current status and progress counters of one pipeline run."""
+    status = run_status(run_id)
+    if status is None:
+        return {"status": "error", "message": "Unknown run"}, 404
+    return status
+
+# A stream holds a sync Gunicorn worker; end it well inside the worker
+# timeout (30 s by default). EventSource reconnects after STREAM_RETRY_MS.
+STREAM_MAX_SECONDS = 20
+STREAM_RETRY_MS = 1000
+
+@main_bp.route('/admin/pipeline-runs/<int:run_id>/stream')
+def pipeline_run_stream(run_id):
+    """
+    Streams run progress as Server-Sent Events until the run finishes, or
+    for STREAM_MAX_SECONDS; the browser's EventSource then reconnects and
+    gets the current status first.
+    """
+    if run_status(run_id) is None:
+        return {"status": "error", "message": "Unknown run"}, 404
+
+    @stream_with_context
+    def events():
+        yield f"retry: {STREAM_RETRY_MS}\n\n"
+        deadline = time.monotonic() + STREAM_MAX_SECONDS
+        last = None
+        while True:
+            db.session.expire_all()  # see the worker's latest commit
+            status = run_status(run_id)
+            if status != last:
+                yield f"data: {json.dumps(status)}\n\n"
+                last = status
+            if status['finished'] or time.monotonic() >= deadline:
+                return
+            time.sleep(1)
+
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+# --- ADMIN ROUTES FOR THE SKILL TAXONOMY ---
+@main_bp.route('/admin/skills', methods=['POST'])
+def add_skill():
+    """
+    Adds a skill to the taxonomy.
+    JSON body: {"name": "Terraform", "category": "DevOps", "aliases": ["tf"], "retag": true}
+    With "retag" the stored jobs are re-tagged by the background worker.
+    """
+    from etl.taxonomy import add_skill as save_skill
+
+    payload = request.get_json(silent=True) or {}
+    name = (payload.get('name') or '').strip()
+    if not name:
+        return {"status": "error", "message": "'name' is required"}, 400
+
+    skill = save_skill(name, category=payload.get('category'), aliases=payload.get('aliases') or [])
+    response = {"status": "success", "skill": skill}
+    if payload.get('retag'):
+        response["retag"] = _enqueue_retag()
+    return response, 201
+
+@main_bp.route('/admin/skills/retag', methods=['POST'])
+def retag_skills():
+    """
+    Queues a re-tag of every stored job. A full-table pass outlives the
+    worker timeout, so it runs on the pipeline worker like a pipeline run.
+    """
+    batch_size = request.args.get('batch_size', 500, type=int)
+    return {"status": "accepted", **_enqueue_retag(batch_size=batch_size)}, 202
+
+def _enqueue_retag(**options):
+    # Shares the run lock: never re-tags while a pipeline run is loading
+    log, created = enqueue_run(task=RETAG, **options)
+    start_worker(current_app._get_current_object())
+    return {
+        "run_id": log.id,
+        "already_running": not created,
+        "status_url": url_for('main.pipeline_run_status', run_id=log.id),
+    }
+
+
+@main_bp.route('/admin/cache-stats')
+def cache_stats():
+    """Hit/miss counters of the response cache (per worker process)."""
+    return cache.metrics()
@@ -0,0 +1,267 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import IntegrityError
+
+from . import db
+from .models import AppCounter, PipelineLog, PipelineMetric, PipelineProgress, JOBS_COUNTER
+
+# Run states stored in PipelineLog.status
+QUEUED = 'Queued'
+RUNNING = 'Running'
+SUCCESS = 'Success'
+FAILED = 'Failed'
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+# Queued tasks (the 'task' option; a pipeline run when absent)
+RETAG = 'retag'
+
+# A Running run whose heartbeat is older than this is considered dead, and
+# a Queued run no worker claimed in that time is considered abandoned
+STALE_AFTER = timedelta(minutes=15)
+
+# How often a long-lived worker checks the queue
+POLL_INTERVAL = 2
+
+_worker_lock = threading.Lock()
+_worker_thread = None
+
+
+def active_run():
+    """Returns the queued or running PipelineLog, if there is one."""
+    return (PipelineLog.query.filter(PipelineLog.status.in_(ACTIVE_STATES))
+            .order_by(PipelineLog.id).first())
+
+
+def _fail_stale_runs():
+    cutoff = datetime.utcnow() - STALE_AFTER
+    # heartbeat_at is set when the run is queued, and on every claim and chunk
+    stale = (PipelineLog.query.join(PipelineProgress)
+             .filter(PipelineLog.status.in_(ACTIVE_STATES), PipelineProgress.heartbeat_at < cutoff).all())
+    for log in stale:
+        log.details = ('Worker stopped responding (no heartbeat)' if log.status == RUNNING
+                       else 'No worker picked the run up')
+        log.status = FAILED
+    if stale:
+        db.session.commit()
+
+
+def enqueue_run(**options):
+    """
+    Queues a pipeline run unless one is already queued or running.
+    The partial unique index on pipeline_logs.status turns two concurrent
+    enqueues into one run.
+
+    Returns:
+        tuple: (PipelineLog, created)
+    """
+    _fail_stale_runs()
+    current = active_run()
+    if current:
+        return current, False
+
+    log = PipelineLog(status=QUEUED, jobs_found=0, details='Waiting for a worker')
+    log.progress = PipelineProgress(options=json.dumps(options))
+    db.session.add(log)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return active_run(), False
+    return log, True
+
+
+def claim_run(run_id=None):
+    """
+    Atomically moves a queued run (the oldest, or `run_id`) to Running.
+    Fails if another run is already Running (unique index on active status).
+
+    Returns:
+        int or None: The claimed run id.
+    """
+    query = PipelineLog.query.filter_by(status=QUEUED)
+    if run_id is not None:
+        query = query.filter_by(id=run_id)
+    log = query.order_by(PipelineLog.id).first()
+    if log is None:
+        return None
+
+    try:
+        claimed = db.session.execute(
+            db.update(PipelineLog).where(PipelineLog.id == log.id, PipelineLog.status == QUEUED)
+            .values(status=RUNNING, details='Running')
+        ).rowcount
+        db.session.execute(
+            db.update(PipelineProgress).where(PipelineProgress.run_id == log.id)
+            .values(heartbeat_at=datetime.utcnow())
+        )
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return None
+    return log.id if claimed else None
+
+
+def execute_run(run_id):
+    """Runs the streaming pipeline for a claimed run and records the outcome."""
+    from etl.extract import ExtractionStats
+    from etl.metrics import RunMetrics
+    from etl.pipeline import run_streaming, SEARCH_CATEGORIES
+
+    log = db.session.get(PipelineLog, run_id)
+    options = json.loads(log.progress.options or '{}') if log.progress else {}
+    if options.pop('task', None) == RETAG:
+        return _execute_retag(run_id, options)
+    categories = options.pop('categories', None) or SEARCH_CATEGORIES
+
+    def on_progress(progress):
+        db.session.execute(
+            db.update(PipelineProgress).where(PipelineProgress.run_id == run_id)
+            .values(heartbeat_at=datetime.utcnow(), **progress)
+        )
+        db.session.commit()
+
+    print(f"--- Pipeline run #{run_id} started ---")
+    stats = ExtractionStats()
+    metrics = RunMetrics()
+    try:
+        totals = run_streaming(categories, location="South Africa", stats=stats, metrics=metrics,
+                               on_progress=on_progress, **options)
+        summary = stats.summary()
+
+        inserted = sum(t['inserted'] for t in totals.values())
+        log = db.session.get(PipelineLog, run_id)
+        log.status = SUCCESS
+        log.jobs_found = inserted
+        log.details = (", ".join(f"{cat}: {t['inserted']} jobs" for cat, t in totals.items()) +
+                       f". Fetched {summary['pages']} pages in {summary['elapsed_s']}s "
+                       f"(p95 {summary['latency_p95_ms']}ms)")
+    except Exception as e:
+        db.session.rollback()
+        print(f"CRITICAL PIPELINE ERROR: {e}")
+        log = db.session.get(PipelineLog, run_id)
+        log.status = FAILED
+        log.details = str(e)
+
+    # Stage timings are kept for failed runs too - that's when they matter
+    metrics.stop()
+    log.metrics = [PipelineMetric(**row) for row in metrics.rows(stats)]
+    AppCounter.bump(JOBS_COUNTER)  # refresh cached pages
+    db.session.commit()
+    print(f"--- Pipeline run #{run_id} finished: {log.status} ---")
+
+    if log.status == SUCCESS:
+        _export_snapshot()
+        _archive_expired()
+    return log.status
+
+
+def _execute_retag(run_id, options):
+    """Re-tags every stored job for a claimed run (queued after a taxonomy change)."""
+    from etl.taxonomy import retag_jobs
+
+    def on_batch(totals):
+        db.session.execute(
+            db.update(PipelineProgress).where(PipelineProgress.run_id == run_id)
+            .values(heartbeat_at=datetime.utcnow(), rows_transformed=totals['jobs'])
+        )
+        db.session.commit()
+
+    print(f"--- Re-tag run #{run_id} started ---")
+    try:
+        totals = retag_jobs(on_batch=on_batch, **options)
+        log = db.session.get(PipelineLog, run_id)
+        log.status = SUCCESS
+        log.details = f"Re-tagged {totals['jobs']} jobs ({totals['links']} skill links)"
+    except Exception as e:
+        db.session.rollback()
+        print(f"CRITICAL RE-TAG ERROR: {e}")
+        log = db.session.get(PipelineLog, run_id)
+        log.status = FAILED
+        log.details = str(e)
+    db.session.commit()
+    print(f"--- Re-tag run #{run_id} finished: {log.status} ---")
+    return log.status
+
+
+def _export_snapshot():
+    """Appends the new postings to the Parquet snapshot, if one is configured."""
+    from etl.export import EXPORT_DIR, export_jobs
+
+    if not EXPORT_DIR:
+        return
+    try:
+        result = export_jobs(EXPORT_DIR)
+        print(f"--- Snapshot: {result['rows']} jobs exported to {EXPORT_DIR} ---")
+    except Exception as e:
+        # The run itself succeeded; the next export picks up where this one stopped
+        db.session.rollback()
+        print(f"WARNING: Parquet export failed: {e}")
+
+
+def _archive_expired():
+    """Moves postings older than RETENTION_DAYS into the archive, if it is set."""
+    from etl.retention import RETENTION_DAYS, archive_expired
+
+    if not RETENTION_DAYS:
+        return
+    try:
+        result = archive_expired(RETENTION_DAYS)
+        print(f"--- Retention: {result['jobs']} jobs older than {RETENTION_DAYS} days archived "
+              f"({result['rows_per_s']} rows/s) ---")
+    except Exception as e:
+        # Committed batches stay archived; the next run carries on from there
+        db.session.rollback()
+        print(f"WARNING: Archiving expired postings failed: {e}")
+
+
+def process_queue(app, idle_exit=True):
+    """
+    Worker loop: claims and executes queued runs one at a time.
+    With idle_exit the thread ends as soon as the queue is empty.
+    """
+    global _worker_thread
+    with app.app_context():
+        while True:
+            with _worker_lock:
+                run_id = claim_run()
+                if run_id is None and idle_exit:
+                    _worker_thread = None
+                    return
+            if run_id is None:
+                time.sleep(POLL_INTERVAL)
+                continue
+            execute_run(run_id)
+
+
+def start_worker(app):
+    """Starts the in-process background worker unless it is already running."""
+    global _worker_thread
+    with _worker_lock:
+        if _worker_thread is not None and _worker_thread.is_alive():
+            return
+        _worker_thread = threading.Thread(target=process_queue, args=(app,),
+                                          name='devpulse-pipeline-worker', daemon=True)
+        _worker_thread.start()
+
+
+def run_status(run_id):
+    """Returns a JSON-ready dict describing one run, or None."""
+    log = db.session.get(PipelineLog, run_id)
+    if log is None:
+        return None
+    progress = log.progress
+    return {
+        'run_id': log.id,
+        'status': log.status,
+        'run_date': log.run_date.isoformat() if log.run_date else None,
+        'jobs_found': log.jobs_found,
+        'details': log.details,
+        'pages_fetched': progress.pages_fetched if progress else 0,
+        'rows_transformed': progress.rows_transformed if progress else 0,
+        'rows_inserted': progress.rows_inserted if progress else 0,
+        'heartbeat_at': progress.heartbeat_at.isoformat() if progress and progress.heartbeat_at else None,
+        'finished': log.status not in ACTIVE_STATES,
+    }
@@ -0,0 +1,204 @@
+import re
+
+from sqlalchemy import text, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import load_only, selectinload
+
+from . import db, read_session
+from .models import JobPosting, Skill
+
+# SQLite: external-content FTS5 table mirroring job_postings(title, description)
+FTS_TABLE = 'job_postings_fts'
+
+# Postgres: generated tsvector column (title weighted above description)
+PG_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+PER_PAGE = 50
+MAX_TERMS = 8
+
+# Only the newest RANK_WINDOW matches are scored. Very common terms can
+# match most of the table, and ranking all of them costs a full pass; the
+# window keeps every search bounded (100 pages of 50 results).
+RANK_WINDOW = 5000
+
+# What the dashboard's job table renders: a handful of columns (no
+# description) plus skill names, fetched with one extra SELECT per page
+TABLE_ROW_OPTIONS = (
+    load_only(JobPosting.title, JobPosting.company, JobPosting.location,
+              JobPosting.is_remote, JobPosting.url, JobPosting.date_posted),
+    selectinload(JobPosting.skills).load_only(Skill.name),
+)
+
+
+def _dialect():
+    return db.engine.dialect.name
+
+
+def ensure_search_index():
+    """
+    Creates the full-text index if it does not exist yet (idempotent).
+
+    - Postgres: a generated `search_vector` column with a GIN index; the
+      database keeps it in step with every INSERT/UPDATE.
+    - SQLite: an FTS5 table that the loader fills via `index_jobs`.
+      Existing rows are indexed once when the table is first created.
+    """
+    dialect = _dialect()
+    if dialect == 'postgresql':
+        db.session.execute(text(
+            "ALTER TABLE job_postings ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({PG_VECTOR}) STORED"
+        ))
+        db.session.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_job_postings_search_vector "
+            "ON job_postings USING GIN (search_vector)"
+        ))
+        db.session.commit()
+    elif dialect == 'sqlite' and not has_fts_table():
+        try:
+            db.session.execute(text(
+                f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                "title, description, content='job_postings', content_rowid='id', "
+                "tokenize='porter unicode61')"
+            ))
+            db.session.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+            db.session.commit()
+        except OperationalError as e:
+            db.session.rollback()
+            print(f"WARNING: FTS5 unavailable, search falls back to LIKE: {e}")
+
+
+def has_fts_table():
+    return db.session.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {'name': FTS_TABLE}
+    ).first() is not None
+
+
+def index_jobs(job_ids):
+    """
+    Adds freshly inserted postings to the SQLite FTS table.
+    A no-op on Postgres (generated column) and when FTS5 is missing.
+    Runs inside the caller's transaction.
+    """
+    if not job_ids or _dialect() != 'sqlite' or not has_fts_table():
+        return
+    ids = list(job_ids)
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        db.session.execute(
+            text(f"INSERT INTO {FTS_TABLE}(rowid, title, description) "
+                 "SELECT id, title, description FROM job_postings WHERE id IN "
+                 f"({', '.join(str(int(i)) for i in chunk)})")
+        )
+
+
+def unindex_jobs(job_ids):
+    """
+    Removes postings from the SQLite FTS table. Must run BEFORE the rows are
+    deleted from job_postings, because FTS5 needs the old column values.
+    """
+    if not job_ids or _dialect() != 'sqlite' or not has_fts_table():
+        return
+    ids = list(job_ids)
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        db.session.execute(
+            text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description) "
+                 "SELECT 'delete', id, title, description FROM job_postings WHERE id IN "
+                 f"({', '.join(str(int(i)) for i in chunk)})")
+        )
+
+
+def optimize_search_index():
+    """
+    Merges the SQLite FTS table into one segment after bulk deletes (e.g.
+    archiving), dropping the delete markers every search otherwise skips.
+    Postgres keeps its GIN index up to date itself (autovacuum).
+    """
+    if _dialect() != 'sqlite' or not has_fts_table():
+        return
+    db.session.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')"))
+    db.session.commit()
+
+
+def _terms(query):
+    """Splits the search box input into at most MAX_TERMS plain word tokens."""
+    return re.findall(r'\w+', (query or '').lower())[:MAX_TERMS]
+
+
+def _ranked_ids(terms, limit, offset):
+    """Returns matching job ids, best match first, or None if there is no index."""
+    dialect = _dialect()
+    if dialect == 'postgresql':
+        # Every term must match; the last one may be a prefix ('pyth' -> python)
+        tsquery = ' & '.join(terms[:-1] + [terms[-1] + ':*'])
+        rows = read_session.execute(text(
+            "SELECT id FROM ("
+            "  SELECT id, date_posted, ts_rank_cd(search_vector, query) AS score"
+            "  FROM job_postings, to_tsquery('english', :q) AS query"
+            "  WHERE search_vector @@ query ORDER BY id DESC LIMIT :window"
+            ") AS candidates ORDER BY score DESC, date_posted DESC "
+            "LIMIT :limit OFFSET :offset"
+        ), {'q': tsquery, 'window': RANK_WINDOW, 'limit': limit, 'offset': offset})
+        return [row.id for row in rows]
+
+    if dialect == 'sqlite' and has_fts_table():
+        match = ' '.join(f'"{t}"' for t in terms[:-1]) + f' "{terms[-1]}"*'
+        rows = read_session.execute(text(
+            "SELECT id FROM ("
+            f"  SELECT rowid AS id, bm25({FTS_TABLE}, 10.0, 1.0) AS score FROM {FTS_TABLE}"
+            f"  WHERE {FTS_TABLE} MATCH :q ORDER BY rowid DESC LIMIT :window"
+            ") ORDER BY score LIMIT :limit OFFSET :offset"
+        ), {'q': match.strip(), 'window': RANK_WINDOW, 'limit': limit, 'offset': offset})
+        return [row.id for row in rows]
+
+    return None
+
+
+def search_jobs(query, page=1, per_page=PER_PAGE):
+    """
+    Full-text search over job titles and descriptions.
+
+    Args:
+        query (str): What the user typed in the search box.
+        page (int): 1-based page number.
+        per_page (int): Results per page.
+
+    Returns:
+        tuple: (list of JobPosting ranked best first, has_next_page).
+        Only the TABLE_ROW_OPTIONS columns and skills are loaded.
+    """
+    terms = _terms(query)
+    if not terms:
+        return [], False
+
+    page = max(page, 1)
+    offset = (page - 1) * per_page
+    # Ask for one extra row to know whether there is a next page
+    ids = _ranked_ids(terms, per_page + 1, offset)
+
+    if ids is None:
+        # No full-text index available: bounded LIKE scan, newest first
+        like = f"%{' '.join(terms)}%"
+        jobs = read_session.execute(
+            select(JobPosting).options(*TABLE_ROW_OPTIONS)
+            .where(JobPosting.title.ilike(like) | JobPosting.description.ilike(like))
+            .order_by(JobPosting.date_posted.desc())
+            .offset(offset).limit(per_page + 1)
+        ).scalars().all()
+        return jobs[:per_page], len(jobs) > per_page
+
+    has_next = len(ids) > per_page
+    ids = ids[:per_page]
+    if not ids:
+        return [], False
+
+    jobs = read_session.execute(
+        select(JobPosting).where(JobPosting.id.in_(ids)).options(*TABLE_ROW_OPTIONS)
+    ).scalars().all()
+    by_id = {job.id: job for job in jobs}
+    return [by_id[i] for i in ids if i in by_id], has_next
@@ -0,0 +1,121 @@
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import select, func, delete
+from sqlalchemy.dialects import postgresql, sqlite
+
+from . import db, read_session
+from .models import DashboardStat, JobFingerprint, JobPosting, Skill, SkillStat, job_skills
+
+TOTAL_JOBS = 'total_jobs'
+TOTAL_SKILLS = 'total_skills'
+
+
+def refresh_stats():
+    """
+    Recomputes every dashboard number from scratch (full scans).
+    Used to initialise the stats, after a re-tag or an archive run and as a
+    repair tool. Near-duplicate postings are not counted. The caller commits.
+
+    Only writers (the loader, retention, the CLI) call this; a read never
+    rebuilds, so concurrent requests can't race on the primary keys.
+    """
+    now = datetime.utcnow()
+    duplicates = select(JobFingerprint.job_id).where(JobFingerprint.canonical_id.isnot(None))
+    totals = {
+        TOTAL_JOBS: db.session.execute(
+            select(func.count(JobPosting.id)).where(JobPosting.id.not_in(duplicates))
+        ).scalar(),
+        TOTAL_SKILLS: db.session.execute(select(func.count(Skill.id))).scalar(),
+    }
+    db.session.execute(delete(DashboardStat))
+    db.session.add_all(DashboardStat(name=name, value=value, updated_at=now) for name, value in totals.items())
+
+    db.session.execute(delete(SkillStat))
+    counts = db.session.execute(
+        select(job_skills.c.skill_id, func.count())
+        .where(job_skills.c.job_id.not_in(duplicates))
+        .group_by(job_skills.c.skill_id)
+    ).all()
+    if counts:
+        db.session.execute(SkillStat.__table__.insert(),
+                           [{'skill_id': skill_id, 'job_count': n} for skill_id, n in counts])
+    db.session.flush()
+
+
+def increment_stat(name, delta):
+    """Adds `delta` to a stat. Returns False if the stats were never initialised."""
+    result = db.session.execute(
+        db.update(DashboardStat).where(DashboardStat.name == name)
+        .values(value=DashboardStat.value + delta, updated_at=datetime.utcnow())
+    )
+    return result.rowcount > 0
+
+
+def record_load(inserted_jobs, new_skills, skill_ids):
+    """
+    Applies one loader batch to the stats, inside the loader's transaction.
+
+    Args:
+        inserted_jobs (int): Canonical postings inserted by the batch.
+        new_skills (int): Skills created by the batch.
+        skill_ids (iterable): One skill id per job_skills row of those postings.
+    """
+    # Not initialised yet: count everything, this batch included
+    if not increment_stat(TOTAL_JOBS, inserted_jobs):
+        refresh_stats()
+        return
+    increment_stat(TOTAL_SKILLS, new_skills)
+
+    per_skill = Counter(skill_ids)
+    if not per_skill:
+        return
+    rows = [{'skill_id': skill_id, 'job_count': n} for skill_id, n in per_skill.items()]
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        stmt = insert(SkillStat.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['skill_id'],
+            set_={'job_count': SkillStat.__table__.c.job_count + stmt.excluded.job_count}
+        )
+        db.session.execute(stmt, rows)
+    else:
+        # No portable upsert: recount from scratch
+        refresh_stats()
+
+
+def ensure_stats():
+    """Initialises the stats if they were never computed. Returns True if it did; the caller commits."""
+    if db.session.execute(select(DashboardStat.name).where(DashboardStat.name == TOTAL_JOBS)).first():
+        return False
+    refresh_stats()
+    return True
+
+
+def get_dashboard_stats(top=5):
+    """
+    Reads the pre-computed numbers for the dashboard (through read_session).
+    Cost depends on the number of skills, never on the number of postings.
+    Stats that were never computed read as zero, updated_at None.
+
+    Returns:
+        dict: total_jobs, total_skills, top_skills [(name, count)], updated_at
+    """
+    stats = {s.name: s for s in read_session.execute(select(DashboardStat)).scalars()}
+    if TOTAL_JOBS not in stats:
+        return {'total_jobs': 0, 'total_skills': 0, 'top_skills': [], 'updated_at': None}
+
+    top_skills = read_session.execute(
+        select(Skill.name, SkillStat.job_count).join(Skill, Skill.id == SkillStat.skill_id)
+        .where(SkillStat.job_count > 0)
+        .order_by(SkillStat.job_count.desc(), Skill.name).limit(top)
+    ).all()
+
+    return {
+        'total_jobs': stats[TOTAL_JOBS].value,
+        'total_skills': stats[TOTAL_SKILLS].value if TOTAL_SKILLS in stats else 0,
+        'top_skills': [tuple(row) for row in top_skills],
+        'updated_at': max(s.updated_at for s in stats.values()),
+    }
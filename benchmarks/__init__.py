@@ -0,0 +1,2 @@
+# Standalone benchmark scripts. Run them from the project root, e.g.:
+# python -m benchmarks.bench_load
@@ -0,0 +1,81 @@
+"""
+Read latency while the loader is writing.
+
+Usage:
+    python -m benchmarks.bench_contention
+    python -m benchmarks.bench_contention --batches 20 --url /api/jobs
+
+Seeds a throwaway SQLite database, then runs load_jobs_to_db in a
+background thread (the pipeline's writer) while the main thread keeps
+requesting a page through the Flask test client. Reports how many reads
+got through, how many failed (e.g. 'database is locked') and their
+latency. Without WAL, each loader commit stalls or fails the readers.
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import time
+
+if 'DATABASE_URL' not in os.environ:
+    _tmp = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    os.environ['DATABASE_URL'] = 'sqlite:///' + _tmp.name
+os.environ['CACHE_BACKEND'] = 'none'  # every read must reach the database
+
+from app import create_app, db, init_schema
+from etl.extract import _percentile
+from etl.load import load_jobs_to_db
+from benchmarks.bench_load import make_jobs
+
+app = create_app()
+
+
+def writer(batches, batch_size, done):
+    with app.app_context():
+        for batch in range(batches):
+            jobs = make_jobs(batch_size, seed=1000 + batch)
+            for i, job in enumerate(jobs):
+                job['url'] = f'https://bench.example/contention/{batch}/{i}'
+            load_jobs_to_db(jobs)
+    done.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000, help='Postings seeded before the run')
+    parser.add_argument('--batches', type=int, default=8, help='Loader commits during the run')
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--url', default='/dashboard?q=python', help='Route read during the load')
+    args = parser.parse_args()
+
+    with app.app_context():
+        init_schema()
+        load_jobs_to_db(make_jobs(args.rows))
+        journal = db.session.execute(db.text('PRAGMA journal_mode')).scalar()
+
+    client = app.test_client()
+    done = threading.Event()
+    timings, errors = [], 0
+    thread = threading.Thread(target=writer, args=(args.batches, args.batch_size, done))
+    with contextlib.redirect_stdout(io.StringIO()):  # keep the loader's progress lines out
+        start = time.perf_counter()
+        thread.start()
+        while not done.is_set():
+            started = time.perf_counter()
+            status = client.get(args.url).status_code
+            timings.append((time.perf_counter() - started) * 1000)
+            errors += status != 200
+        thread.join()
+        wall_s = time.perf_counter() - start
+
+    print(f"profile {app.config['DB_PROFILE']}, journal_mode {journal}, "
+          f"{args.batches} x {args.batch_size} rows loaded in {wall_s:.1f} s")
+    print(f"GET {args.url}: {len(timings)} reads ({len(timings) / wall_s:.0f}/s), {errors} failed")
+    print(f"latency ms: p50 {_percentile(timings, 50):.1f}  p95 {_percentile(timings, 95):.1f}  "
+          f"max {max(timings):.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+End-to-end benchmark: synthetic Adzuna pages -> transform -> load -> pages.
+
+Usage:
+    python -m benchmarks.bench_e2e                          # 10k postings
+    python -m benchmarks.bench_e2e --jobs 100000 --workers 4
+    python -m benchmarks.bench_e2e --compare bench_results/e2e-1a2b3c4-10000.json
+
+Generates realistic raw results (see benchmarks/synthetic.py), pushes them
+through transform_jobs and load_jobs_to_db in pipeline-sized batches, then
+requests the dashboard, search, pipeline-status and API routes through the
+Flask test client with the response cache off. Throughput, route latency
+and peak memory are written to a JSON file named after the current commit,
+and --compare prints the change against an earlier results file.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+if 'DATABASE_URL' not in os.environ:
+    _tmp = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    os.environ['DATABASE_URL'] = 'sqlite:///' + _tmp.name
+os.environ['CACHE_BACKEND'] = 'none'  # time the work, not cache hits
+
+from etl.extract import _percentile
+from app import create_app, init_schema
+from etl.load import load_jobs_to_db
+from etl.metrics import peak_rss_mb
+from etl.transform import transform_jobs
+from benchmarks.synthetic import make_raw_jobs, make_pages
+
+app = create_app()
+
+ROUTES = [
+    '/dashboard',
+    '/dashboard?q=python',
+    '/dashboard?q=senior+data&page=3',
+    '/pipeline-status',
+    '/api/jobs?limit=50',
+    '/api/jobs?skill=python&skill=aws&remote=true',
+    '/api/jobs?salary_min=40000&distinct=true',
+]
+
+# Results are compared on these keys; higher is better unless listed in LOWER_IS_BETTER
+LOWER_IS_BETTER = ('_ms', '_s', '_mb')
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_pipeline_stages(pages, batch_size, workers):
+    """Transforms and loads `pages` in batches, like etl.pipeline does."""
+    totals = {'transform_s': 0.0, 'load_s': 0.0, 'raw': 0, 'transformed': 0,
+              'inserted': 0, 'skipped': 0, 'near_duplicates': 0, 'failed': 0}
+    batch = []
+    for page in pages + [None]:
+        if page is not None:
+            batch.extend(page['results'])
+        if batch and (page is None or len(batch) >= batch_size):
+            start = time.perf_counter()
+            cleaned = transform_jobs(batch, workers=workers)
+            totals['transform_s'] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = load_jobs_to_db(cleaned)
+            totals['load_s'] += time.perf_counter() - start
+
+            totals['raw'] += len(batch)
+            totals['transformed'] += len(cleaned)
+            for key in ('inserted', 'skipped', 'near_duplicates', 'failed'):
+                totals[key] += result[key]
+            batch = []
+    return totals
+
+
+def time_routes(repeat):
+    client = app.test_client()
+    routes = {}
+    for url in ROUTES:
+        client.get(url)  # warm-up
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = client.get(url)
+            timings.append((time.perf_counter() - start) * 1000)
+        routes[url] = {
+            'status': response.status_code,
+            'p50_ms': round(_percentile(timings, 50), 2),
+            'p95_ms': round(_percentile(timings, 95), 2),
+            'max_ms': round(max(timings), 2),
+        }
+    return routes
+
+
+def flatten(results):
+    """{'stage.metric': value} of the comparable numbers in a results file."""
+    flat = {}
+    for stage, values in results['stages'].items():
+        for key, value in values.items():
+            flat[f'{stage}.{key}'] = value
+    for url, values in results['routes'].items():
+        for key in ('p50_ms', 'p95_ms'):
+            flat[f'{url} {key}'] = values[key]
+    flat['peak_rss_mb'] = results['peak_rss_mb']
+    return flat
+
+
+def compare(old, new):
+    old_flat, new_flat = flatten(old), flatten(new)
+    print(f"\nvs {old['meta']['commit']} ({old['meta']['jobs']} jobs)")
+    print(f"{'metric':<60} {'before':>10} {'after':>10} {'change':>8}")
+    for key, after in new_flat.items():
+        before = old_flat.get(key)
+        if not isinstance(after, (int, float)) or not isinstance(before, (int, float)) or not before:
+            continue
+        change = (after - before) / before * 100
+        worse = change > 0 if key.endswith(LOWER_IS_BETTER) else change < 0
+        flag = ' !' if worse and abs(change) >= 10 else ''
+        print(f"{key:<60} {before:>10} {after:>10} {change:>+7.1f}%{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=10_000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=1, help='Transform worker processes')
+    parser.add_argument('--repeat', type=int, default=20, help='Requests per route')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Results file (default bench_results/e2e-<commit>-<jobs>.json)')
+    parser.add_argument('--compare', help='Earlier results file to compare against')
+    args = parser.parse_args()
+
+    # 1. Generate (not timed)
+    pages = make_pages(make_raw_jobs(args.jobs, seed=args.seed))
+
+    # 2. Transform + load
+    with app.app_context():
+        init_schema()
+        start = time.perf_counter()
+        totals = run_pipeline_stages(pages, args.batch_size, args.workers)
+        wall_s = time.perf_counter() - start
+    pipeline_rss = peak_rss_mb()
+
+    # 3. Read paths
+    routes = time_routes(args.repeat)
+
+    commit = git_commit()
+    results = {
+        'meta': {
+            'commit': commit,
+            'timestamp': datetime.utcnow().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'database': app.config['SQLALCHEMY_DATABASE_URI'].split(':', 1)[0],
+            'jobs': args.jobs,
+            'batch_size': args.batch_size,
+            'workers': args.workers,
+            'seed': args.seed,
+        },
+        'stages': {
+            'transform': {
+                'seconds_s': round(totals['transform_s'], 3),
+                'rows_per_s': round(totals['raw'] / totals['transform_s'], 1) if totals['transform_s'] else 0.0,
+                'rows': totals['transformed'],
+            },
+            'load': {
+                'seconds_s': round(totals['load_s'], 3),
+                'rows_per_s': round(totals['transformed'] / totals['load_s'], 1) if totals['load_s'] else 0.0,
+                'inserted': totals['inserted'],
+                'skipped': totals['skipped'],
+                'near_duplicates': totals['near_duplicates'],
+                'failed': totals['failed'],
+            },
+            'pipeline': {
+                'wall_s': round(wall_s, 3),
+                'rows_per_s': round(args.jobs / wall_s, 1) if wall_s else 0.0,
+                'peak_rss_mb': pipeline_rss,
+            },
+        },
+        'routes': routes,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+    print(f"\n{'stage':<12} {'seconds':>8} {'rows/s':>10}")
+    for stage in ('transform', 'load'):
+        values = results['stages'][stage]
+        print(f"{stage:<12} {values['seconds_s']:>8.2f} {values['rows_per_s']:>10.0f}")
+    print(f"{'pipeline':<12} {wall_s:>8.2f} {results['stages']['pipeline']['rows_per_s']:>10.0f}")
+    print(f"inserted {totals['inserted']}, skipped {totals['skipped']}, "
+          f"near-duplicates {totals['near_duplicates']}, peak RSS {results['peak_rss_mb']} MB")
+    print(f"\n{'route':<48} {'status':>6} {'p50 ms':>8} {'p95 ms':>8}")
+    for url, values in routes.items():
+        print(f"{url:<48} {values['status']:>6} {values['p50_ms']:>8.1f} {values['p95_ms']:>8.1f}")
+
+    output = args.output or os.path.join('bench_results', f"e2e-{commit or 'nogit'}-{args.jobs}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Runs the concurrent extractor against a local stub of the Adzuna search API.
+
+Usage:
+    python -m benchmarks.bench_extract
+    python -m benchmarks.bench_extract --pages 20 --latency 0.1 --error-rate 0.1
+
+The stub serves `--pages` full pages per category with an artificial
+latency, and answers a random share of requests with 429/503 so the
+retry/backoff path is exercised. Sequential (1 worker) and concurrent
+runs are compared.
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from etl import extract
+from etl.extract import ExtractionStats, extract_categories
+
+CATEGORIES = ["Software Engineer", "Data Scientist", "Cyber Security", "IT Support", "Information Systems"]
+
+
+def make_stub_handler(pages, latency, error_rate):
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            if random.random() < error_rate:
+                self.send_response(random.choice([429, 503]))
+                self.send_header('Retry-After', '0')
+                self.end_headers()
+                return
+
+            parts = urlsplit(self.path)
+            page = int(parts.path.rstrip('/').rsplit('/', 1)[-1])
+            query = parse_qs(parts.query)
+            what = query.get('what', [''])[0]
+            per_page = int(query.get('results_per_page', ['50'])[0])
+
+            results = []
+            if page <= pages:
+                results = [{
+                    'title': f'{what} {page}-{i}',
+                    'company': {'display_name': 'StubCorp'},
+                    'location': {'display_name': 'Cape Town'},
+                    'description': '<p>Python and SQL</p>',
+                    'redirect_url': f'https://stub.example/{what}/{page}/{i}',
+                    'created': '2025-01-01T10:00:00Z',
+                } for i in range(per_page)]
+
+            body = json.dumps({'results': results}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return StubHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=10, help='Pages served per category')
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds added to every response')
+    parser.add_argument('--error-rate', type=float, default=0.05, help='Share of 429/503 responses')
+    parser.add_argument('--workers', type=int, default=5)
+    parser.add_argument('--backoff', type=float, default=0.05, help='Retry backoff base in seconds')
+    args = parser.parse_args()
+    extract.BACKOFF_BASE = args.backoff
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_stub_handler(args.pages, args.latency, args.error_rate))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    search_url = f'http://127.0.0.1:{server.server_port}/v1/api/jobs/za/search/{{page}}'
+
+    os.environ.setdefault('ADZUNA_APP_ID', 'stub')
+    os.environ.setdefault('ADZUNA_APP_KEY', 'stub')
+
+    try:
+        for workers in (1, args.workers):
+            stats = ExtractionStats()
+            extract_categories(CATEGORIES, search_url=search_url, max_pages=args.pages,
+                               max_workers=workers, requests_per_second=None, stats=stats)
+            print(f"workers={workers}: {json.dumps(stats.summary())}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Compares the old row-by-row loader with the set-based bulk loader.
+
+Usage:
+    python -m benchmarks.bench_load                 # 100, 10k and 100k rows
+    python -m benchmarks.bench_load --sizes 100 5000
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_load
+
+Each size runs against an empty schema, then loads the same batch a
+second time to measure the "everything is a duplicate" path.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Point the app at a throwaway database BEFORE it is created
+if 'DATABASE_URL' not in os.environ:
+    _tmp = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    os.environ['DATABASE_URL'] = 'sqlite:///' + _tmp.name
+
+from app import create_app, db, init_schema
+from app.models import JobPosting, Skill
+from etl.load import load_jobs_to_db
+
+app = create_app()
+
+SKILLS = [
+    'Python', 'SQL', 'Java', 'C#', 'AWS', 'Azure', 'GCP',
+    'Docker', 'Kubernetes', 'Spark', 'Hadoop', 'Databricks',
+    'Flask', 'Django', 'React', 'Power BI', 'Tableau', 'Excel'
+]
+
+
+def make_jobs(n, seed=42):
+    """Builds `n` cleaned job dicts shaped like transform_jobs output."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    jobs = []
+    for i in range(n):
+        salary = rng.randint(15, 90) * 1000
+        jobs.append({
+            'title': f'Engineer {i}',
+            'company': f'Company {rng.randint(1, 500)}',
+            'location': rng.choice(['Cape Town', 'Johannesburg', 'Durban']),
+            'is_remote': rng.random() < 0.2,
+            'salary_min': salary,
+            'salary_max': salary + 10000,
+            'currency': 'ZAR',
+            'url': f'https://bench.example/jobs/{i}',
+            'source_site': 'Adzuna',
+            'description': 'Benchmark description ' * 10,
+            'date_posted': start + timedelta(minutes=i),
+            'skills': rng.sample(SKILLS, rng.randint(0, 5)),
+        })
+    return jobs
+
+
+def legacy_load_jobs_to_db(cleaned_jobs):
+    """The original loader: one SELECT per job and per skill, ORM inserts."""
+    for job_data in cleaned_jobs:
+        if JobPosting.query.filter_by(url=job_data['url']).first():
+            continue
+        new_job = JobPosting(**{k: v for k, v in job_data.items() if k != 'skills'})
+        for skill_name in job_data['skills']:
+            skill = Skill.query.filter_by(name=skill_name).first()
+            if not skill:
+                skill = Skill(name=skill_name)
+                db.session.add(skill)
+                db.session.flush()
+            new_job.skills.append(skill)
+        db.session.add(new_job)
+    db.session.commit()
+
+
+def reset_schema():
+    with app.app_context():
+        db.drop_all()
+        init_schema()
+
+
+def timed(fn, jobs):
+    with app.app_context():
+        start = time.perf_counter()
+        fn(jobs)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 10_000, 100_000])
+    parser.add_argument('--legacy-max', type=int, default=100_000,
+                        help='Skip the legacy loader above this many rows (it is slow)')
+    args = parser.parse_args()
+
+    loaders = [('legacy', legacy_load_jobs_to_db), ('bulk', load_jobs_to_db)]
+
+    print(f"{'rows':>8} {'loader':>8} {'fresh (s)':>10} {'rows/s':>10} {'reload (s)':>11}")
+    for size in args.sizes:
+        jobs = make_jobs(size)
+        for name, loader in loaders:
+            if name == 'legacy' and size > args.legacy_max:
+                print(f"{size:>8} {name:>8} {'skipped':>10}")
+                continue
+            reset_schema()
+            fresh = timed(loader, jobs)
+            reload = timed(loader, jobs)
+            print(f"{size:>8} {name:>8} {fresh:>10.3f} {size / fresh:>10.0f} {reload:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Memory held per transformed posting: the old 12-key dicts vs JobRecord.
+
+Usage:
+    python -m benchmarks.bench_memory
+    python -m benchmarks.bench_memory --jobs 50000 --workers 4
+
+Builds synthetic Adzuna results (round-tripped through JSON, like real API
+responses, so every posting owns its strings) and transforms them into each
+representation. 'held' is the deep size of the output per posting, with
+every object counted once however many postings share it (an interned
+company name is paid for once). The cleaned description is the same in
+every representation, so 'w/o text' leaves it out. 'pickled' is what one
+posting costs on its way back from a transform worker process.
+"""
+import argparse
+import contextlib
+import io
+import json
+import pickle
+import sys
+from datetime import datetime
+
+from etl.dedupe import minhash
+from etl.transform import clean_html, transform_job, transform_jobs
+from etl.skills import SkillMatcher
+from benchmarks.synthetic import make_raw_jobs
+
+
+def legacy_transform_job(job, matcher):
+    """The original transform output: one dict per posting, skills as a list."""
+    clean_desc = clean_html(job.get('description', ''))
+    full_text = f"{job.get('title', '')} {clean_desc}"
+    try:
+        date_obj = datetime.strptime(job.get('created'), "%Y-%m-%dT%H:%M:%SZ")
+    except (TypeError, ValueError):
+        date_obj = datetime.utcnow()
+    title = job.get('title', 'Unknown Title')
+    company = job.get('company', {}).get('display_name', 'Unknown Company')
+    return {
+        'title': title,
+        'company': company,
+        'location': job.get('location', {}).get('display_name', 'South Africa'),
+        'is_remote': 1 if 'remote' in full_text.lower() else 0,
+        'salary_min': job.get('salary_min'),
+        'salary_max': job.get('salary_max'),
+        'currency': 'ZAR',
+        'url': job.get('redirect_url'),
+        'source_site': 'Adzuna',
+        'description': clean_desc,
+        'date_posted': date_obj,
+        'skills': list(matcher.find(full_text)),
+        'minhash': minhash(title, company, clean_desc),
+    }
+
+
+def deep_size(jobs):
+    """Bytes of `jobs` and everything it references, each object counted once."""
+    seen, total, stack = set(), 0, [jobs]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+    return total
+
+
+def description(job):
+    return job['description'] if isinstance(job, dict) else job.description
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=20_000)
+    parser.add_argument('--workers', type=int, default=2, help='Process pool size for the pooled run')
+    args = parser.parse_args()
+
+    raw = json.loads(json.dumps(make_raw_jobs(args.jobs)))
+    matcher = SkillMatcher()
+    with contextlib.redirect_stdout(io.StringIO()):
+        transform_jobs(raw[:500], workers=args.workers)  # start the pool outside the measurement
+
+    results = {
+        'dict (before)': [legacy_transform_job(job, matcher) for job in raw],
+        'JobRecord': [transform_job(job, matcher) for job in raw],
+    }
+    with contextlib.redirect_stdout(io.StringIO()):
+        results[f'JobRecord, {args.workers} workers'] = transform_jobs(raw, workers=args.workers)
+
+    n = args.jobs
+    print(f"{n} postings, bytes per posting")
+    print(f"{'representation':<24} {'held':>8} {'w/o text':>9} {'pickled':>8}")
+    for name, jobs in results.items():
+        held = deep_size(jobs)
+        text = sum(sys.getsizeof(description(job)) for job in jobs)
+        pickled = len(pickle.dumps(jobs[:1000], protocol=pickle.HIGHEST_PROTOCOL)) / min(len(jobs), 1000)
+        print(f"{name:<24} {held / n:>8.0f} {(held - text) / n:>9.0f} {pickled:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Retention benchmark: archive throughput, and what it buys the read paths.
+
+Usage:
+    python -m benchmarks.bench_retention
+    python -m benchmarks.bench_retention --rows 200000 --days 90 --batch-size 5000
+
+Seeds a throwaway SQLite database with `--rows` postings spread evenly
+over `--history` days, then archives everything older than `--days` with
+archive_expired and reports rows moved per second. Around the archive
+run it times the work that grows with job_postings: the full stats
+refresh, a full-text search page and the uncached analytics.
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+if 'DATABASE_URL' not in os.environ:
+    _tmp = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    os.environ['DATABASE_URL'] = 'sqlite:///' + _tmp.name
+
+from app import create_app, db, init_schema
+from app.analytics import salary_percentiles, skill_demand
+from app.search import search_jobs
+from app.stats import refresh_stats
+from etl.load import load_jobs_to_db
+from etl.retention import archive_expired, retention_status
+from benchmarks.bench_load import make_jobs
+
+app = create_app()
+
+# (name, callable) pairs, each run inside an app context
+READS = (
+    ('stats refresh', refresh_stats),
+    ('search "python"', lambda: search_jobs('python', page=2)),
+    ('salaries by skill', lambda: salary_percentiles('skill')),
+    ('monthly skill demand', lambda: skill_demand('month')),
+)
+NOW = datetime(2025, 12, 31)
+
+
+def seed(rows, history_days, batch=20_000):
+    step = timedelta(days=history_days) / rows
+    with app.app_context():
+        init_schema()
+        for start in range(0, rows, batch):
+            jobs = make_jobs(min(batch, rows - start), seed=start)
+            for i, job in enumerate(jobs):
+                n = start + i
+                job['url'] = f'https://bench.example/retention/{n}'
+                job['date_posted'] = NOW - (rows - n) * step
+                job['description'] = f'Role {n} working with python and {job["company"]}'
+            load_jobs_to_db(jobs)
+
+
+def time_reads(repeat):
+    """{name: median ms} over `repeat` runs each."""
+    timings = {}
+    with app.app_context():
+        for name, read in READS:
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                read()
+                samples.append((time.perf_counter() - start) * 1000)
+                db.session.rollback()
+            timings[name] = statistics.median(samples)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50_000, help='Postings seeded before the run')
+    parser.add_argument('--history', type=int, default=365, help='Days the seeded postings span')
+    parser.add_argument('--days', type=int, default=90, help='Active window')
+    parser.add_argument('--batch-size', type=int, default=2000, help='Postings moved per transaction')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per timed read')
+    args = parser.parse_args()
+
+    print(f"Seeding {args.rows} postings over {args.history} days...")
+    with contextlib.redirect_stdout(io.StringIO()):
+        seed(args.rows, args.history)
+
+    before = time_reads(args.repeat)
+    with app.app_context():
+        with contextlib.redirect_stdout(io.StringIO()):  # keep the per-batch progress lines out
+            result = archive_expired(args.days, batch_size=args.batch_size, now=NOW)
+        status = retention_status(args.days, now=NOW)
+    after = time_reads(args.repeat)
+
+    print(f"Archived {result['jobs']} jobs ({result['skill_links']} skill links) in {result['batches']} "
+          f"batches of {args.batch_size}: {result['seconds']} s, {result['rows_per_s']:.0f} rows/s")
+    print(f"{status['active']} active, {status['archived']} archived, {status['rollup_months']} months rolled up")
+    print(f"\n{'median ms':<34} {'before':>8} {'after':>8}")
+    for name, _read in READS:
+        print(f"{name:<34} {before[name]:>8.1f} {after[name]:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
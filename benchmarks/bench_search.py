@@ -0,0 +1,73 @@
+"""
+Times dashboard searches against a large synthetic job table.
+
+Usage:
+    python -m benchmarks.bench_search                 # 100k postings
+    python -m benchmarks.bench_search --rows 1000000
+
+Seeds a throwaway SQLite database (or DATABASE_URL) through the bulk
+loader, so the full-text index is filled exactly as in production, then
+reports the median latency of several ranked, paginated searches.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+if 'DATABASE_URL' not in os.environ:
+    _tmp = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    os.environ['DATABASE_URL'] = 'sqlite:///' + _tmp.name
+
+from app import init_schema
+from app.search import search_jobs
+from etl.load import load_jobs_to_db
+from benchmarks.bench_load import app, make_jobs
+
+WORDS = ("python data engineer cloud analyst remote senior junior platform support "
+         "kubernetes azure pipeline warehouse reporting security network").split()
+
+# Background vocabulary so descriptions look like prose, not keyword soup
+_rng = random.Random(0)
+FILLER = [''.join(_rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(_rng.randint(3, 9)))
+          for _ in range(5000)]
+
+QUERIES = ['python', 'pyth', 'data engineer', 'kubernetes azure', 'senior remote python', 'zzzz']
+
+
+def seed(rows, batch=20_000):
+    rng = random.Random(1)
+    with app.app_context():
+        init_schema()
+        for start in range(0, rows, batch):
+            jobs = make_jobs(min(batch, rows - start), seed=start)
+            for i, job in enumerate(jobs):
+                job['url'] = f'https://bench.example/search/{start + i}'
+                job['title'] = ' '.join(rng.sample(WORDS, 3)).title()
+                job['description'] = ' '.join(rng.choices(FILLER, k=60) + rng.sample(WORDS, 4))
+            load_jobs_to_db(jobs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    seed(args.rows)
+
+    print(f"{'query':<24} {'page':>4} {'results':>8} {'median ms':>10}")
+    with app.app_context():
+        for query in QUERIES:
+            for page in (1, 20):
+                timings = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    jobs, _has_next = search_jobs(query, page=page)
+                    timings.append((time.perf_counter() - start) * 1000)
+                print(f"{query:<24} {page:>4} {len(jobs):>8} {statistics.median(timings):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
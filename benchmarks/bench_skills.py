@@ -0,0 +1,83 @@
+"""
+Micro-benchmark: per-skill regex loop vs the single-pass SkillMatcher.
+
+Usage:
+    python -m benchmarks.bench_skills
+    python -m benchmarks.bench_skills --docs 5000 --sizes 18 500 5000
+
+Builds a synthetic corpus of job descriptions and dictionaries of growing
+size (the real TARGET_SKILLS padded with made-up skill names), then times
+both approaches over the whole corpus.
+"""
+import argparse
+import random
+import re
+import string
+import time
+
+from etl.skills import TARGET_SKILLS, SkillMatcher
+
+FILLER = ("we are looking for a motivated engineer to join our team you will build "
+          "and maintain services work with stakeholders and ship features").split()
+
+
+def make_dictionary(size, rng):
+    skills = list(TARGET_SKILLS)
+    while len(skills) < size:
+        length = rng.randint(3, 10)
+        skills.append(''.join(rng.choice(string.ascii_lowercase) for _ in range(length)).capitalize())
+    return skills[:size]
+
+
+def make_corpus(docs, skills, rng, words=150):
+    corpus = []
+    for _ in range(docs):
+        text = [rng.choice(FILLER) for _ in range(words)]
+        for skill in rng.sample(skills, min(5, len(skills))):
+            text.insert(rng.randrange(len(text)), skill)
+        corpus.append(' '.join(text))
+    return corpus
+
+
+def legacy_find(text, skills):
+    """The original approach: one re.search per skill per document."""
+    text_lower = text.lower()
+    return [s for s in skills if re.search(r'\b' + re.escape(s.lower()) + r'\b', text_lower)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--docs', type=int, default=2000)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[18, 100, 1000, 5000])
+    parser.add_argument('--legacy-max', type=int, default=100,
+                        help='Skip the per-skill loop above this dictionary size')
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    print(f"{'skills':>7} {'compile (ms)':>13} {'matcher (ms)':>13} {'legacy (ms)':>12} {'us/doc':>8}")
+    for size in args.sizes:
+        skills = make_dictionary(size, rng)
+        corpus = make_corpus(args.docs, skills, rng)
+
+        start = time.perf_counter()
+        matcher = SkillMatcher(skills, aliases={})
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for text in corpus:
+            matcher.find(text)
+        matcher_ms = (time.perf_counter() - start) * 1000
+
+        legacy_ms = '-'
+        if size <= args.legacy_max:
+            start = time.perf_counter()
+            for text in corpus:
+                legacy_find(text, skills)
+            legacy_ms = f"{(time.perf_counter() - start) * 1000:.1f}"
+
+        per_doc = matcher_ms * 1000 / args.docs
+        print(f"{size:>7} {compile_ms:>13.1f} {matcher_ms:>13.1f} {legacy_ms:>12} {per_doc:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
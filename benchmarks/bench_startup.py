@@ -0,0 +1,117 @@
+"""
+Startup benchmark: how long a fresh worker process takes to serve.
+
+Usage:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --workers 10 --url /api/jobs
+
+Seeds a throwaway SQLite database, then starts `--workers` fresh Python
+processes one after another, the way Gunicorn boots its workers. Each one
+times importing the app package, create_app(), the first request and a
+second (warm) request through the Flask test client, and reports which
+heavy modules (pandas, NumPy, BeautifulSoup, ...) got imported on the way.
+`import etl` is timed in its own processes, since the pipeline and the
+CLI import it without the web app.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+if 'DATABASE_URL' not in os.environ:
+    _tmp = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    os.environ['DATABASE_URL'] = 'sqlite:///' + _tmp.name
+os.environ['CACHE_BACKEND'] = 'none'  # the first request must do real work
+
+# Modules a web worker should not need before its first request
+HEAVY_MODULES = ('pandas', 'numpy', 'pyarrow', 'bs4', 'requests', 'etl.transform', 'etl.load')
+
+
+def seed(rows):
+    from app import create_app, init_schema
+    from etl.load import load_jobs_to_db
+    from benchmarks.bench_load import make_jobs
+
+    app = create_app()
+    with app.app_context():
+        init_schema()
+        load_jobs_to_db(make_jobs(rows))
+
+
+def worker(url):
+    """Runs in the child process: times one cold start and prints it as JSON."""
+    start = time.perf_counter()
+    from app import create_app
+    imported = time.perf_counter()
+    app = create_app()
+    created = time.perf_counter()
+    client = app.test_client()
+    status = client.get(url).status_code
+    first = time.perf_counter()
+    client.get(url)
+    second = time.perf_counter()
+    print(json.dumps({
+        'import_ms': (imported - start) * 1000,
+        'create_app_ms': (created - imported) * 1000,
+        'first_request_ms': (first - created) * 1000,
+        'warm_request_ms': (second - first) * 1000,
+        'status': status,
+        'heavy': [name for name in HEAVY_MODULES if name in sys.modules],
+    }))
+
+
+def import_etl():
+    start = time.perf_counter()
+    import etl  # noqa: F401
+    print(json.dumps({'import_etl_ms': (time.perf_counter() - start) * 1000,
+                      'heavy': [name for name in HEAVY_MODULES if name in sys.modules]}))
+
+
+def spawn(*args):
+    """(wall ms of the whole process, its JSON result) for one fresh interpreter."""
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, '-m', 'benchmarks.bench_startup', *args],
+                            capture_output=True, text=True, check=True).stdout
+    wall_ms = (time.perf_counter() - start) * 1000
+    return wall_ms, json.loads(output.strip().splitlines()[-1])
+
+
+def summary(name, values):
+    print(f"{name:<22} {statistics.median(values):>10.1f} {max(values):>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=5, help='Fresh processes to sample')
+    parser.add_argument('--rows', type=int, default=2000, help='Postings seeded before the run')
+    parser.add_argument('--url', default='/dashboard', help='Route requested by every worker')
+    parser.add_argument('--child', choices=('worker', 'etl'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child == 'worker':
+        return worker(args.url)
+    if args.child == 'etl':
+        return import_etl()
+
+    seed(args.rows)
+
+    runs = [spawn('--child', 'worker', '--url', args.url) for _ in range(args.workers)]
+    etl_runs = [spawn('--child', 'etl') for _ in range(args.workers)]
+
+    print(f"\n{args.workers} cold starts, GET {args.url} (status {runs[-1][1]['status']})")
+    print(f"{'ms':<22} {'median':>10} {'max':>10}")
+    for key in ('import_ms', 'create_app_ms', 'first_request_ms', 'warm_request_ms'):
+        summary(key, [result[key] for _wall, result in runs])
+    summary('worker process', [wall for wall, _result in runs])
+    summary('import etl', [result['import_etl_ms'] for _wall, result in etl_runs])
+
+    print(f"\nHeavy modules loaded by the first request: {', '.join(runs[-1][1]['heavy']) or 'none'}")
+    print(f"Heavy modules loaded by 'import etl': {', '.join(etl_runs[-1][1]['heavy']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Measures transform_jobs throughput in-process vs on a process pool.
+
+Usage:
+    python -m benchmarks.bench_transform
+    python -m benchmarks.bench_transform --jobs 20000 --workers 1 2 4 8
+
+Half of the synthetic descriptions are HTML (parsed by BeautifulSoup) and
+half are plain text (served by the fast path), roughly like full Adzuna
+descriptions. Output order is checked against the serial run.
+"""
+import argparse
+import os
+import random
+import time
+
+from etl.skills import TARGET_SKILLS
+from etl.transform import transform_jobs
+
+SENTENCES = [
+    "You will design and build data pipelines",
+    "Experience with {skill} is essential",
+    "Nice to have: {skill} and {skill2}",
+    "Join a fast growing remote-first team",
+    "We offer medical aid and a hybrid working model",
+]
+
+
+def make_raw_jobs(n, rng, paragraphs=12):
+    jobs = []
+    for i in range(n):
+        parts = [rng.choice(SENTENCES).format(skill=rng.choice(TARGET_SKILLS), skill2=rng.choice(TARGET_SKILLS))
+                 for _ in range(paragraphs)]
+        if i % 2:
+            description = ''.join(f"<p><strong>{p}.</strong> <em>Apply&nbsp;now</em></p>" for p in parts)
+        else:
+            description = '. '.join(parts)
+        jobs.append({
+            'title': f'Data Engineer {i}',
+            'company': {'display_name': 'BenchCorp'},
+            'location': {'display_name': 'Johannesburg'},
+            'description': description,
+            'salary_min': 30000,
+            'salary_max': 45000,
+            'redirect_url': f'https://bench.example/{i}',
+            'created': '2025-01-01T10:00:00Z',
+        })
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=10_000)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    raw = make_raw_jobs(args.jobs, random.Random(3))
+    baseline = None
+    print(f"{'workers':>8} {'seconds':>8} {'jobs/s':>9} {'speedup':>8}")
+    for workers in args.workers:
+        transform_jobs(raw[:500], workers=workers)  # warm up the pool
+        start = time.perf_counter()
+        result = transform_jobs(raw, workers=workers)
+        elapsed = time.perf_counter() - start
+
+        urls = [job.url for job in result]
+        if baseline is None:
+            baseline = (elapsed, urls)
+        elif urls != baseline[1]:
+            print(f"WARNING: output order differs with {workers} workers")
+        print(f"{workers:>8} {elapsed:>8.2f} {args.jobs / elapsed:>9.0f} {baseline[0] / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Counts the SQL statements each page and API request issues.
+
+Usage:
+    python -m benchmarks.check_query_counts
+    python -m benchmarks.check_query_counts --rows 5000 --verbose
+
+Seeds a throwaway SQLite database, then requests every read-only page
+through Flask's test client with the response cache disabled. A request
+that needs more statements than its budget (typically an N+1 from a lazy
+relationship touched in a template loop) is reported, and the script
+exits with status 1, so it can gate a CI job.
+"""
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+os.environ['CACHE_BACKEND'] = 'none'  # count the work, not cache hits
+
+# Shares the throwaway SQLite database (and app) of the query-plan check.
+# Imported first: it sets DATABASE_URL, which must happen before config loads.
+from benchmarks.check_query_plans import app, seed as seed_jobs
+
+from sqlalchemy import event
+
+from app import db
+from app.models import PipelineLog, PipelineMetric, PipelineProgress
+
+# Statements allowed per request. None of them may grow with the number of
+# rows on the page: 50 jobs or 10 pipeline runs cost the same as one.
+BUDGETS = {
+    '/dashboard': 4,
+    '/dashboard?q=python&page=2': 6,
+    '/pipeline-status': 4,
+    '/api/jobs': 3,
+    '/api/jobs?skill=python&fields=id,title,skills': 3,
+    '/metrics': 3,
+}
+
+
+def seed(rows, runs=12):
+    seed_jobs(rows)
+    with app.app_context():
+        start = datetime(2025, 6, 1)
+        for i in range(runs):
+            log = PipelineLog(status='Success', jobs_found=i, run_date=start + timedelta(hours=i))
+            log.progress = PipelineProgress(pages_fetched=i, rows_inserted=i)
+            log.metrics = [PipelineMetric(category=None, extract_s=1.0, transform_s=0.5, load_s=0.2,
+                                          wall_s=2.0, transformed=100, inserted=90, duplicates=10),
+                           PipelineMetric(category='Data Scientist', transformed=100, inserted=90)]
+            db.session.add(log)
+        db.session.commit()
+
+
+def count_statements(client, url):
+    """(status code, [sql]) for one GET request."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engines = list(db.engines.values())  # main and read-only engines
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = client.get(url)
+    finally:
+        for engine in engines:
+            event.remove(engine, 'before_cursor_execute', record)
+    return response.status_code, statements
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--verbose', action='store_true', help='print every statement')
+    args = parser.parse_args()
+
+    seed(args.rows)
+
+    client = app.test_client()
+    failures = 0
+    print(f"{'request':<48} {'status':>6} {'queries':>8} {'budget':>7}")
+    for url, budget in BUDGETS.items():
+        client.get(url)  # warm-up: one-off work such as a first stats build
+        status, statements = count_statements(client, url)
+        over = len(statements) > budget or status != 200
+        failures += over
+        print(f"{url:<48} {status:>6} {len(statements):>8} {budget:>7}{'  OVER' if over else ''}")
+        if args.verbose or over:
+            for sql in statements:
+                print(f"    {' '.join(sql.split())[:140]}")
+
+    if failures:
+        print(f"\n{failures} request(s) over budget")
+        sys.exit(1)
+    print("\nAll requests within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Checks that the hot queries are answered from indexes, not table scans.
+
+Usage:
+    python -m benchmarks.check_query_plans               # 50k postings
+    python -m benchmarks.check_query_plans --rows 200000 --verbose
+
+Seeds a throwaway SQLite database through the bulk loader, then drives the
+real code paths (dashboard, search, pipeline status, JSON API, loader
+lookups, near-duplicate candidates, stats refresh, one retention batch) while recording every
+SELECT they issue. Each statement is re-run under EXPLAIN QUERY PLAN and
+any step that reads a whole table without an index ("SCAN <table>") is
+reported. Exits with status 1 if one is found, so it can gate a CI job.
+"""
+import argparse
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+# SQLite only: EXPLAIN QUERY PLAN output is what this script understands.
+# The directory (database plus -wal/-shm files) is removed at exit.
+_tmp = tempfile.TemporaryDirectory(prefix='devpulse-plans-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(_tmp.name, 'check.db')
+
+from sqlalchemy import event
+
+from app import create_app, db, init_schema
+from app.models import PipelineLog
+from app.stats import refresh_stats
+from etl.dedupe import _candidates, buckets, minhash
+from etl.load import load_jobs_to_db, filter_known_urls, resolve_skill_ids
+from etl.retention import archive_batch, expired_job_ids
+from benchmarks.bench_load import make_jobs, SKILLS
+
+app = create_app()
+
+# Lookup tables that stay small whatever the data volume; reading them whole is fine
+SMALL_TABLES = {'app_counters', 'dashboard_stats', 'extraction_watermarks',
+                'skills', 'skill_aliases', 'skill_stats'}
+
+
+def seed(rows, batch=20_000):
+    with app.app_context():
+        init_schema()
+        for start in range(0, rows, batch):
+            jobs = make_jobs(min(batch, rows - start), seed=start)
+            for i, job in enumerate(jobs):
+                n = start + i
+                job['url'] = f'https://bench.example/plans/{n}'
+                job['title'] = f'Engineer {n}'
+                job['date_posted'] = datetime(2025, 1, 1) + timedelta(minutes=n)
+                job['description'] = f'Role {n} working with python and {job["company"]}'
+            load_jobs_to_db(jobs)
+
+        db.session.add_all(
+            PipelineLog(status='Success', jobs_found=i, run_date=datetime(2025, 1, 1) + timedelta(hours=i))
+            for i in range(500)
+        )
+        db.session.commit()
+
+
+@contextmanager
+def captured_selects():
+    """Collects (sql, params) of every SELECT run meanwhile (main and read engines)."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(('SELECT', 'WITH')) and not executemany:
+            statements.append((statement, parameters))
+
+    engines = list(db.engines.values())
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, 'before_cursor_execute', record)
+
+
+def scenarios(client):
+    """(name, callable) pairs; each callable runs one real code path."""
+    def api_second_page():
+        cursor = client.get('/api/jobs?limit=20').get_json()['next_cursor']
+        client.get(f'/api/jobs?limit=20&cursor={cursor}')
+
+    signature = minhash('Engineer 7', 'Company 1', 'Role 7 working with python')
+    urls = [f'https://bench.example/plans/{n}' for n in range(0, 5000, 7)]
+
+    return [
+        ('dashboard newest jobs', lambda: client.get('/dashboard')),
+        ('dashboard search', lambda: client.get('/dashboard?q=python+engineer&page=2')),
+        ('pipeline status', lambda: client.get('/pipeline-status')),
+        ('api first page', lambda: client.get('/api/jobs?limit=20')),
+        ('api keyset page', api_second_page),
+        ('api skill filter', lambda: client.get('/api/jobs?skill=python&skill=aws')),
+        ('api distinct', lambda: client.get('/api/jobs?distinct=true')),
+        ('loader known urls', lambda: filter_known_urls(urls)),
+        ('loader skill ids', lambda: resolve_skill_ids(SKILLS)),
+        ('dedupe candidates', lambda: _candidates(buckets(signature))),
+        ('stats refresh', refresh_stats),
+        # Rolled back afterwards like every scenario, so nothing is really moved
+        ('retention batch', lambda: archive_batch(expired_job_ids(datetime(2025, 1, 2), 2000, 10**9))),
+    ]
+
+
+def full_scans(plan):
+    """Plan steps that read a whole, growing table without any index."""
+    bad = []
+    for detail in plan:
+        words = detail.split()
+        if words[0] != 'SCAN' or 'USING' in words or 'VIRTUAL' in words:
+            continue
+        # Subqueries, CTEs and FTS shadow tables aren't in the models' metadata
+        if words[1] in db.metadata.tables and words[1] not in SMALL_TABLES:
+            bad.append(detail)
+    return bad
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50_000)
+    parser.add_argument('--verbose', action='store_true', help='print every query plan')
+    args = parser.parse_args()
+
+    print(f"Seeding {args.rows} postings...")
+    seed(args.rows)
+
+    failures = 0
+    client = app.test_client()
+    with app.app_context():
+        for name, run in scenarios(client):
+            with captured_selects() as statements:
+                run()
+            db.session.rollback()
+
+            bad = []
+            for sql, params in statements:
+                plan = [row[-1] for row in db.session.connection().exec_driver_sql(
+                    'EXPLAIN QUERY PLAN ' + sql, params)]
+                if args.verbose:
+                    print(f"\n[{name}] {' '.join(sql.split())[:160]}")
+                    for detail in plan:
+                        print(f"    {detail}")
+                bad.extend((sql, detail) for detail in full_scans(plan))
+
+            status = 'ok' if not bad else 'SCAN'
+            print(f"{name:<24} {len(statements):>3} queries  {status}")
+            for sql, detail in bad:
+                print(f"    {detail}  <- {' '.join(sql.split())[:120]}")
+            failures += len(bad)
+
+    if failures:
+        print(f"\n{failures} full table scan(s) found")
+        sys.exit(1)
+    print("\nAll queries use indexes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Synthetic Adzuna search results for benchmarks.
+
+The payloads have the shape of real `/jobs/za/search/{page}` responses:
+nested company/location/category objects, HTML or plain-text descriptions
+that mention skills (by name and by alias), salary ranges that are
+sometimes missing or predicted, and a share of repeated URLs and reposted
+texts so the loader's duplicate and near-duplicate paths are exercised.
+Everything is derived from `seed`, so two runs produce identical data.
+"""
+import random
+from datetime import datetime, timedelta
+
+from etl.skills import TARGET_SKILLS, SKILL_ALIASES
+
+ROLES = {
+    # role: (category tag, monthly ZAR salary range)
+    'Software Engineer': ('it-jobs', (35_000, 95_000)),
+    'Data Scientist': ('it-jobs', (40_000, 110_000)),
+    'Data Engineer': ('it-jobs', (40_000, 100_000)),
+    'IT Support Technician': ('it-jobs', (12_000, 30_000)),
+    'Cyber Security Analyst': ('it-jobs', (35_000, 90_000)),
+    'Business Intelligence Developer': ('it-jobs', (30_000, 80_000)),
+}
+SENIORITY = [('Junior', 0.6), ('', 1.0), ('Senior', 1.5), ('Lead', 1.8)]
+LOCATIONS = [
+    ('Cape Town', 'Western Cape'), ('Johannesburg', 'Gauteng'), ('Pretoria', 'Gauteng'),
+    ('Sandton', 'Gauteng'), ('Durban', 'KwaZulu-Natal'), ('Stellenbosch', 'Western Cape'),
+    ('Port Elizabeth', 'Eastern Cape'), ('Bloemfontein', 'Free State'),
+]
+COMPANIES = [f'{prefix} {suffix}' for prefix in ('Acme', 'Blue', 'Karoo', 'Protea', 'Summit', 'Table Bay',
+                                                 'Ubuntu', 'Vela', 'Zenith', 'Baobab')
+             for suffix in ('Systems', 'Digital', 'Analytics', 'Labs', 'Recruitment', 'Financial')]
+
+OPENERS = [
+    "We are looking for a {role} to join our {team} team",
+    "Our client, a leading {industry} company, is hiring a {role}",
+    "An exciting opportunity has opened up for a {role}",
+]
+DUTIES = [
+    "You will design, build and maintain {skill} based services",
+    "Day to day you will work with {skill} and {skill2}",
+    "Experience with {skill} is essential; {skill2} is a bonus",
+    "You will support stakeholders with reporting in {skill}",
+    "Own the deployment pipeline on {skill}",
+    "Mentor junior colleagues and review code",
+    "Collaborate with product owners in an agile environment",
+]
+PERKS = [
+    "We offer medical aid, a pension fund and hybrid working",
+    "This is a fully remote position",
+    "Flexible hours and a yearly learning budget",
+    "Office based in a modern building with secure parking",
+]
+TEAMS = ['platform', 'data', 'payments', 'customer', 'infrastructure']
+INDUSTRIES = ['banking', 'insurance', 'retail', 'telecoms', 'mining', 'logistics']
+
+# Skill mentions as they appear in the wild: canonical names and aliases
+MENTIONS = list(TARGET_SKILLS) + [alias for aliases in SKILL_ALIASES.values() for alias in aliases]
+
+
+def _description(rng, role, as_html):
+    sentences = [rng.choice(OPENERS).format(role=role, team=rng.choice(TEAMS), industry=rng.choice(INDUSTRIES))]
+    for _ in range(rng.randint(4, 10)):
+        sentences.append(rng.choice(DUTIES).format(skill=rng.choice(MENTIONS), skill2=rng.choice(MENTIONS)))
+    sentences.append(rng.choice(PERKS))
+    if as_html:
+        items = ''.join(f"<li>{s}</li>" for s in sentences[1:-1])
+        return (f"<p><strong>{sentences[0]}.</strong></p><ul>{items}</ul>"
+                f"<p>{sentences[-1]}.&nbsp;<em>Apply now!</em></p>")
+    return '. '.join(sentences) + '.'
+
+
+def make_raw_job(rng, i, created):
+    """One Adzuna-shaped result; `i` makes the URL and id unique."""
+    role = rng.choice(list(ROLES))
+    tag, (low, high) = ROLES[role]
+    level, factor = rng.choice(SENIORITY)
+    city, province = rng.choice(LOCATIONS)
+
+    job = {
+        '__CLASS__': 'Adzuna::API::Response::Job',
+        'id': str(4_000_000_000 + i),
+        'title': f'{level} {role}'.strip(),
+        'company': {'__CLASS__': 'Adzuna::API::Response::Company', 'display_name': rng.choice(COMPANIES)},
+        'location': {'__CLASS__': 'Adzuna::API::Response::Location', 'display_name': f'{city}, {province}',
+                     'area': ['South Africa', province, city]},
+        'category': {'__CLASS__': 'Adzuna::API::Response::Category', 'tag': tag, 'label': 'IT Jobs'},
+        'description': _description(rng, role, as_html=rng.random() < 0.5),
+        'redirect_url': f'https://www.adzuna.co.za/land/ad/{4_000_000_000 + i}',
+        'created': created.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'contract_time': rng.choice(['full_time', 'full_time', 'part_time']),
+        'latitude': round(rng.uniform(-34.0, -25.0), 4),
+        'longitude': round(rng.uniform(18.0, 31.0), 4),
+    }
+
+    # About a third of postings carry no salary; some of the rest are Adzuna estimates
+    if rng.random() > 0.35:
+        salary_min = round(rng.uniform(low, high) * factor, -3)
+        job['salary_min'] = salary_min
+        job['salary_max'] = salary_min if rng.random() < 0.2 else round(salary_min * rng.uniform(1.1, 1.4), -3)
+        job['salary_is_predicted'] = '1' if rng.random() < 0.3 else '0'
+    return job
+
+
+def make_raw_jobs(n, seed=0, duplicate_rate=0.05, repost_rate=0.05, days=90, now=None):
+    """
+    Builds `n` raw results, newest first.
+
+    Args:
+        duplicate_rate (float): Share of results that repeat an earlier URL
+            exactly (same posting seen twice), skipped by the loader.
+        repost_rate (float): Share that copy an earlier posting's text under a
+            new URL, linked as near-duplicates by the loader.
+        days (int): Postings are spread evenly over this many past days.
+    """
+    rng = random.Random(seed)
+    now = now or datetime(2025, 6, 30, 12, 0, 0)
+    step = timedelta(days=days) / max(n, 1)
+    jobs = []
+    for i in range(n):
+        created = now - step * i
+        roll = rng.random()
+        if jobs and roll < duplicate_rate:
+            job = dict(rng.choice(jobs))
+        elif jobs and roll < duplicate_rate + repost_rate:
+            job = dict(rng.choice(jobs),
+                       id=str(4_000_000_000 + seed * 10_000_000 + i),
+                       redirect_url=f'https://www.adzuna.co.za/land/ad/{4_000_000_000 + seed * 10_000_000 + i}',
+                       created=created.strftime('%Y-%m-%dT%H:%M:%SZ'))
+        else:
+            job = make_raw_job(rng, seed * 10_000_000 + i, created)
+        jobs.append(job)
+    return jobs
+
+
+def make_pages(raw_jobs, per_page=50):
+    """Splits raw results into search-response pages ({'count', 'results'})."""
+    return [{'__CLASS__': 'Adzuna::API::Response::JobSearchResults',
+             'count': len(raw_jobs), 'results': raw_jobs[start:start + per_page]}
+            for start in range(0, len(raw_jobs), per_page)]
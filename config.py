@@ -20,4 +20,26 @@ class Config:
 
     # Disable a feature of Flask-SQLAlchemy that signals the application every time a change is made to the DB.
     # We disable it to save memory.
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # 3. Response Cache
+    # 'memory' = per-worker LRU with TTL, 'redis' = shared Redis-compatible server,
+    # 'none' = disabled. Entries are also invalidated whenever the pipeline loads data.
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    CACHE_DEFAULT_TTL = int(os.environ.get('CACHE_DEFAULT_TTL', 300))
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 512))
+
+    # 4. Database Engine
+    # Pool and SQLite pragma profile (see app/engines.py): 'web' for Gunicorn workers,
+    # 'etl' for pipeline runs, 'dev' for local work.
+    DB_PROFILE = os.environ.get('DB_PROFILE', 'dev')
+    # Optional read replica for the read-only session (defaults to DATABASE_URL)
+    DATABASE_READ_URL = os.environ.get('DATABASE_READ_URL')
+
+
+class ETLConfig(Config):
+    """
+    Settings for pipeline runs (run_pipeline.py): a long-running writer.
+    """
+    DB_PROFILE = os.environ.get('DB_PROFILE', 'etl')
@@ -1,9 +1,26 @@
-# Expose the main functions so they can be imported directly from the 'etl' package
-from .extract import extract_jobs
-from .transform import transform_jobs
-from .load import load_jobs_to_db
+# Expose the main functions so they can be imported directly from the 'etl' package.
+# They are imported on first use, so 'import etl' (or any single submodule)
+# doesn't pull in BeautifulSoup, NumPy and the database layer up front.
+from importlib import import_module
+
+_EXPORTS = {
+    'extract_jobs': '.extract',
+    'transform_jobs': '.transform',
+    'load_jobs_to_db': '.load',
+    'run_streaming': '.pipeline',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
 
 # This allows you to do:
 # from etl import extract_jobs, transform_jobs, load_jobs_to_db
 # Instead of:
-# from etl.extract import extract_jobs
\ No newline at end of file
+# from etl.extract import extract_jobs
@@ -0,0 +1,179 @@
+import hashlib
+import re
+
+import numpy as np
+from sqlalchemy import select
+
+from app import db
+from app.models import JobFingerprint, JobLshBucket, JobPosting
+
+# Words per shingle; 3-word shingles survive small edits but still tell
+# different roles with similar boilerplate apart.
+SHINGLE_SIZE = 3
+
+# MinHash signature of NUM_PERM values, split into BANDS bands of ROWS.
+# Postings sharing any band become candidates: with 16 x 4 a pair at
+# Jaccard 0.7 is found ~99% of the time, one at 0.3 only ~12%.
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+# Candidates at or above this estimated Jaccard similarity are duplicates
+SIMILARITY_THRESHOLD = 0.7
+
+BACKFILL_BATCH_SIZE = 1000
+LOOKUP_CHUNK = 500
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+# Fixed seed: signatures must agree across processes and runs
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, (1 << 32) - 1, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, (1 << 32) - 1, size=NUM_PERM, dtype=np.uint64)
+
+
+def _hash64(data):
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+def shingles(title, company, description):
+    """Set of word shingles over the normalised fields that identify a role."""
+    text = ' '.join(part or '' for part in (title, company, description))
+    words = _WORD_RE.findall(text.lower())
+    size = min(SHINGLE_SIZE, len(words))
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)} if words else set()
+
+
+def minhash(title, company, description):
+    """
+    MinHash signature of a posting.
+
+    Returns:
+        bytes or None: NUM_PERM little-endian uint32 values, or None when
+        the posting has no text at all.
+    """
+    features = shingles(title, company, description)
+    if not features:
+        return None
+    hashes = np.fromiter((_hash64(s.encode()) & 0xFFFFFFFF for s in features),
+                         dtype=np.uint64, count=len(features))
+    permuted = ((hashes[:, None] * _PERM_A + _PERM_B) % _MERSENNE_PRIME) & _MAX_HASH
+    return permuted.min(axis=0).astype('<u4').tobytes()
+
+
+def buckets(signature):
+    """One LSH bucket id per band (signed 64-bit, band number mixed in)."""
+    width = ROWS * 4
+    result = []
+    for band in range(BANDS):
+        value = _hash64(bytes([band]) + signature[band * width:(band + 1) * width])
+        result.append(value - (1 << 64) if value >= 1 << 63 else value)
+    return result
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(np.frombuffer(a, dtype='<u4') == np.frombuffer(b, dtype='<u4')))
+
+
+def _candidates(all_buckets):
+    """{job_id: signature} for the canonical postings sharing a bucket."""
+    job_ids = set()
+    all_buckets = sorted(set(all_buckets))
+    for start in range(0, len(all_buckets), LOOKUP_CHUNK):
+        job_ids.update(db.session.execute(
+            select(JobLshBucket.job_id).where(JobLshBucket.bucket.in_(all_buckets[start:start + LOOKUP_CHUNK]))
+        ).scalars())
+
+    found = {}
+    job_ids = sorted(job_ids)
+    for start in range(0, len(job_ids), LOOKUP_CHUNK):
+        found.update(db.session.execute(
+            select(JobFingerprint.job_id, JobFingerprint.minhash)
+            .where(JobFingerprint.job_id.in_(job_ids[start:start + LOOKUP_CHUNK]))
+        ).all())
+    return found
+
+
+def link_near_duplicates(signatures):
+    """
+    Stores fingerprints for freshly inserted postings and links each one
+    that is a near-duplicate of an existing (or earlier in-batch) posting
+    to that posting's canonical id. Runs in the caller's transaction.
+
+    Args:
+        signatures (list): [(job_id, minhash bytes)] in insertion order.
+
+    Returns:
+        set: job ids that were linked as duplicates.
+    """
+    signatures = [(job_id, sig, buckets(sig)) for job_id, sig in signatures if sig is not None]
+    if not signatures:
+        return set()
+
+    # 1. One bucket lookup for the whole batch (indexed column)
+    known = {job_id: np.frombuffer(sig, dtype='<u4')
+             for job_id, sig in _candidates(b for _, _, job_buckets in signatures for b in job_buckets).items()}
+    index = {}  # bucket -> [canonical job_id]
+    for job_id, values in known.items():
+        for b in buckets(values.tobytes()):
+            index.setdefault(b, []).append(job_id)
+
+    # 2. Resolve each new posting against stored ones and the batch so far
+    fingerprints, bucket_rows, duplicates = [], [], set()
+    for job_id, sig, job_buckets in signatures:
+        values = np.frombuffer(sig, dtype='<u4')
+        canonical_id = None
+        candidates = sorted({other for b in job_buckets for other in index.get(b, ())})
+        if candidates:
+            # Share of equal MinHash values estimates the Jaccard similarity
+            agreement = (np.stack([known[other] for other in candidates]) == values).mean(axis=1)
+            matches = np.flatnonzero(agreement >= SIMILARITY_THRESHOLD)
+            if len(matches):
+                canonical_id = candidates[matches[0]]  # the oldest matching posting
+                duplicates.add(job_id)
+
+        fingerprints.append({'job_id': job_id, 'minhash': sig, 'canonical_id': canonical_id})
+        if canonical_id is None:
+            # Only canonical postings are bucketed: a group of reposts costs
+            # one comparison, not one per copy
+            known[job_id] = values
+            for b in job_buckets:
+                index.setdefault(b, []).append(job_id)
+            bucket_rows.extend({'bucket': b, 'job_id': job_id} for b in set(job_buckets))
+
+    db.session.execute(JobFingerprint.__table__.insert(), fingerprints)
+    if bucket_rows:
+        db.session.execute(JobLshBucket.__table__.insert(), bucket_rows)
+    return duplicates
+
+
+def backfill_fingerprints(batch_size=BACKFILL_BATCH_SIZE):
+    """
+    Fingerprints postings stored before near-duplicate detection existed,
+    oldest first, so later postings link to the earliest copy.
+    Must run inside an app context.
+
+    Returns:
+        dict: {'jobs': fingerprinted, 'duplicates': linked as duplicates}
+    """
+    totals = {'jobs': 0, 'duplicates': 0}
+    last_id = 0
+    while True:
+        batch = db.session.execute(
+            select(JobPosting.id, JobPosting.title, JobPosting.company, JobPosting.description)
+            .where(JobPosting.id > last_id)
+            .where(JobPosting.id.not_in(select(JobFingerprint.job_id)))
+            .order_by(JobPosting.id).limit(batch_size)
+        ).all()
+        if not batch:
+            break
+        duplicates = link_near_duplicates(
+            [(row.id, minhash(row.title, row.company, row.description)) for row in batch]
+        )
+        db.session.commit()
+        totals['jobs'] += len(batch)
+        totals['duplicates'] += len(duplicates)
+        last_id = batch[-1].id
+    return totals
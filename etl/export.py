@@ -0,0 +1,211 @@
+"""
+Columnar snapshot of the job postings for analysts.
+
+Postings (with their skill names and near-duplicate link) are streamed out
+of the database in server-side cursor chunks and written as Parquet files,
+Hive-partitioned by posting month and source site:
+
+    <EXPORT_DIR>/month=2025-06/source_site=Adzuna/part-00003.parquet
+
+Exports are incremental: `_manifest.json` records the highest posting id
+written, and each run appends new part files holding only newer postings.
+Heavy reads (notebooks, BI tools) go through `read_snapshot`, which
+memory-maps the files instead of querying the live tables.
+
+pyarrow is an optional dependency (pip install pyarrow).
+"""
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from urllib.parse import quote
+
+from sqlalchemy import select
+
+from app import db
+from app.models import JobFingerprint, JobPosting, Skill, job_skills
+
+# Snapshot directory; when set, every successful pipeline run appends to it
+EXPORT_DIR = os.environ.get('EXPORT_DIR')
+CHUNK_SIZE = 5000
+MANIFEST = '_manifest.json'  # leading '_' keeps it out of pyarrow datasets
+
+COLUMNS = (JobPosting.id, JobPosting.title, JobPosting.company, JobPosting.location,
+           JobPosting.is_remote, JobPosting.salary_min, JobPosting.salary_max,
+           JobPosting.currency, JobPosting.url, JobPosting.source_site,
+           JobPosting.date_posted, JobPosting.description, JobFingerprint.canonical_id)
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("The Parquet export needs pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def _schema(pa):
+    # source_site and month live in the directory names, not in the files
+    return pa.schema([
+        ('id', pa.int64()),
+        ('title', pa.string()),
+        ('company', pa.string()),
+        ('location', pa.string()),
+        ('is_remote', pa.bool_()),
+        ('salary_min', pa.float64()),
+        ('salary_max', pa.float64()),
+        ('currency', pa.string()),
+        ('url', pa.string()),
+        ('date_posted', pa.timestamp('us')),
+        ('description', pa.string()),
+        ('canonical_id', pa.int64()),
+        ('skills', pa.list_(pa.string())),
+    ])
+
+
+def read_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'last_id': 0, 'runs': 0, 'rows': 0, 'files': []}
+
+
+def _write_manifest(directory, manifest):
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(directory, MANIFEST))
+
+
+def _partition(row):
+    month = row.date_posted.strftime('%Y-%m') if row.date_posted else 'unknown'
+    return f"month={month}/source_site={quote(row.source_site or 'unknown', safe='')}"
+
+
+def _skills_by_job(first_id, last_id):
+    """{job_id: [skill names]} for one chunk's id range (one indexed query)."""
+    skills = {}
+    rows = db.session.execute(
+        select(job_skills.c.job_id, Skill.name).join(Skill, Skill.id == job_skills.c.skill_id)
+        .where(job_skills.c.job_id.between(first_id, last_id)).order_by(job_skills.c.job_id, Skill.name)
+    )
+    for job_id, name in rows:
+        skills.setdefault(job_id, []).append(name)
+    return skills
+
+
+def export_jobs(directory=EXPORT_DIR, chunk_size=CHUNK_SIZE):
+    """
+    Appends the postings stored since the last export to the snapshot.
+    Nothing becomes visible until the run succeeds: part files are written
+    under temporary names and published together with the manifest.
+    Must run inside an app context.
+
+    Returns:
+        dict: {'rows', 'files', 'last_id', 'seconds', 'rows_per_s'}
+    """
+    if not directory:
+        raise ValueError("No export directory given (set EXPORT_DIR)")
+    pa = _pyarrow()
+    schema = _schema(pa)
+    os.makedirs(directory, exist_ok=True)
+    manifest = read_manifest(directory)
+    run = manifest['runs'] + 1
+    start = time.perf_counter()
+
+    # 1. Stream new postings in id order through a server-side cursor
+    stmt = (select(*COLUMNS)
+            .outerjoin(JobFingerprint, JobFingerprint.job_id == JobPosting.id)
+            .where(JobPosting.id > manifest['last_id'])
+            .order_by(JobPosting.id))
+    result = db.session.connection().execution_options(yield_per=chunk_size).execute(stmt)
+
+    writers = {}  # partition -> (ParquetWriter, temporary path)
+    rows_written, last_id = 0, manifest['last_id']
+    try:
+        for chunk in result.partitions():
+            skills = _skills_by_job(chunk[0].id, chunk[-1].id)
+
+            # 2. Split the chunk by partition, one row group per partition
+            by_partition = {}
+            for row in chunk:
+                by_partition.setdefault(_partition(row), []).append(row)
+            for partition, rows in by_partition.items():
+                table = pa.Table.from_pydict({
+                    'id': [r.id for r in rows],
+                    'title': [r.title for r in rows],
+                    'company': [r.company for r in rows],
+                    'location': [r.location for r in rows],
+                    'is_remote': [bool(r.is_remote) if r.is_remote is not None else None for r in rows],
+                    'salary_min': [r.salary_min for r in rows],
+                    'salary_max': [r.salary_max for r in rows],
+                    'currency': [r.currency for r in rows],
+                    'url': [r.url for r in rows],
+                    'date_posted': [r.date_posted for r in rows],
+                    'description': [r.description for r in rows],
+                    'canonical_id': [r.canonical_id for r in rows],
+                    'skills': [skills.get(r.id, []) for r in rows],
+                }, schema=schema)
+                if partition not in writers:
+                    folder = os.path.join(directory, *partition.split('/'))
+                    os.makedirs(folder, exist_ok=True)
+                    fd, tmp = tempfile.mkstemp(dir=folder, prefix='.', suffix='.tmp')
+                    os.close(fd)
+                    writers[partition] = (pa.parquet.ParquetWriter(tmp, schema, compression='zstd'), tmp)
+                writers[partition][0].write_table(table)
+
+            rows_written += len(chunk)
+            last_id = chunk[-1].id
+    except Exception:
+        for writer, tmp in writers.values():
+            writer.close()
+            os.remove(tmp)
+        raise
+    finally:
+        result.close()
+
+    # 3. Publish the files, then the manifest that points past them
+    files = []
+    for partition, (writer, tmp) in sorted(writers.items()):
+        writer.close()
+        path = f"{partition}/part-{run:05d}.parquet"
+        os.replace(tmp, os.path.join(directory, *path.split('/')))
+        files.append(path)
+
+    if files:
+        manifest.update(last_id=last_id, runs=run, rows=manifest['rows'] + rows_written,
+                        files=manifest['files'] + files,
+                        updated_at=datetime.utcnow().isoformat(timespec='seconds'))
+        _write_manifest(directory, manifest)
+
+    elapsed = time.perf_counter() - start
+    return {'rows': rows_written, 'files': len(files), 'last_id': last_id,
+            'seconds': round(elapsed, 2), 'rows_per_s': round(rows_written / elapsed, 1) if elapsed else 0.0}
+
+
+def read_snapshot(directory=EXPORT_DIR, columns=None, filter=None):
+    """
+    Reads the snapshot as one Arrow table, memory-mapping the Parquet files.
+
+    Args:
+        columns (list): Columns to read (default all); 'month' and
+            'source_site' come from the partition directories.
+        filter: Optional pyarrow.dataset expression, e.g.
+            `pyarrow.dataset.field('month') >= '2025-01'`; partitions that
+            can't match are skipped without being opened.
+
+    Returns:
+        pyarrow.Table (call .to_pandas() for a DataFrame)
+    """
+    if not directory:
+        raise ValueError("No export directory given (set EXPORT_DIR)")
+    _pyarrow()
+    import pyarrow.dataset as ds
+    from pyarrow import fs
+
+    dataset = ds.dataset(directory, format='parquet', partitioning='hive',
+                         filesystem=fs.LocalFileSystem(use_mmap=True))
+    return dataset.to_table(columns=columns, filter=filter)
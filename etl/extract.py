@@ -1,75 +1,463 @@
 import requests
 import json
 import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+
+from etl.http_cache import PageCache
 
 # Base URL for Adzuna API (South Africa endpoint)
 # We default to 'za' (South Africa), but this can be changed to 'gb', 'us', etc.
-BASE_URL = "https://api.adzuna.com/v1/api/jobs/za/search/1"
+# The page number is the last path segment.
+SEARCH_URL = "https://api.adzuna.com/v1/api/jobs/za/search/{page}"
+BASE_URL = SEARCH_URL.format(page=1)
+
+# Paging / concurrency defaults
+RESULTS_PER_PAGE = 50      # Adzuna's maximum page size
+MAX_PAGES = 10             # Hard stop per category
+MAX_WORKERS = 4            # Threads shared by all categories
+REQUESTS_PER_SECOND = 4    # Per-host rate limit
+
+# Retry policy for 429 / 5xx responses
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5         # Seconds; doubled on every attempt (plus jitter)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+REQUEST_TIMEOUT = 15
+
+# On-disk cache of raw API pages (disabled unless a directory is given)
+HTTP_CACHE_DIR = os.environ.get('HTTP_CACHE_DIR')
+HTTP_CACHE_TTL = int(os.environ.get('HTTP_CACHE_TTL', 3600))  # seconds before revalidation
+
 
-def extract_jobs(query="data engineer", location="South Africa"):
+class RateLimiter:
     """
-    Fetches raw job data from the Adzuna API.
-    
-    Args:
-        query (str): The job title to search for (e.g., 'Python').
-        location (str): The geographic area.
-    
-    Returns:
-        list: A list of raw job dictionaries.
+    Spaces out requests to the same host so we never exceed `rate` per second,
+    no matter how many worker threads share it.
     """
-    
-    # 1. Get Credentials from Environment Variables (Best Practice)
-    # If not set, it falls back to empty strings (which will cause a 401 error)
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, host):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def build_session(pool_size=MAX_WORKERS):
+    """Creates a pooled HTTP session that all extraction threads share."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def _get_credentials():
     app_id = os.environ.get('ADZUNA_APP_ID')
     app_key = os.environ.get('ADZUNA_APP_KEY')
-
     if not app_id or not app_key:
         print("ERROR: API Credentials missing. Please set ADZUNA_APP_ID and ADZUNA_APP_KEY.")
-        return []
+        return None
+    return app_id, app_key
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
 
-    # 2. Construct the API Parameters
+class ExtractionStats:
+    """Thread-safe counters for per-page latency and overall throughput."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = []
+        self.jobs = 0
+        self.retries = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.categories = {}  # category -> {'latencies', 'jobs', 'errors'}
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def _category(self, category):
+        return self.categories.setdefault(category, {'latencies': [], 'jobs': 0, 'errors': 0})
+
+    def record_page(self, latency, job_count, category=None):
+        with self._lock:
+            self.latencies.append(latency)
+            self.jobs += job_count
+            if category is not None:
+                entry = self._category(category)
+                entry['latencies'].append(latency)
+                entry['jobs'] += job_count
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def record_cache_hit(self):
+        with self._lock:
+            self.cache_hits += 1
+
+    def record_error(self, category=None):
+        with self._lock:
+            self.errors += 1
+            if category is not None:
+                self._category(category)['errors'] += 1
+
+    def stop(self):
+        self.finished = time.perf_counter()
+
+    def percentile(self, pct):
+        return _percentile(self.latencies, pct)
+
+    def summary(self):
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        pages = len(self.latencies)
+        return {
+            'pages': pages,
+            'jobs': self.jobs,
+            'retries': self.retries,
+            'errors': self.errors,
+            'cache_hits': self.cache_hits,
+            'elapsed_s': round(elapsed, 3),
+            'latency_p50_ms': round(self.percentile(50) * 1000, 1),
+            'latency_p95_ms': round(self.percentile(95) * 1000, 1),
+            'pages_per_s': round(pages / elapsed, 2) if elapsed else 0.0,
+            'jobs_per_s': round(self.jobs / elapsed, 2) if elapsed else 0.0,
+        }
+
+    def category_summary(self, category):
+        """Pages, jobs, errors, time spent in HTTP and latency percentiles for one category."""
+        with self._lock:
+            entry = self.categories.get(category, {'latencies': [], 'jobs': 0, 'errors': 0})
+            latencies = list(entry['latencies'])
+            jobs, errors = entry['jobs'], entry['errors']
+        return {
+            'pages': len(latencies),
+            'jobs': jobs,
+            'errors': errors,
+            'fetch_s': round(sum(latencies), 3),
+            'latency_p50_ms': round(_percentile(latencies, 50) * 1000, 1),
+            'latency_p95_ms': round(_percentile(latencies, 95) * 1000, 1),
+        }
+
+
+def fetch_page(session, query, location, page, credentials, results_per_page=RESULTS_PER_PAGE,
+               search_url=SEARCH_URL, limiter=None, stats=None, extra_params=None, cache=None):
+    """
+    Fetches a single results page, retrying 429/5xx responses with exponential backoff.
+    `extra_params` adds search options such as sort_by / max_days_old.
+    With a PageCache, fresh pages are served from disk and stale ones are
+    revalidated with their ETag; in replay mode the network is never used.
+
+    Returns:
+        list: The raw job dictionaries on that page ([] on a permanent failure).
+    """
+    url = search_url.format(page=page)
+    host = urlsplit(url).netloc
+    app_id, app_key = credentials
     params = {
         'app_id': app_id,
         'app_key': app_key,
-        'results_per_page': 20, # How many results to fetch
-        'what': query,          # Job title
-        'where': location,      # Location
+        'results_per_page': results_per_page,
+        'what': query,
+        'where': location,
         'content-type': 'application/json'
     }
+    params.update(extra_params or {})
+
+    # 1. Serve from the on-disk cache when we can
+    cached = cache.get(url, params) if cache else None
+    if cached is None and cache and cache.replay:
+        return []  # nothing recorded: behave like the end of the results
+    if cached is not None and cache.is_fresh(cached):
+        jobs = cached['body'].get('results', [])
+        if stats is not None:
+            stats.record_cache_hit()
+            stats.record_page(0.0, len(jobs), query)
+        return jobs
+    headers = PageCache.conditional_headers(cached) if cached else None
+
+    # 2. Go to the network, revalidating a stale cache entry
+    for attempt in range(MAX_RETRIES + 1):
+        if limiter:
+            limiter.wait(host)
 
-    try:
-        print(f"--- Extracting: Searching for '{query}' in '{location}' ---")
-        
-        # 3. Make the HTTP Request
-        response = requests.get(BASE_URL, params=params)
-        
-        # 4. Check status code (200 = OK)
-        if response.status_code == 200:
-            data = response.json()
-            jobs = data.get('results', [])
-            print(f"SUCCESS: Retrieved {len(jobs)} raw job postings.")
+        started = time.perf_counter()
+        try:
+            response = session.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+            status = response.status_code
+        except requests.RequestException as e:
+            response, status = None, None
+            print(f"WARNING: '{query}' page {page} request error: {e}")
+        latency = time.perf_counter() - started
+
+        if status == 304 and cached is not None:
+            cache.touch(url, params, cached)
+            jobs = cached['body'].get('results', [])
+            if stats is not None:
+                stats.record_cache_hit()
+                stats.record_page(latency, len(jobs), query)
+            return jobs
+
+        if status == 200:
+            body = response.json()
+            if cache:
+                cache.put(url, params, body, response.headers.get('ETag'),
+                          response.headers.get('Last-Modified'))
+            jobs = body.get('results', [])
+            if stats is not None:
+                stats.record_page(latency, len(jobs), query)
             return jobs
-        else:
-            print(f"FAILED: Status Code {response.status_code}")
+
+        if status is not None and status not in RETRY_STATUSES:
+            print(f"FAILED: '{query}' page {page} - Status Code {status}")
             print(f"Response: {response.text}")
-            return []
+            break
+
+        if attempt < MAX_RETRIES:
+            delay = BACKOFF_BASE * (2 ** attempt) + random.uniform(0, BACKOFF_BASE)
+            # Respect the server's hint when it gives one
+            retry_after = response.headers.get('Retry-After') if response is not None else None
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+            if stats is not None:
+                stats.record_retry()
+            time.sleep(delay)
 
-    except Exception as e:
-        print(f"CRITICAL ERROR during extraction: {e}")
+    if stats is not None:
+        stats.record_error(query)
+    return []
+
+
+def _walk_category(session, category, location, credentials, put, stats, limiter,
+                   max_pages, results_per_page, search_url, filter_known,
+                   watermark=None, tracker=None, cache=None):
+    """
+    Pages through one category, newest postings first, handing
+    (category, page, jobs) to `put`.
+
+    With a `watermark` the API is only asked for postings as far back as
+    the watermark, and paging stops at the first posting that was already
+    loaded by an earlier run. Without one, paging stops at the first page
+    of URLs that are all stored already.
+
+    The walk is reported to `tracker` as caught up only when it got back
+    to the watermark or to the last page. A walk cut short by `max_pages`
+    has not seen everything newer than the old mark, and a page of known
+    URLs may only be the part an earlier, truncated walk loaded, so in
+    either case the watermark must not advance.
+    """
+    # Newest first on every run, so a walk cut short still covers the latest postings
+    params = {'sort_by': 'date'}
+    if watermark is not None:
+        params['max_days_old'] = watermark.max_days_old()
+        # The watermark is the exact stopping point. A page of known URLs
+        # may only be the part an earlier, truncated walk already loaded.
+        filter_known = None
+
+    caught_up = False
+    for page in range(1, max_pages + 1):
+        jobs = fetch_page(session, category, location, page, credentials,
+                          results_per_page=results_per_page, search_url=search_url,
+                          limiter=limiter, stats=stats, extra_params=params, cache=cache)
+        if not jobs:
+            caught_up = True  # past the last page (errors are tracked by `stats`)
+            break
+        last_page = len(jobs) < results_per_page
+        if tracker is not None:
+            tracker.observe(category, jobs)
+
+        if watermark is not None:
+            fresh = [job for job in jobs if watermark.is_new(job)]
+            if len(fresh) < len(jobs):
+                # Sorted newest first: everything after this is older still
+                print(f"--- '{category}': reached the watermark on page {page}, stopping ---")
+                caught_up = not fresh or put((category, page, fresh))
+                break
+
+        # Stop early once a page holds nothing new. This must be checked
+        # before handing the page on, or the loader could race us to it.
+        if filter_known:
+            urls = [job['redirect_url'] for job in jobs if job.get('redirect_url')]
+            if len(filter_known(urls)) >= len(urls):
+                print(f"--- '{category}': page {page} is all known URLs, stopping, watermark not advanced ---")
+                break
+
+        if not put((category, page, jobs)):
+            break
+        if last_page:
+            caught_up = True
+            break
+    else:
+        print(f"--- '{category}': stopped at the {max_pages} page limit, watermark not advanced ---")
+
+    if caught_up and tracker is not None:
+        tracker.caught_up(category)
+
+
+def iter_category_pages(categories, location="South Africa", max_pages=MAX_PAGES,
+                        max_workers=MAX_WORKERS, results_per_page=RESULTS_PER_PAGE,
+                        search_url=SEARCH_URL, filter_known=None, stats=None,
+                        requests_per_second=REQUESTS_PER_SECOND, buffer_pages=None,
+                        watermarks=None, tracker=None, cache_dir=HTTP_CACHE_DIR,
+                        cache_ttl=HTTP_CACHE_TTL, replay=False):
+    """
+    Extracts several categories concurrently and yields pages as they arrive.
+
+    Each category is walked page by page (so we can stop early), while the
+    categories themselves run in parallel on a bounded thread pool that
+    shares one pooled HTTP session and one per-host rate limiter.
+
+    Args:
+        categories (list): Search terms, e.g. ['Software Engineer', 'IT Support'].
+        filter_known (callable): Optional `urls -> set_of_known_urls`. When every
+            URL on a page is already known, that category stops paging.
+        stats (ExtractionStats): Optional collector for latency/throughput.
+        buffer_pages (int): Max pages held in memory before workers block
+            (defaults to 2 per worker).
+        watermarks (dict): Optional {category: Watermark} from the last run;
+            those categories only fetch postings newer than their watermark.
+        tracker (WatermarkTracker): Optional collector of the newest posting
+            seen per category, used to advance the watermarks afterwards.
+        cache_dir (str): Directory of the on-disk page cache (None disables it).
+        cache_ttl (int): Seconds before a cached page is revalidated.
+        replay (bool): Serve every page from `cache_dir`, never touching the
+            network (no credentials needed).
+
+    Yields:
+        tuple: (category, page_number, list_of_raw_jobs)
+    """
+    if replay and not cache_dir:
+        raise ValueError("Replay needs a cache directory (HTTP_CACHE_DIR or cache_dir)")
+    credentials = ('', '') if replay else _get_credentials()
+    if not credentials:
+        return
+    cache = PageCache(cache_dir, ttl=cache_ttl, replay=replay) if cache_dir else None
+
+    stats = stats if stats is not None else ExtractionStats()
+    limiter = RateLimiter(requests_per_second)
+    workers = max(1, min(max_workers, len(categories)))
+    out = queue.Queue(maxsize=buffer_pages or workers * 2)
+    cancelled = threading.Event()
+    done = object()
+
+    def put(item):
+        # Blocks while the consumer is behind (backpressure), but gives up
+        # if the consumer has gone away so the pool can shut down.
+        while not cancelled.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def worker(category):
+        try:
+            _walk_category(session, category, location, credentials, put, stats, limiter,
+                           max_pages, results_per_page, search_url, filter_known,
+                           watermark=(watermarks or {}).get(category), tracker=tracker, cache=cache)
+        except Exception as e:
+            print(f"CRITICAL ERROR extracting '{category}': {e}")
+            stats.record_error(category)
+        finally:
+            put(done)
+
+    print(f"--- Extracting {len(categories)} categories in '{location}' with {workers} workers ---")
+    with build_session(workers) as session, ThreadPoolExecutor(max_workers=workers) as pool:
+        for category in categories:
+            pool.submit(worker, category)
+
+        remaining = len(categories)
+        try:
+            while remaining:
+                item = out.get()
+                if item is done:
+                    remaining -= 1
+                    continue
+                yield item
+        finally:
+            cancelled.set()
+
+    stats.stop()
+    summary = stats.summary()
+    print(f"SUCCESS: Extracted {summary['jobs']} jobs from {summary['pages']} pages "
+          f"({summary['cache_hits']} from cache) in {summary['elapsed_s']}s "
+          f"(p50 {summary['latency_p50_ms']}ms, "
+          f"p95 {summary['latency_p95_ms']}ms, {summary['jobs_per_s']} jobs/s).")
+
+
+def extract_categories(categories, location="South Africa", **kwargs):
+    """
+    Convenience wrapper around `iter_category_pages`.
+
+    Returns:
+        tuple: ({category: [raw jobs]}, stats summary dict)
+    """
+    stats = kwargs.pop('stats', None) or ExtractionStats()
+    results = {category: [] for category in categories}
+    for category, _page, jobs in iter_category_pages(categories, location, stats=stats, **kwargs):
+        results[category].extend(jobs)
+    return results, stats.summary()
+
+
+def extract_jobs(query="data engineer", location="South Africa", page=1, results_per_page=20):
+    """
+    Fetches raw job data from the Adzuna API.
+
+    Args:
+        query (str): The job title to search for (e.g., 'Python').
+        location (str): The geographic area.
+        page (int): Which results page to fetch.
+        results_per_page (int): How many results to fetch.
+
+    Returns:
+        list: A list of raw job dictionaries.
+    """
+    credentials = _get_credentials()
+    if not credentials:
         return []
 
+    print(f"--- Extracting: Searching for '{query}' in '{location}' ---")
+    cache = PageCache(HTTP_CACHE_DIR, ttl=HTTP_CACHE_TTL) if HTTP_CACHE_DIR else None
+    with build_session(1) as session:
+        jobs = fetch_page(session, query, location, page, credentials, results_per_page=results_per_page,
+                          cache=cache)
+    print(f"SUCCESS: Retrieved {len(jobs)} raw job postings.")
+    return jobs
+
 # --- Standalone Test Block ---
 # This allows you to run 'python etl/extract.py' to test this script in isolation
 if __name__ == "__main__":
-    # You can temporarily hardcode your keys here for testing, 
+    # You can temporarily hardcode your keys here for testing,
     # BUT remove them before uploading to GitHub!
-    os.environ['ADZUNA_APP_ID'] = 'YOUR_APP_ID_HERE' 
+    os.environ['ADZUNA_APP_ID'] = 'YOUR_APP_ID_HERE'
     os.environ['ADZUNA_APP_KEY'] = 'YOUR_APP_KEY_HERE'
-    
+
     # Test the function
     raw_data = extract_jobs(query="Data Engineer", location="Johannesburg")
-    
+
     # Print the first result to see the structure
     if raw_data:
         print("\n--- SAMPLE RAW DATA (First Item) ---")
-        print(json.dumps(raw_data[0], indent=2))
\ No newline at end of file
+        print(json.dumps(raw_data[0], indent=2))
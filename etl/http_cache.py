@@ -0,0 +1,80 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+# Query parameters that never take part in the cache key
+SECRET_PARAMS = ('app_id', 'app_key')
+
+
+class PageCache:
+    """
+    Content-addressed on-disk cache of raw API pages.
+
+    Each page is one JSON file named after the SHA-256 of its URL and query
+    parameters (credentials excluded), so recordings can be shared between
+    developers and machines. Entries older than `ttl` seconds are
+    revalidated with If-None-Match / If-Modified-Since rather than dropped.
+    In `replay` mode entries never expire and misses never go to the network.
+    """
+
+    def __init__(self, directory, ttl=3600, replay=False):
+        self.directory = directory
+        self.ttl = ttl
+        self.replay = replay
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(url, params):
+        public = sorted((k, str(v)) for k, v in params.items() if k not in SECRET_PARAMS)
+        return hashlib.sha256(json.dumps([url, public]).encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, url, params):
+        """The stored entry for this request, or None."""
+        try:
+            with open(self._path(self.key(url, params)), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry):
+        return self.replay or time.time() - entry['fetched_at'] < self.ttl
+
+    def put(self, url, params, body, etag=None, last_modified=None):
+        entry = {
+            'url': url,
+            'params': {k: v for k, v in params.items() if k not in SECRET_PARAMS},
+            'fetched_at': time.time(),
+            'etag': etag,
+            'last_modified': last_modified,
+            'body': body,
+        }
+        self._write(self.key(url, params), entry)
+        return entry
+
+    def touch(self, url, params, entry):
+        """Marks an entry as fresh again after a 304 Not Modified."""
+        entry['fetched_at'] = time.time()
+        self._write(self.key(url, params), entry)
+
+    def _write(self, key, entry):
+        # Write-then-rename so concurrent readers never see half a file
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
@@ -1,79 +1,223 @@
-from app import create_app, db
-from app.models import JobPosting, Skill
+from sqlalchemy import select, insert
+from sqlalchemy.dialects import postgresql, sqlite
 
-# Initialize the app to access the database
-app = create_app()
+from app import db
+from app.models import AppCounter, ArchivedJobPosting, JobPosting, Skill, job_skills, JOBS_COUNTER
+from app.search import index_jobs
+from app.stats import record_load
+from etl.dedupe import link_near_duplicates, minhash
+from etl.records import COLUMN_FIELDS, as_record
 
-def get_or_create_skill(skill_name):
+# How many rows go into a single multi-row INSERT / IN (...) lookup.
+# 500 rows x 11 columns stays well under the bind-parameter limits of
+# both SQLite (32766) and Postgres (65535).
+CHUNK_SIZE = 500
+
+# job_postings columns in INSERT order: the leading fields of a JobRecord
+# ('title', 'company', ..., 'date_posted'), zipped straight onto the columns
+JOB_COLUMNS = COLUMN_FIELDS
+
+# Columns with a model default (date_posted, is_remote, currency). A Core
+# insert stores an explicit None as NULL, so missing values get the
+# default the ORM used to apply instead.
+DEFAULTED_COLUMNS = [column for column in JobPosting.__table__.columns
+                     if column.name in JOB_COLUMNS and column.default is not None]
+
+
+def _column_defaults():
+    """{column name: default value}, evaluated once per batch."""
+    return {column.name: column.default.arg(None) if column.default.is_callable else column.default.arg
+            for column in DEFAULTED_COLUMNS}
+
+
+def _chunks(items, size=CHUNK_SIZE):
+    """Yields successive slices of `items` with at most `size` elements."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _insert_ignore(table, index_elements):
+    """
+    Builds an INSERT that silently skips rows violating the unique
+    constraint on `index_elements`.
+    Postgres and SQLite get a native ON CONFLICT DO NOTHING; other
+    dialects get a plain INSERT (callers pre-filter existing keys).
+
+    Executed with a list of parameter dicts, SQLAlchemy's "insertmanyvalues"
+    mode sends it as batched multi-row INSERT ... VALUES statements while
+    compiling the statement only once.
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        return postgresql.insert(table).on_conflict_do_nothing(index_elements=index_elements)
+    if dialect == 'sqlite':
+        return sqlite.insert(table).on_conflict_do_nothing(index_elements=index_elements)
+    return insert(table)
+
+
+def _supports_returning():
+    return db.session.get_bind().dialect.name in ('postgresql', 'sqlite')
+
+
+def _existing_urls(urls):
+    """
+    Returns the subset of `urls` already stored, one query per chunk.
+    Archived postings count as stored, so a full refresh doesn't bring
+    expired ones back (see etl/retention.py).
+    """
+    found = set()
+    for chunk in _chunks(urls):
+        found.update(db.session.execute(
+            select(JobPosting.url).where(JobPosting.url.in_(chunk))
+            .union_all(select(ArchivedJobPosting.url).where(ArchivedJobPosting.url.in_(chunk)))
+        ).scalars())
+    return found
+
+
+def filter_known_urls(urls):
+    """
+    Returns which of `urls` are already in the database.
+    Runs in the caller's app context; etl.pipeline pushes one per call
+    from its extraction threads.
+    """
+    return _existing_urls(list(urls))
+
+
+def resolve_skill_ids(skill_names):
     """
-    Helper function to manage Skills.
-    If 'Python' exists, return the object.
-    If 'Python' does not exist, create it, add it to DB, and return it.
+    Maps every skill name to its id, creating the missing ones.
+    Uses one SELECT for the known skills and one multi-row INSERT for the new ones.
+
+    Returns:
+        tuple: ({name: id}, number_of_skills_created)
+    """
+    skill_names = sorted(set(skill_names))
+    if not skill_names:
+        return {}, 0
+
+    # 1. Look up everything we already know about
+    skill_ids = {}
+    for chunk in _chunks(skill_names):
+        skill_ids.update(db.session.execute(
+            select(Skill.name, Skill.id).where(Skill.name.in_(chunk))
+        ).all())
+
+    # 2. Create the rest in bulk, then re-read their ids
+    missing = [name for name in skill_names if name not in skill_ids]
+    created = 0
+    for chunk in _chunks(missing):
+        stmt = _insert_ignore(Skill.__table__, ['name'])
+        rows = [{'name': n} for n in chunk]
+        if _supports_returning():
+            # RETURNING only reports rows we really inserted (not conflicts)
+            created += len(db.session.execute(stmt.returning(Skill.id), rows).all())
+        else:
+            db.session.execute(stmt, rows)
+            created += len(chunk)
+        skill_ids.update(db.session.execute(
+            select(Skill.name, Skill.id).where(Skill.name.in_(chunk))
+        ).all())
+
+    return skill_ids, created
+
+
+def bulk_insert_jobs(cleaned_jobs):
+    """
+    Set-based loader used by `load_jobs_to_db`.
+    Must run inside an app context; the caller owns the commit.
+
+    Returns:
+        tuple: (inserted_count, skipped_count, near_duplicate_count)
     """
-    # 1. Check if skill exists
-    skill = Skill.query.filter_by(name=skill_name).first()
-    
-    # 2. If not, create it
-    if not skill:
-        skill = Skill(name=skill_name)
-        db.session.add(skill)
-        # We flush to get the ID immediately, but commit later
-        db.session.flush() 
-    
-    return skill
+    # 1. Drop in-batch duplicates and rows without a URL (first one wins)
+    batch = {}
+    for job in map(as_record, cleaned_jobs):
+        if job.url and job.url not in batch:
+            batch[job.url] = job
+
+    # 2. Dedupe the whole batch against the table in one pass
+    existing = _existing_urls(list(batch))
+    new_jobs = [job for url, job in batch.items() if url not in existing]
+
+    # 3. Resolve every skill mentioned in the batch at once
+    skill_ids, new_skills = resolve_skill_ids(name for job in new_jobs for name in job.skills)
+
+    # 4. Multi-row INSERT of the postings; ON CONFLICT covers concurrent writers.
+    #    Records become parameter dicts one chunk at a time, never ORM objects.
+    inserted_ids = {}
+    defaults = _column_defaults()
+    for chunk in _chunks(new_jobs):
+        rows = [dict(zip(JOB_COLUMNS, job)) for job in chunk]
+        for row in rows:
+            for name, value in defaults.items():
+                if row[name] is None:
+                    row[name] = value
+        stmt = _insert_ignore(JobPosting.__table__, ['url'])
+        if _supports_returning():
+            result = db.session.execute(stmt.returning(JobPosting.url, JobPosting.id), rows)
+            inserted_ids.update(result.all())
+        else:
+            db.session.execute(stmt, rows)
+            chunk_urls = [job.url for job in chunk]
+            inserted_ids.update(db.session.execute(
+                select(JobPosting.url, JobPosting.id).where(JobPosting.url.in_(chunk_urls))
+            ).all())
+
+    # 5. Link skills only for the rows we actually inserted
+    links = [
+        {'job_id': inserted_ids[job.url], 'skill_id': skill_ids[name]}
+        for job in new_jobs if job.url in inserted_ids
+        for name in set(job.skills)
+    ]
+    for chunk in _chunks(links):
+        db.session.execute(_insert_ignore(job_skills, ['job_id', 'skill_id']), chunk)
+
+    # 6. Near-duplicates (reposts, syndicated copies) are kept but linked to
+    #    the canonical posting, and left out of the dashboard counts
+    duplicates = link_near_duplicates([
+        (inserted_ids[job.url],
+         job.minhash if job.minhash is not None else minhash(job.title, job.company, job.description))
+        for job in new_jobs if job.url in inserted_ids
+    ])
+
+    # 7. Keep the full-text index, dashboard stats and data generation
+    #    in step (same transaction)
+    index_jobs(inserted_ids.values())
+    if inserted_ids:
+        record_load(len(inserted_ids) - len(duplicates), new_skills,
+                    (link['skill_id'] for link in links if link['job_id'] not in duplicates))
+        AppCounter.bump(JOBS_COUNTER)
+
+    inserted = len(inserted_ids)
+    return inserted, len(cleaned_jobs) - inserted, len(duplicates)
+
 
 def load_jobs_to_db(cleaned_jobs):
     """
-    Takes a list of cleaned job dictionaries and saves them to the database.
+    Takes a list of cleaned jobs (JobRecord tuples from transform_jobs, or
+    the older dict form) and saves them to the database.
+
+    Returns:
+        dict: {'inserted': int, 'skipped': int, 'failed': int, 'near_duplicates': int}
+              - skipped covers exact duplicates (already stored or repeated within
+              the batch) and rows without a URL; failed counts rows lost to a
+              rolled-back batch; near_duplicates are inserted rows linked to a
+              canonical posting.
     """
     print(f"--- Loading {len(cleaned_jobs)} jobs into the database ---")
-    
-    # We must push the application context to interact with Flask-SQLAlchemy
-    with app.app_context():
-        new_count = 0
-        skipped_count = 0
-        
-        for job_data in cleaned_jobs:
-            # 1. Check for Duplicates
-            # We use the URL as a unique identifier
-            existing_job = JobPosting.query.filter_by(url=job_data['url']).first()
-            if existing_job:
-                skipped_count += 1
-                continue # Skip this job, we already have it
-
-            # 2. Create the Job Object
-            new_job = JobPosting(
-                title=job_data['title'],
-                company=job_data['company'],
-                location=job_data['location'],
-                is_remote=job_data['is_remote'],
-                salary_min=job_data['salary_min'],
-                salary_max=job_data['salary_max'],
-                currency=job_data['currency'],
-                url=job_data['url'],
-                source_site=job_data['source_site'],
-                description=job_data['description'],
-                date_posted=job_data['date_posted']
-            )
-
-            # 3. Handle Relationships (The "Software Engineering" part)
-            # We loop through the list of skill strings ['Python', 'SQL']
-            # and convert them into actual Database Objects
-            for skill_name in job_data['skills']:
-                skill_obj = get_or_create_skill(skill_name)
-                new_job.skills.append(skill_obj)
-
-            # 4. Add to Session
-            db.session.add(new_job)
-            new_count += 1
-
-        # 5. Commit all changes
-        try:
-            db.session.commit()
-            print(f"SUCCESS: Added {new_count} new jobs. Skipped {skipped_count} duplicates.")
-        except Exception as e:
-            db.session.rollback()
-            print(f"CRITICAL ERROR during loading: {e}")
+
+    # Runs in the caller's app context and commits on its session
+    try:
+        new_count, skipped_count, near_dupes = bulk_insert_jobs(cleaned_jobs)
+        db.session.commit()
+        print(f"SUCCESS: Added {new_count} new jobs ({near_dupes} near-duplicates). "
+              f"Skipped {skipped_count} duplicates.")
+        return {'inserted': new_count, 'skipped': skipped_count, 'failed': 0,
+                'near_duplicates': near_dupes}
+    except Exception as e:
+        db.session.rollback()
+        print(f"CRITICAL ERROR during loading: {e}")
+        return {'inserted': 0, 'skipped': 0, 'failed': len(cleaned_jobs), 'near_duplicates': 0}
 
 # --- Test Block ---
 if __name__ == "__main__":
@@ -92,5 +236,10 @@ if __name__ == "__main__":
         'date_posted': None,
         'skills': ['Python', 'PostgreSQL'] # Note: PostgreSQL might be a new skill
     }]
-    
-    load_jobs_to_db(fake_cleaned)
\ No newline at end of file
+
+    from app import create_app, init_schema
+
+    app = create_app()
+    with app.app_context():
+        init_schema()
+        load_jobs_to_db(fake_cleaned)
@@ -0,0 +1,121 @@
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """
+    Peak resident memory in MB of this process or its largest reaped
+    child (e.g. a transform worker), or None where the OS can't tell us.
+    """
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in KB on Linux but in bytes on macOS
+    if sys.platform == 'darwin':
+        peak /= 1024
+    return round(peak / 1024, 1)
+
+
+def _empty_counts():
+    return {'transform_s': 0.0, 'load_s': 0.0,
+            'transformed': 0, 'inserted': 0, 'duplicates': 0, 'failed': 0}
+
+
+class RunMetrics:
+    """Thread-safe per-category stage timings and row counts for one pipeline run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.categories = {}
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def _category(self, category):
+        return self.categories.setdefault(category, _empty_counts())
+
+    def record_transform(self, category, seconds, rows):
+        with self._lock:
+            entry = self._category(category)
+            entry['transform_s'] += seconds
+            entry['transformed'] += rows
+
+    def record_load(self, category, seconds, result):
+        """`result` is the dict returned by load_jobs_to_db."""
+        with self._lock:
+            entry = self._category(category)
+            entry['load_s'] += seconds
+            entry['inserted'] += result['inserted']
+            entry['duplicates'] += result['skipped']
+            entry['failed'] += result.get('failed', 0)
+
+    def stop(self):
+        if self.finished is None:
+            self.finished = time.perf_counter()
+
+    def rows(self, extract_stats=None):
+        """
+        Flattens the run into one dict per category plus a run total
+        (category None), ready to be stored as PipelineMetric rows.
+
+        Args:
+            extract_stats (ExtractionStats): Supplies pages and HTTP latency.
+
+        Returns:
+            list: [{category, pages, http_errors, latency_p50_ms, latency_p95_ms,
+                    extract_s, transform_s, load_s, wall_s, transformed,
+                    inserted, duplicates, failed, peak_rss_mb}]
+        """
+        wall = (self.finished or time.perf_counter()) - self.started
+        with self._lock:
+            categories = {name: dict(entry) for name, entry in self.categories.items()}
+        if extract_stats is not None:
+            for name in extract_stats.categories:
+                categories.setdefault(name, _empty_counts())
+
+        rows = []
+        for name, entry in categories.items():
+            http = extract_stats.category_summary(name) if extract_stats is not None else {}
+            rows.append({
+                'category': name,
+                'pages': http.get('pages', 0),
+                'http_errors': http.get('errors', 0),
+                'latency_p50_ms': http.get('latency_p50_ms'),
+                'latency_p95_ms': http.get('latency_p95_ms'),
+                # Categories are fetched concurrently: time spent waiting on HTTP
+                'extract_s': http.get('fetch_s', 0.0),
+                'transform_s': round(entry['transform_s'], 3),
+                'load_s': round(entry['load_s'], 3),
+                'wall_s': None,
+                'transformed': entry['transformed'],
+                'inserted': entry['inserted'],
+                'duplicates': entry['duplicates'],
+                'failed': entry['failed'],
+                'peak_rss_mb': None,
+            })
+
+        http = extract_stats.summary() if extract_stats is not None else {}
+        rows.append({
+            'category': None,
+            'pages': http.get('pages', 0),
+            'http_errors': http.get('errors', 0),
+            'latency_p50_ms': http.get('latency_p50_ms'),
+            'latency_p95_ms': http.get('latency_p95_ms'),
+            # Run level: wall-clock time of the extract stage
+            'extract_s': http.get('elapsed_s', 0.0),
+            'transform_s': round(sum(r['transform_s'] for r in rows), 3),
+            'load_s': round(sum(r['load_s'] for r in rows), 3),
+            'wall_s': round(wall, 3),
+            'transformed': sum(r['transformed'] for r in rows),
+            'inserted': sum(r['inserted'] for r in rows),
+            'duplicates': sum(r['duplicates'] for r in rows),
+            'failed': sum(r['failed'] for r in rows),
+            'peak_rss_mb': peak_rss_mb(),
+        })
+        return rows
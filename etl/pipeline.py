@@ -0,0 +1,196 @@
+import queue
+import threading
+import time
+from functools import wraps
+
+from flask import current_app
+
+from .extract import iter_category_pages, ExtractionStats, MAX_PAGES
+from .transform import transform_jobs, TRANSFORM_WORKERS
+from .load import load_jobs_to_db, filter_known_urls
+from .metrics import RunMetrics
+from .watermarks import WatermarkTracker, load_watermarks, save_watermarks
+
+# Define the categories we want to track
+SEARCH_CATEGORIES = [
+    "Software Engineer",
+    "Data Scientist",
+    "Cyber Security",
+    "IT Support",
+    "Information Systems"
+]
+
+# Default number of cleaned jobs committed per loader transaction.
+# A crash loses at most one chunk.
+BATCH_SIZE = 500
+
+# How many chunks may wait between transform and load before the
+# transform stage blocks (backpressure).
+QUEUE_SIZE = 4
+
+_DONE = object()
+
+
+class _StageError:
+    """Carries an exception from a worker thread back to the loader."""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def _in_app_context(app, func):
+    """Wraps `func` so every call runs in its own context of `app` (for worker threads)."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with app.app_context():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _transform_stage(pages, out, batch_size, transform_workers, metrics, app, stop):
+    """
+    Consumes (category, page, raw_jobs) tuples, buffers them into
+    per-category batches of `batch_size` raw jobs and transforms each
+    batch in one go (so the process pool gets enough work to share).
+    Gives up early once `stop` is set (the load stage failed).
+    """
+    def transform(category, raw_jobs):
+        started = time.perf_counter()
+        with app.app_context():  # the skill matcher checks the taxonomy version
+            clean = transform_jobs(raw_jobs, workers=transform_workers)
+        metrics.record_transform(category, time.perf_counter() - started, len(clean))
+        out.put((category, clean))
+
+    buffers = {}
+    try:
+        for category, _page, raw_jobs in pages:
+            if stop.is_set():
+                return
+            buffer = buffers.setdefault(category, [])
+            buffer.extend(raw_jobs)
+            while len(buffer) >= batch_size:
+                transform(category, buffer[:batch_size])
+                del buffer[:batch_size]
+
+        # Flush whatever is left for every category
+        for category, buffer in buffers.items():
+            if buffer:
+                transform(category, buffer)
+    except Exception as e:
+        out.put(_StageError(e))
+    finally:
+        # Stops the extraction threads at once instead of whenever the
+        # generator happens to be garbage-collected
+        pages.close()
+        out.put(_DONE)
+
+
+def run_streaming(categories, location="South Africa", batch_size=BATCH_SIZE,
+                  queue_size=QUEUE_SIZE, max_pages=MAX_PAGES, stop_on_known=True,
+                  transform_workers=TRANSFORM_WORKERS, stats=None, metrics=None,
+                  on_progress=None, full_refresh=False, **extract_kwargs):
+    """
+    Runs extract -> transform -> load as overlapping stages with bounded memory.
+
+    Extraction threads feed pages into a bounded queue, a transform thread
+    turns them into fixed-size chunks (optionally on a process pool), and
+    the calling thread loads and commits each chunk as it arrives. Every
+    queue is bounded, so a slow stage makes the faster ones wait instead
+    of piling data up in memory.
+
+    Must run inside an app context; chunks are committed on its session.
+
+    Runs are incremental: each category only fetches postings newer than
+    the high-water mark left by the last successful run, and the marks are
+    advanced once everything fetched for a category has been loaded.
+
+    Args:
+        categories (list): Search terms to extract.
+        batch_size (int): Cleaned jobs per loader commit.
+        queue_size (int): Chunks buffered between transform and load.
+        max_pages (int): Page limit per category (raise it for a backfill).
+        stop_on_known (bool): Stop paging a category once a page holds only
+            URLs that are already stored.
+        transform_workers (int): Processes used by the transform stage.
+        stats (ExtractionStats): Optional collector for extraction metrics.
+        metrics (RunMetrics): Optional collector for transform/load timings.
+        on_progress (callable): Called after every committed chunk with
+            {'pages_fetched', 'rows_transformed', 'rows_inserted'} so far.
+        full_refresh (bool): Ignore the watermarks (and the known-URL early
+            stop) and walk up to `max_pages` for every category.
+
+    Returns:
+        dict: {category: {'transformed': int, 'inserted': int, 'skipped': int, 'failed': int}}
+    """
+    # Worker threads borrow the caller's app for their database lookups
+    app = current_app._get_current_object()
+    stats = stats if stats is not None else ExtractionStats()
+    metrics = metrics if metrics is not None else RunMetrics()
+    # A replay re-runs recorded pages as-is; watermark windows would change the cache keys
+    full_refresh = full_refresh or extract_kwargs.get('replay', False)
+    watermarks = {} if full_refresh else load_watermarks(categories, location)
+    tracker = WatermarkTracker()
+    pages = iter_category_pages(
+        categories, location, max_pages=max_pages, stats=stats,
+        filter_known=_in_app_context(app, filter_known_urls) if stop_on_known and not full_refresh else None,
+        watermarks=watermarks, tracker=tracker, **extract_kwargs
+    )
+    chunks = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    transformer = threading.Thread(target=_transform_stage,
+                                   args=(pages, chunks, batch_size, transform_workers, metrics, app, stop),
+                                   name='devpulse-transform', daemon=True)
+    transformer.start()
+
+    totals = {category: {'transformed': 0, 'inserted': 0, 'skipped': 0, 'failed': 0}
+              for category in categories}
+    error = None
+    try:
+        while True:
+            item = chunks.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _StageError):
+                error = item.error
+                continue
+
+            category, clean_chunk = item
+            started = time.perf_counter()
+            result = load_jobs_to_db(clean_chunk)
+            metrics.record_load(category, time.perf_counter() - started, result)
+            totals[category]['transformed'] += len(clean_chunk)
+            totals[category]['inserted'] += result['inserted']
+            totals[category]['skipped'] += result['skipped']
+            totals[category]['failed'] += result['failed']
+
+            if on_progress:
+                on_progress({
+                    'pages_fetched': len(stats.latencies),
+                    'rows_transformed': sum(t['transformed'] for t in totals.values()),
+                    'rows_inserted': sum(t['inserted'] for t in totals.values()),
+                })
+    finally:
+        # On a load failure, tell the transformer to stop and keep draining
+        # so it isn't left blocked on the full queue
+        stop.set()
+        while transformer.is_alive():
+            try:
+                chunks.get(timeout=0.1)
+            except queue.Empty:
+                pass
+    transformer.join()
+    metrics.stop()
+    if error:
+        raise error
+
+    # Only advance a category whose walk caught up with the stored data and
+    # whose pages were all fetched and loaded; otherwise the next run must
+    # look at the same window again. A walk stopped by max_pages keeps the
+    # old mark, or the postings between its last page and that mark would
+    # never be fetched.
+    complete = {category: mark for category, mark in tracker.marks.items()
+                if category in tracker.complete and totals[category]['failed'] == 0
+                and stats.category_summary(category)['errors'] == 0}
+    if complete:
+        save_watermarks(complete, location)
+    return totals
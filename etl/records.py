@@ -0,0 +1,70 @@
+"""
+Compact in-memory form of a cleaned posting, passed from transform to load.
+
+A JobRecord is a NamedTuple: 13 slots and no per-posting dict. It pickles as
+a bare tuple, so transform worker processes send less back. The first
+fields are the job_postings columns in insert order, so the loader turns a
+record into INSERT parameters with a single zip.
+
+Strings that repeat across postings (company, location, currency, source
+site, skill names) are interned. Each posting then holds an 8-byte reference
+to one shared copy instead of its own string.
+"""
+import sys
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+
+def _intern(value):
+    # None (a missing company or location) is stored as-is
+    return sys.intern(value) if type(value) is str else value
+
+
+class JobRecord(NamedTuple):
+    title: str
+    company: str
+    location: str
+    is_remote: int
+    salary_min: Optional[float]
+    salary_max: Optional[float]
+    currency: str
+    url: Optional[str]
+    source_site: str
+    description: str
+    date_posted: Optional[datetime]
+    skills: tuple = ()             # interned canonical names, e.g. ('Python', 'SQL')
+    minhash: Optional[bytes] = None
+
+    @classmethod
+    def build(cls, title, company, location, is_remote, salary_min, salary_max, currency,
+              url, source_site, description, date_posted, skills=(), minhash=None):
+        """Creates a record with its repeated strings interned."""
+        return cls(title, _intern(company), _intern(location), is_remote, salary_min, salary_max,
+                   _intern(currency), url, _intern(source_site), description, date_posted,
+                   tuple(_intern(name) for name in skills), minhash)
+
+    @classmethod
+    def from_dict(cls, job):
+        """Accepts the old 12-key dict form (tests, scripts, fake data)."""
+        return cls.build(
+            job['title'], job['company'], job['location'], job['is_remote'],
+            job['salary_min'], job['salary_max'], job['currency'], job['url'],
+            job['source_site'], job['description'], job['date_posted'],
+            job.get('skills', ()), job.get('minhash'),
+        )
+
+    def interned(self):
+        """
+        The same record with its shared strings interned again. Records
+        unpickled from a worker process carry fresh copies of every string.
+        """
+        return self.build(*self)
+
+
+# Leading fields that map 1:1 onto job_postings columns (see etl.load.JOB_COLUMNS)
+COLUMN_FIELDS = JobRecord._fields[:11]
+
+
+def as_record(job):
+    """Returns `job` as a JobRecord (records pass through untouched)."""
+    return job if isinstance(job, JobRecord) else JobRecord.from_dict(job)
@@ -0,0 +1,283 @@
+"""
+Retention: keeps job_postings down to an active window (e.g. 90 days).
+
+Postings whose date_posted falls before the window are moved, oldest first
+and in batches, into job_postings_archive (and their skill links into
+job_skills_archive). Each batch is one transaction that:
+
+    1. rolls the batch's skill and salary numbers up into archive_rollups
+       (per posting month), so the monthly trends keep their history
+    2. copies the postings and skill links into the archive tables
+    3. removes them from the full-text index, the near-duplicate tables
+       and the live tables; a duplicate whose canonical posting leaves
+       becomes canonical itself (or points at the one that did)
+    4. bumps the data generation
+
+After the last batch the dashboard stats are recomputed and the SQLite
+full-text index is merged, so searches don't keep skipping the deleted
+entries.
+
+Run it with 'flask --app run retention archive', or set RETENTION_DAYS to
+archive after every successful pipeline run.
+"""
+import os
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import bindparam, delete, func, literal, select
+
+from app import db
+from app.models import (AppCounter, ArchivedJobPosting, ArchiveRollup, JobFingerprint,
+                        JobLshBucket, JobPosting, job_skills, job_skills_archive, JOBS_COUNTER)
+from app.search import optimize_search_index, unindex_jobs
+from app.stats import refresh_stats
+from etl.dedupe import buckets
+from etl.load import _chunks
+
+# Active window in days; when set, every successful pipeline run archives
+RETENTION_DAYS = int(os.environ['RETENTION_DAYS']) if os.environ.get('RETENTION_DAYS') else None
+DEFAULT_DAYS = 90
+
+# Postings moved per transaction
+BATCH_SIZE = 2000
+
+# ArchiveRollup.skill_id of a month's totals row
+ALL_SKILLS = 0
+
+# Columns copied verbatim from job_postings into job_postings_archive
+COPIED_COLUMNS = ('id', 'title', 'company', 'location', 'is_remote', 'salary_min', 'salary_max',
+                  'currency', 'url', 'source_site', 'date_posted', 'description')
+
+
+def salary_midpoint(salary_min, salary_max):
+    """Midpoint of the advertised range, or whichever end exists (None if neither is positive)."""
+    if salary_min is None or salary_max is None:
+        value = salary_max if salary_min is None else salary_min
+    else:
+        value = (salary_min + salary_max) / 2
+    return value if value is not None and value > 0 else None
+
+
+def _roll_up(postings, skills_by_job):
+    """
+    Adds the canonical postings of one batch to archive_rollups.
+
+    Args:
+        postings (list): Rows of (id, date_posted, salary_min, salary_max, canonical_id).
+        skills_by_job (dict): {job_id: [skill_id]}.
+    """
+    # 1. Aggregate in memory: {(month, skill_id): [jobs, tagged, salaried, sum, min, max]}
+    totals = {}
+    for job_id, date_posted, salary_min, salary_max, canonical_id in postings:
+        if canonical_id is not None:
+            continue
+        month = date_posted.date().replace(day=1)
+        skill_ids = skills_by_job.get(job_id, ())
+        salary = salary_midpoint(salary_min, salary_max)
+        for skill_id in (ALL_SKILLS, *skill_ids):
+            entry = totals.setdefault((month, skill_id), [0, 0, 0, 0.0, None, None])
+            entry[0] += 1
+            entry[1] += bool(skill_ids)
+            if salary is not None:
+                entry[2] += 1
+                entry[3] += salary
+                entry[4] = salary if entry[4] is None else min(entry[4], salary)
+                entry[5] = salary if entry[5] is None else max(entry[5], salary)
+    if not totals:
+        return
+
+    # 2. Merge into the stored rows (a few hundred at most: months x skills)
+    months = sorted({month for month, _ in totals})
+    stored = {(r.month, r.skill_id): r
+              for r in ArchiveRollup.query.filter(ArchiveRollup.month.in_(months))}
+    for key, (jobs, tagged, salaried, salary_sum, low, high) in totals.items():
+        row = stored.get(key)
+        if row is None:
+            db.session.add(ArchiveRollup(month=key[0], skill_id=key[1], jobs=jobs, tagged_jobs=tagged,
+                                         salaried=salaried, salary_sum=salary_sum,
+                                         salary_min=low, salary_max=high))
+            continue
+        row.jobs += jobs
+        row.tagged_jobs += tagged
+        row.salaried += salaried
+        row.salary_sum += salary_sum
+        if low is not None:
+            row.salary_min = low if row.salary_min is None else min(row.salary_min, low)
+            row.salary_max = high if row.salary_max is None else max(row.salary_max, high)
+
+
+def _promote_duplicates(canonical_ids, leaving):
+    """
+    Re-points the near-duplicates of archived canonical postings: the oldest
+    remaining copy becomes canonical (and gets LSH buckets), the others link
+    to it. Keeps them counted on the dashboard and findable by the dedupe.
+
+    Returns:
+        int: Postings promoted to canonical.
+    """
+    survivors = {}  # old canonical id -> [(job_id, minhash)]
+    for chunk in _chunks(sorted(canonical_ids)):
+        rows = db.session.execute(
+            select(JobFingerprint.canonical_id, JobFingerprint.job_id, JobFingerprint.minhash)
+            .where(JobFingerprint.canonical_id.in_(chunk)).order_by(JobFingerprint.job_id)
+        ).all()
+        for canonical_id, job_id, signature in rows:
+            if job_id not in leaving:
+                survivors.setdefault(canonical_id, []).append((job_id, signature))
+    if not survivors:
+        return 0
+
+    fingerprints = JobFingerprint.__table__
+    links, bucket_rows = [], []
+    for copies in survivors.values():
+        promoted, signature = copies[0]
+        links.append({'b_job_id': promoted, 'b_canonical_id': None})
+        links.extend({'b_job_id': job_id, 'b_canonical_id': promoted} for job_id, _ in copies[1:])
+        bucket_rows.extend({'bucket': b, 'job_id': promoted} for b in set(buckets(signature)))
+
+    db.session.execute(
+        fingerprints.update().where(fingerprints.c.job_id == bindparam('b_job_id'))
+        .values(canonical_id=bindparam('b_canonical_id')),
+        links
+    )
+    for chunk in _chunks(bucket_rows):
+        db.session.execute(JobLshBucket.__table__.insert(), chunk)
+    return len(survivors)
+
+
+def expired_job_ids(cutoff, limit, below_id):
+    """
+    Ids of the oldest postings dated before `cutoff` (at most `limit`, all
+    with an id below `below_id`), read from ix_job_postings_date_posted_id.
+    """
+    return db.session.execute(
+        select(JobPosting.id).where(JobPosting.date_posted < cutoff, JobPosting.id < below_id)
+        .order_by(JobPosting.date_posted, JobPosting.id).limit(limit)
+    ).scalars().all()
+
+
+def archive_batch(job_ids, archived_at=None):
+    """
+    Moves one batch of postings into the archive tables. Runs in the
+    caller's transaction.
+
+    Args:
+        job_ids (list): Ids of the postings to move (at most a few thousand).
+
+    Returns:
+        dict: {'jobs', 'skill_links', 'promoted'}
+    """
+    archived_at = archived_at or datetime.utcnow()
+    leaving = set(job_ids)
+    totals = {'jobs': 0, 'skill_links': 0, 'promoted': 0}
+
+    # 1. Read what the rollups need: dates, salaries, dedupe links, skill ids
+    postings, skills_by_job = [], {}
+    for chunk in _chunks(job_ids):
+        postings.extend(db.session.execute(
+            select(JobPosting.id, JobPosting.date_posted, JobPosting.salary_min,
+                   JobPosting.salary_max, JobFingerprint.canonical_id)
+            .outerjoin(JobFingerprint, JobFingerprint.job_id == JobPosting.id)
+            .where(JobPosting.id.in_(chunk))
+        ).all())
+        for job_id, skill_id in db.session.execute(
+                select(job_skills.c.job_id, job_skills.c.skill_id).where(job_skills.c.job_id.in_(chunk))):
+            skills_by_job.setdefault(job_id, []).append(skill_id)
+    _roll_up(postings, skills_by_job)
+
+    # 2. Copy the rows across with INSERT ... SELECT (nothing goes through Python)
+    archive = ArchivedJobPosting.__table__
+    for chunk in _chunks(job_ids):
+        db.session.execute(archive.insert().from_select(
+            [*COPIED_COLUMNS, 'canonical_id', 'archived_at'],
+            select(*(JobPosting.__table__.c[name] for name in COPIED_COLUMNS),
+                   JobFingerprint.canonical_id, literal(archived_at, db.DateTime))
+            .outerjoin(JobFingerprint, JobFingerprint.job_id == JobPosting.id)
+            .where(JobPosting.id.in_(chunk))
+        ))
+        totals['skill_links'] += db.session.execute(job_skills_archive.insert().from_select(
+            ['job_id', 'skill_id'],
+            select(job_skills.c.job_id, job_skills.c.skill_id).where(job_skills.c.job_id.in_(chunk))
+        )).rowcount
+
+    # 3. FTS5 needs the old column values, so unindex before deleting
+    unindex_jobs(job_ids)
+    totals['promoted'] = _promote_duplicates(
+        [job_id for job_id, _, _, _, canonical_id in postings if canonical_id is None], leaving)
+
+    # 4. Children first (foreign keys), then the postings
+    for chunk in _chunks(job_ids):
+        db.session.execute(delete(JobLshBucket).where(JobLshBucket.job_id.in_(chunk)))
+        db.session.execute(delete(JobFingerprint).where(JobFingerprint.job_id.in_(chunk)))
+        db.session.execute(delete(job_skills).where(job_skills.c.job_id.in_(chunk)))
+        totals['jobs'] += db.session.execute(delete(JobPosting).where(JobPosting.id.in_(chunk))).rowcount
+
+    # 5. The new generation drops cached pages and analytics. The dashboard
+    #    stats are recomputed once by archive_expired, not per batch.
+    AppCounter.bump(JOBS_COUNTER)
+    return totals
+
+
+def archive_expired(days=DEFAULT_DAYS, batch_size=BATCH_SIZE, now=None):
+    """
+    Archives every posting older than `days`, oldest first, committing each
+    batch so an interrupted run loses nothing and can simply be re-run.
+    Must run inside an app context.
+
+    Returns:
+        dict: {'jobs', 'skill_links', 'promoted', 'batches', 'cutoff', 'seconds', 'rows_per_s'}
+    """
+    if days < 1:
+        raise ValueError("The active window must be at least one day")
+    cutoff = (now or datetime.utcnow()) - timedelta(days=days)
+    totals = {'jobs': 0, 'skill_links': 0, 'promoted': 0, 'batches': 0}
+    start = time.perf_counter()
+
+    # The newest posting always stays: SQLite hands out max(id) + 1, so
+    # archiving it would let the next insert reuse an archived id
+    newest_id = db.session.execute(select(func.max(JobPosting.id))).scalar()
+    while newest_id is not None:
+        job_ids = expired_job_ids(cutoff, batch_size, newest_id)
+        if not job_ids:
+            break
+        moved = archive_batch(job_ids)
+        db.session.commit()
+
+        totals['batches'] += 1
+        for key, value in moved.items():
+            totals[key] += value
+        elapsed = time.perf_counter() - start
+        print(f"--- Archived {totals['jobs']} jobs ({totals['jobs'] / elapsed:.0f} rows/s) ---")
+
+    if totals['jobs']:
+        # Counts changed in ways record_load can't express
+        refresh_stats()
+        db.session.commit()
+        optimize_search_index()
+    elapsed = time.perf_counter() - start
+    totals.update(cutoff=cutoff, seconds=round(elapsed, 2),
+                  rows_per_s=round(totals['jobs'] / elapsed, 1) if elapsed else 0.0)
+    return totals
+
+
+def retention_status(days=DEFAULT_DAYS, now=None):
+    """
+    Row counts on either side of the active window.
+
+    Returns:
+        dict: {'active', 'expired', 'archived', 'oldest_active', 'rollup_months', 'cutoff'}
+    """
+    cutoff = (now or datetime.utcnow()) - timedelta(days=days)
+    active, oldest = db.session.execute(
+        select(func.count(JobPosting.id), func.min(JobPosting.date_posted))
+    ).one()
+    return {
+        'active': active,
+        'expired': db.session.execute(
+            select(func.count(JobPosting.id)).where(JobPosting.date_posted < cutoff)).scalar(),
+        'archived': db.session.execute(select(func.count(ArchivedJobPosting.id))).scalar(),
+        'oldest_active': oldest,
+        'rollup_months': db.session.execute(
+            select(func.count(func.distinct(ArchiveRollup.month)))).scalar(),
+        'cutoff': cutoff,
+    }
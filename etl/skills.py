@@ -0,0 +1,103 @@
+import re
+
+# 1. Define the default Skill Dictionary
+# The live dictionary is stored in the database (see etl/taxonomy.py);
+# these defaults seed it and act as a fallback when it is unreachable.
+TARGET_SKILLS = [
+    'Python', 'SQL', 'Java', 'C#', 'AWS', 'Azure', 'GCP',
+    'Docker', 'Kubernetes', 'Spark', 'Hadoop', 'Databricks',
+    'Flask', 'Django', 'React', 'Power BI', 'Tableau', 'Excel'
+]
+
+# 2. Categories used when seeding the database taxonomy
+SKILL_CATEGORIES = {
+    'Python': 'Language', 'SQL': 'Language', 'Java': 'Language', 'C#': 'Language',
+    'AWS': 'Cloud', 'Azure': 'Cloud', 'GCP': 'Cloud',
+    'Docker': 'DevOps', 'Kubernetes': 'DevOps',
+    'Spark': 'Big Data', 'Hadoop': 'Big Data', 'Databricks': 'Big Data',
+    'Flask': 'Framework', 'Django': 'Framework', 'React': 'Framework',
+    'Power BI': 'BI', 'Tableau': 'BI', 'Excel': 'BI',
+}
+
+# 3. Alternative spellings that should count as the canonical skill
+SKILL_ALIASES = {
+    'C#': ['csharp', 'c sharp'],
+    'AWS': ['Amazon Web Services'],
+    'GCP': ['Google Cloud Platform'],
+    'Kubernetes': ['k8s'],
+    'Spark': ['PySpark', 'Apache Spark'],
+    'React': ['React.js', 'ReactJS'],
+    'Power BI': ['PowerBI', 'Power-BI'],
+}
+
+
+def _trie_pattern(node):
+    """
+    Turns a character trie into a regex fragment.
+    Shared prefixes are factored out ('java' / 'javascript' becomes
+    'java(?:script)?'), so the regex engine does roughly the same work per
+    character whether the dictionary holds 18 skills or 18,000.
+    """
+    terminal = '' in node
+    branches = []
+    for char in sorted(k for k in node if k):
+        token = r'\s+' if char == ' ' else re.escape(char)
+        tail = _trie_pattern(node[char])
+        branches.append(token + (tail or ''))
+
+    if not branches:
+        return None
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if terminal:
+        # Greedy '?' prefers the longest skill at this position
+        body = '(?:' + body + ')?'
+    return body
+
+
+class SkillMatcher:
+    """
+    Finds every known skill in a text with a single regex scan.
+
+    All canonical names and aliases are compiled once into one trie-shaped
+    alternation. Boundaries are "not a word character" look-arounds instead
+    of \\b, so symbol-bearing skills such as 'C#' or 'C++' match correctly.
+    """
+
+    def __init__(self, skills=TARGET_SKILLS, aliases=None):
+        aliases = SKILL_ALIASES if aliases is None else aliases
+
+        # Lower-cased, whitespace-normalised spelling -> canonical name
+        self.lookup = {}
+        for skill in skills:
+            self.lookup[self._normalise(skill)] = skill
+        for skill, spellings in aliases.items():
+            for spelling in spellings:
+                self.lookup.setdefault(self._normalise(spelling), skill)
+
+        # Results come back in dictionary order, as they always have
+        self.order = {skill: i for i, skill in enumerate(dict.fromkeys(self.lookup.values()))}
+
+        trie = {}
+        for spelling in self.lookup:
+            node = trie
+            for char in spelling:
+                node = node.setdefault(char, {})
+            node[''] = True
+
+        body = _trie_pattern(trie) if trie else None
+        self.pattern = re.compile(r'(?<!\w)' + body + r'(?!\w)') if body else None
+
+    @staticmethod
+    def _normalise(text):
+        return ' '.join(text.lower().split())
+
+    def find(self, text):
+        """
+        Returns the unique canonical skills mentioned in `text`
+        (e.g. ['Python', 'AWS']).
+        """
+        if not self.pattern or not text:
+            return []
+        found = {self.lookup[self._normalise(m)] for m in self.pattern.findall(text.lower())}
+        return sorted(found, key=self.order.__getitem__)
+
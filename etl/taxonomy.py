@@ -0,0 +1,214 @@
+import threading
+import time
+
+from flask import has_app_context
+from sqlalchemy import select, delete
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import db
+from app.models import AppCounter, JobPosting, Skill, SkillAlias, job_skills, JOBS_COUNTER
+from app.stats import TOTAL_SKILLS, increment_stat, refresh_stats
+from etl.skills import SkillMatcher, TARGET_SKILLS, SKILL_ALIASES, SKILL_CATEGORIES
+
+# Name of the AppCounter row bumped on every taxonomy change
+TAXONOMY_COUNTER = 'skill_taxonomy'
+
+# Seconds between version checks; each check is one tiny SELECT
+CHECK_INTERVAL = 30
+
+RETAG_BATCH_SIZE = 500
+
+
+def seed_taxonomy():
+    """
+    Fills the taxonomy with the defaults from etl/skills.py.
+    Existing skills keep their category; only missing rows are added.
+    """
+    known = dict(db.session.execute(select(Skill.name, Skill.id)).all())
+    for name in TARGET_SKILLS:
+        if name not in known:
+            skill = Skill(name=name, category=SKILL_CATEGORIES.get(name))
+            db.session.add(skill)
+            db.session.flush()
+            known[name] = skill.id
+            increment_stat(TOTAL_SKILLS, 1)
+        else:
+            db.session.execute(
+                db.update(Skill).where(Skill.id == known[name], Skill.category.is_(None))
+                .values(category=SKILL_CATEGORIES.get(name))
+            )
+
+    taken = set(db.session.execute(select(SkillAlias.alias)).scalars())
+    for name, spellings in SKILL_ALIASES.items():
+        for alias in spellings:
+            if alias not in taken:
+                db.session.add(SkillAlias(skill_id=known[name], alias=alias))
+
+    AppCounter.bump(TAXONOMY_COUNTER)
+    db.session.commit()
+
+
+def load_taxonomy():
+    """
+    Reads the skill dictionary from the database, seeding it on first use.
+
+    Returns:
+        tuple: (version, [skill names], {skill name: [aliases]})
+    """
+    version = AppCounter.get(TAXONOMY_COUNTER)
+    if version is None:
+        seed_taxonomy()
+        version = AppCounter.get(TAXONOMY_COUNTER)
+
+    names = list(db.session.execute(select(Skill.name).order_by(Skill.id)).scalars())
+    aliases = {}
+    for name, alias in db.session.execute(
+        select(Skill.name, SkillAlias.alias).join(SkillAlias.skill).order_by(SkillAlias.id)
+    ):
+        aliases.setdefault(name, []).append(alias)
+    return version, names, aliases
+
+
+class TaxonomyCache:
+    """
+    Keeps the compiled SkillMatcher in memory and rebuilds it only when the
+    taxonomy version in the database changes. The version itself is checked
+    at most once every `check_interval` seconds.
+    """
+
+    def __init__(self, check_interval=CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self.version = None
+        self.matcher = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Forces a version check on the next call."""
+        self._checked_at = 0.0
+
+    def get_matcher(self):
+        now = time.monotonic()
+        if self.matcher is not None and now - self._checked_at < self.check_interval:
+            return self.matcher
+
+        with self._lock:
+            if self.matcher is not None and now - self._checked_at < self.check_interval:
+                return self.matcher
+            if not has_app_context():
+                # Standalone transform (no database): the built-in taxonomy
+                if self.matcher is None:
+                    self.matcher = SkillMatcher()
+                return self.matcher
+            try:
+                version = AppCounter.get(TAXONOMY_COUNTER)
+                if version is None or version != self.version:
+                    version, names, aliases = load_taxonomy()
+                    self.matcher = SkillMatcher(names, aliases)
+                    self.version = version
+                    print(f"--- Skill taxonomy v{version} compiled ({len(names)} skills) ---")
+            except SQLAlchemyError as e:
+                # A failed statement aborts the transaction on Postgres
+                db.session.rollback()
+                print(f"WARNING: Could not load skill taxonomy, using defaults: {e}")
+                if self.matcher is None:
+                    self.matcher = SkillMatcher()
+            self._checked_at = now
+            return self.matcher
+
+
+_cache = TaxonomyCache()
+
+
+def get_matcher():
+    """Returns the shared matcher for the current taxonomy version."""
+    return _cache.get_matcher()
+
+
+def add_skill(name, category=None, aliases=()):
+    """
+    Adds a skill (or updates its category) plus any new aliases,
+    and bumps the taxonomy version so every process recompiles.
+
+    Returns:
+        dict: The skill's name, category, aliases and the new taxonomy version.
+    """
+    load_taxonomy()  # make sure the defaults are seeded first
+
+    skill = Skill.query.filter_by(name=name).first()
+    if not skill:
+        skill = Skill(name=name)
+        db.session.add(skill)
+        increment_stat(TOTAL_SKILLS, 1)
+    if category:
+        skill.category = category
+    db.session.flush()
+
+    taken = set(db.session.execute(
+        select(SkillAlias.alias).where(SkillAlias.alias.in_(list(aliases)))
+    ).scalars())
+    for alias in aliases:
+        if alias not in taken:
+            db.session.add(SkillAlias(skill_id=skill.id, alias=alias))
+
+    version = AppCounter.bump(TAXONOMY_COUNTER)
+    db.session.commit()
+    result = {
+        'name': skill.name,
+        'category': skill.category,
+        'aliases': [a.alias for a in skill.aliases],
+        'version': version,
+    }
+
+    _cache.invalidate()
+    return result
+
+
+def retag_jobs(batch_size=RETAG_BATCH_SIZE, on_batch=None):
+    """
+    Re-runs the skill matcher over every stored JobPosting and rewrites
+    their job_skills rows. Walks the table by id in batches and commits
+    each batch, so it can be interrupted and re-run safely. `on_batch` is
+    called with the running totals after every commit.
+
+    Returns:
+        dict: {'jobs': int, 'links': int}
+    """
+    from etl.load import resolve_skill_ids
+
+    _cache.invalidate()
+    matcher = get_matcher()
+    totals = {'jobs': 0, 'links': 0}
+
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            select(JobPosting.id, JobPosting.title, JobPosting.description)
+            .where(JobPosting.id > last_id).order_by(JobPosting.id).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+
+        found = {job_id: matcher.find(f"{title} {description or ''}") for job_id, title, description in rows}
+        skill_ids, _created = resolve_skill_ids(name for names in found.values() for name in names)
+        links = [{'job_id': job_id, 'skill_id': skill_ids[name]}
+                 for job_id, names in found.items() for name in names]
+
+        db.session.execute(delete(job_skills).where(job_skills.c.job_id.in_(list(found))))
+        if links:
+            db.session.execute(job_skills.insert(), links)
+        db.session.commit()
+
+        last_id = rows[-1].id
+        totals['jobs'] += len(rows)
+        totals['links'] += len(links)
+        print(f"--- Re-tagged {totals['jobs']} jobs ({totals['links']} skill links) ---")
+        if on_batch:
+            on_batch(totals)
+
+    # Skill counts changed wholesale, so recompute the dashboard stats
+    refresh_stats()
+    AppCounter.bump(JOBS_COUNTER)
+    db.session.commit()
+
+    return totals
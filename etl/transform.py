@@ -1,16 +1,16 @@
-import pandas as pd
-from bs4 import BeautifulSoup
-import re
+import atexit
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
-# 1. Define the Skill Dictionary
-# These are the keywords we will search for in every job description.
-# In a production app, this might live in a database table.
-TARGET_SKILLS = [
-    'Python', 'SQL', 'Java', 'C#', 'AWS', 'Azure', 'GCP', 
-    'Docker', 'Kubernetes', 'Spark', 'Hadoop', 'Databricks',
-    'Flask', 'Django', 'React', 'Power BI', 'Tableau', 'Excel'
-]
+from etl.dedupe import minhash
+from etl.records import JobRecord
+from etl.taxonomy import get_matcher
+
+# Parallel transform settings (TRANSFORM_WORKERS=4 enables the process pool)
+TRANSFORM_WORKERS = int(os.environ.get('TRANSFORM_WORKERS', 1))
+CHUNK_SIZE = 250          # Max jobs sent to a worker process at a time
+PARALLEL_MIN_JOBS = 100   # Smaller batches are not worth the IPC overhead
 
 def clean_html(raw_html):
     """
@@ -18,86 +18,138 @@ def clean_html(raw_html):
     """
     if not raw_html:
         return ""
+    # Fast path: no tags and no entities means there is nothing to parse
+    if '<' not in raw_html and '&' not in raw_html:
+        return raw_html.strip()
+    from bs4 import BeautifulSoup  # loaded on the first HTML description only
+
     soup = BeautifulSoup(raw_html, 'html.parser')
     return soup.get_text(separator=' ').strip()
 
-def extract_skills_from_text(text):
+def extract_skills_from_text(text, matcher=None):
     """
-    Scans the text for target skills.
+    Scans the text for target skills (and their aliases) in a single pass.
     Returns a list of unique skills found (e.g., ['Python', 'AWS']).
     """
-    found_skills = []
-    # Normalize text to lowercase for searching
-    text_lower = text.lower()
-    
-    for skill in TARGET_SKILLS:
-        # Use regex to find the skill as a whole word (avoids matching 'Java' inside 'JavaScript')
-        # \b means "word boundary"
-        pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-        if re.search(pattern, text_lower):
-            found_skills.append(skill)
-            
-    return found_skills
-
-def transform_jobs(raw_jobs_list):
+    return (matcher or get_matcher()).find(text)
+
+def transform_job(job, matcher):
+    """
+    Cleans a single raw Adzuna job. Raises on malformed input;
+    callers decide how to isolate the failure.
+    """
+    # 1. Clean the Description
+    # Adzuna returns 'description' as a snippet, sometimes full text is hard to get via API
+    # We work with what we have.
+    raw_desc = job.get('description', '')
+    clean_desc = clean_html(raw_desc)
+
+    # 2. Extract Skills
+    # We combine title and description to improve detection chances
+    full_text = f"{job.get('title', '')} {clean_desc}"
+    skills_found = extract_skills_from_text(full_text, matcher)
+
+    # 3. Normalize Salary
+    # Adzuna gives min/max. We store them, but sometimes they are 0 or None.
+    s_min = job.get('salary_min')
+    s_max = job.get('salary_max')
+
+    # 4. Normalize Date
+    # Adzuna format: "2024-01-05T12:00:00Z" -> Python datetime object
+    date_str = job.get('created', datetime.utcnow().isoformat())
+    try:
+        date_obj = datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%SZ")
+    except ValueError:
+        date_obj = datetime.utcnow()
+
+    # 5. Fingerprint for near-duplicate detection (reposts, syndication)
+    title = job.get('title', 'Unknown Title')
+    company = job.get('company', {}).get('display_name', 'Unknown Company')
+    fingerprint = minhash(title, company, clean_desc)
+
+    # 6. Build the Clean Object (a compact record, see etl/records.py)
+    return JobRecord.build(
+        title=title,
+        company=company,
+        location=job.get('location', {}).get('display_name', 'South Africa'),
+        is_remote=1 if 'remote' in full_text.lower() else 0, # Simple detection
+        salary_min=s_min,
+        salary_max=s_max,
+        currency='ZAR', # API Default for 'za' endpoint
+        url=job.get('redirect_url'),
+        source_site='Adzuna',
+        description=clean_desc,
+        date_posted=date_obj,
+        skills=skills_found,  # Tuple of names ('Python', 'SQL')
+        minhash=fingerprint,
+    )
+
+def _transform_chunk(raw_jobs, matcher=None):
+    """
+    Transforms a list of jobs, skipping (and reporting) the ones that fail.
+    In a worker process `matcher` is None and the one sent at start-up is used.
+    """
+    matcher = matcher or _worker_matcher
+    cleaned = []
+    for job in raw_jobs:
+        try:
+            cleaned.append(transform_job(job, matcher))
+        except Exception as e:
+            print(f"WARNING: Error transforming job: {e}")
+    return cleaned
+
+# --- Process pool (parallel mode) ---
+# The pool is created on first use and reused across calls; it is rebuilt
+# only when the worker count or the compiled skill matcher changes.
+_worker_matcher = None
+_pool = None
+_pool_key = None
+
+def _init_worker(matcher):
+    global _worker_matcher
+    _worker_matcher = matcher
+
+def _get_pool(workers, matcher):
+    global _pool, _pool_key
+    if _pool is None or _pool_key != (workers, id(matcher)):
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(matcher,))
+        _pool_key = (workers, id(matcher))
+    return _pool
+
+@atexit.register
+def _shutdown_pool():
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+
+def transform_jobs(raw_jobs_list, workers=TRANSFORM_WORKERS, chunk_size=CHUNK_SIZE):
     """
     Main transformation function.
     Args:
         raw_jobs_list (list): The list of dicts from Adzuna API.
+        workers (int): Processes to shard the work across. 1 (the default)
+            runs in-process, as do batches under PARALLEL_MIN_JOBS.
+        chunk_size (int): Max jobs sent to a worker process at a time.
     Returns:
-        list: A list of cleaned, structured dictionaries ready for the DB.
+        list: JobRecord tuples ready for the DB, in the same order as
+              the input (failed jobs are skipped).
     """
-    cleaned_data = []
+    # Fetch the compiled matcher once per batch, not once per job
+    matcher = get_matcher()
 
     print(f"--- Transforming {len(raw_jobs_list)} raw jobs ---")
 
-    for job in raw_jobs_list:
-        try:
-            # 1. Clean the Description
-            # Adzuna returns 'description' as a snippet, sometimes full text is hard to get via API
-            # We work with what we have.
-            raw_desc = job.get('description', '')
-            clean_desc = clean_html(raw_desc)
-            
-            # 2. Extract Skills
-            # We combine title and description to improve detection chances
-            full_text = f"{job.get('title', '')} {clean_desc}"
-            skills_found = extract_skills_from_text(full_text)
-            
-            # 3. Normalize Salary
-            # Adzuna gives min/max. We store them, but sometimes they are 0 or None.
-            s_min = job.get('salary_min')
-            s_max = job.get('salary_max')
-            
-            # 4. Normalize Date
-            # Adzuna format: "2024-01-05T12:00:00Z" -> Python datetime object
-            date_str = job.get('created', datetime.utcnow().isoformat())
-            try:
-                date_obj = datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%SZ")
-            except ValueError:
-                date_obj = datetime.utcnow()
-
-            # 5. Build the Clean Object
-            clean_job = {
-                'title': job.get('title', 'Unknown Title'),
-                'company': job.get('company', {}).get('display_name', 'Unknown Company'),
-                'location': job.get('location', {}).get('display_name', 'South Africa'),
-                'is_remote': 1 if 'remote' in full_text.lower() else 0, # Simple detection
-                'salary_min': s_min,
-                'salary_max': s_max,
-                'currency': 'ZAR', # API Default for 'za' endpoint
-                'url': job.get('redirect_url'),
-                'source_site': 'Adzuna',
-                'description': clean_desc,
-                'date_posted': date_obj,
-                'skills': skills_found  # List of strings ['Python', 'SQL']
-            }
-            
-            cleaned_data.append(clean_job)
-            
-        except Exception as e:
-            print(f"WARNING: Error transforming job: {e}")
-            continue
+    if workers > 1 and len(raw_jobs_list) >= PARALLEL_MIN_JOBS:
+        # Spread the batch over every worker, but keep each shard bounded
+        size = min(chunk_size, -(-len(raw_jobs_list) // workers))
+        chunks = [raw_jobs_list[i:i + size] for i in range(0, len(raw_jobs_list), size)]
+        # map() yields results in submission order, so output order is preserved
+        # Records come back unpickled, with private copies of every string: re-intern them
+        cleaned_data = [job.interned() for part in _get_pool(workers, matcher).map(_transform_chunk, chunks)
+                        for job in part]
+    else:
+        cleaned_data = _transform_chunk(raw_jobs_list, matcher)
 
     print(f"SUCCESS: Transformed {len(cleaned_data)} jobs.")
     return cleaned_data
@@ -118,4 +170,4 @@ if __name__ == "__main__":
     
     result = transform_jobs(fake_raw)
     print("\n--- TRANSFORMATION RESULT ---")
-    print(result[0]['skills']) # Should print ['Python', 'Azure']
\ No newline at end of file
+    print(result[0].skills) # Should print ('Python', 'Azure')
\ No newline at end of file
@@ -0,0 +1,108 @@
+import json
+import math
+import threading
+from datetime import datetime
+
+from app import db
+from app.models import ExtractionWatermark
+
+# Adzuna's timestamp format, e.g. "2024-01-05T12:00:00Z"
+CREATED_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def parse_created(job):
+    """The posting's 'created' timestamp, or None if missing/unparseable."""
+    try:
+        return datetime.strptime(job.get('created', ''), CREATED_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+class Watermark:
+    """The newest posting time seen for a category and the URLs at that instant."""
+
+    def __init__(self, created, urls=()):
+        self.created = created
+        self.urls = set(urls)
+
+    def is_new(self, job):
+        created = parse_created(job)
+        if created is None:
+            return True  # can't tell - let the loader's URL check decide
+        return created > self.created or (created == self.created and job.get('redirect_url') not in self.urls)
+
+    def max_days_old(self, now=None):
+        """Smallest whole-day window that still reaches back to the watermark."""
+        age = (now or datetime.utcnow()) - self.created
+        return max(1, math.ceil(age.total_seconds() / 86400) + 1)
+
+    def advanced(self, other):
+        """The later of two watermarks (merging URL sets on a tie)."""
+        if other is None or self.created > other.created:
+            return self
+        if other.created > self.created:
+            return other
+        return Watermark(self.created, self.urls | other.urls)
+
+
+class WatermarkTracker:
+    """
+    Thread-safe collector of the newest posting seen per category during a
+    run, and of the categories whose walk caught up with what was stored.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.marks = {}
+        self.complete = set()
+
+    def caught_up(self, category):
+        """The walk reached the old watermark or the last page."""
+        with self._lock:
+            self.complete.add(category)
+
+    def observe(self, category, jobs):
+        newest, urls = None, set()
+        for job in jobs:
+            created = parse_created(job)
+            if created is None:
+                continue
+            if newest is None or created > newest:
+                newest, urls = created, set()
+            if created == newest and job.get('redirect_url'):
+                urls.add(job['redirect_url'])
+        if newest is None:
+            return
+        with self._lock:
+            self.marks[category] = Watermark(newest, urls).advanced(self.marks.get(category))
+
+
+def load_watermarks(categories, location):
+    """
+    Returns:
+        dict: {category: Watermark} for the categories that have one.
+    """
+    rows = ExtractionWatermark.query.filter(
+        ExtractionWatermark.category.in_(categories), ExtractionWatermark.location == location
+    ).all()
+    return {row.category: Watermark(row.latest_created, json.loads(row.boundary_urls or '[]'))
+            for row in rows}
+
+
+def save_watermarks(marks, location):
+    """
+    Advances the stored watermarks to `marks` ({category: Watermark}).
+    A watermark never moves backwards.
+    """
+    for category, mark in marks.items():
+        row = db.session.get(ExtractionWatermark, (category, location))
+        if row is None:
+            row = ExtractionWatermark(category=category, location=location)
+            db.session.add(row)
+            stored = None
+        else:
+            stored = Watermark(row.latest_created, json.loads(row.boundary_urls or '[]'))
+        mark = mark.advanced(stored)
+        row.latest_created = mark.created
+        row.boundary_urls = json.dumps(sorted(mark.urls))
+    db.session.commit()
@@ -0,0 +1,37 @@
+"""add query indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 13:08:51
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+# if_not_exists: databases created by 'flask schema init' (or by older app
+# versions at startup) and then stamped at 0001 already have these indexes.
+def upgrade():
+    # Newest-first listings: dashboard, /api/jobs keyset pages
+    op.create_index('ix_job_postings_date_posted_id', 'job_postings', ['date_posted', 'id'],
+                    unique=False, if_not_exists=True)
+    # Reverse of the (job_id, skill_id) primary key: skill filters and per-skill counts
+    op.create_index('ix_job_skills_skill_id_job_id', 'job_skills', ['skill_id', 'job_id'],
+                    unique=False, if_not_exists=True)
+    op.create_index('ix_pipeline_logs_run_date', 'pipeline_logs', ['run_date'],
+                    unique=False, if_not_exists=True)
+    op.create_index('ix_skill_aliases_skill_id', 'skill_aliases', ['skill_id'],
+                    unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_skill_aliases_skill_id', table_name='skill_aliases', if_exists=True)
+    op.drop_index('ix_pipeline_logs_run_date', table_name='pipeline_logs', if_exists=True)
+    op.drop_index('ix_job_skills_skill_id_job_id', table_name='job_skills', if_exists=True)
+    op.drop_index('ix_job_postings_date_posted_id', table_name='job_postings', if_exists=True)
@@ -0,0 +1,69 @@
+"""add archive tables
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 14:05:12
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+# Retention (etl/retention.py): expired postings, their skill links and the
+# monthly rollups that keep their trends
+def upgrade():
+    op.create_table('archive_rollups',
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('skill_id', sa.Integer(), nullable=False),
+    sa.Column('jobs', sa.Integer(), nullable=False),
+    sa.Column('tagged_jobs', sa.Integer(), nullable=False),
+    sa.Column('salaried', sa.Integer(), nullable=False),
+    sa.Column('salary_sum', sa.Float(), nullable=False),
+    sa.Column('salary_min', sa.Float(), nullable=True),
+    sa.Column('salary_max', sa.Float(), nullable=True),
+    sa.PrimaryKeyConstraint('month', 'skill_id'),
+    if_not_exists=True
+    )
+    op.create_table('job_postings_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('company', sa.String(length=255), nullable=False),
+    sa.Column('location', sa.String(length=255), nullable=True),
+    sa.Column('is_remote', sa.Boolean(), nullable=True),
+    sa.Column('salary_min', sa.Float(), nullable=True),
+    sa.Column('salary_max', sa.Float(), nullable=True),
+    sa.Column('currency', sa.String(length=10), nullable=True),
+    sa.Column('url', sa.String(length=500), nullable=False),
+    sa.Column('source_site', sa.String(length=50), nullable=False),
+    sa.Column('date_posted', sa.DateTime(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('canonical_id', sa.Integer(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('url'),
+    if_not_exists=True
+    )
+    op.create_index('ix_job_postings_archive_date_posted', 'job_postings_archive', ['date_posted'],
+                    unique=False, if_not_exists=True)
+    op.create_table('job_skills_archive',
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('skill_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['job_id'], ['job_postings_archive.id'], ),
+    sa.ForeignKeyConstraint(['skill_id'], ['skills.id'], ),
+    sa.PrimaryKeyConstraint('job_id', 'skill_id'),
+    if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_table('job_skills_archive', if_exists=True)
+    op.drop_index('ix_job_postings_archive_date_posted', table_name='job_postings_archive', if_exists=True)
+    op.drop_table('job_postings_archive', if_exists=True)
+    op.drop_table('archive_rollups', if_exists=True)
@@ -1,79 +1,65 @@
 from dotenv import load_dotenv
 load_dotenv()
 
-from app import create_app, db
-from app.models import PipelineLog, JobPosting
-from etl.extract import extract_jobs
-from etl.transform import transform_jobs
-from etl.load import load_jobs_to_db
+from app import create_app
+from config import ETLConfig
+from app.runner import QUEUED, enqueue_run, claim_run, execute_run
+from etl.extract import MAX_PAGES, HTTP_CACHE_DIR
+from etl.pipeline import BATCH_SIZE, SEARCH_CATEGORIES
+from etl.transform import TRANSFORM_WORKERS
+import argparse
 import sys
 import datetime
 
-# Define the categories we want to track
-SEARCH_CATEGORIES = [
-    "Software Engineer",
-    "Data Scientist",
-    "Cyber Security",
-    "IT Support",
-    "Information Systems"
-]
-
-def run():
-    app = create_app()
+def run(batch_size=BATCH_SIZE, max_pages=MAX_PAGES, transform_workers=TRANSFORM_WORKERS,
+        full_refresh=False, cache_dir=HTTP_CACHE_DIR, replay=False):
+    app = create_app(ETLConfig)
     
     print("=========================================")
     print("   STARTING DEVPULSE DATA PIPELINE")
     print("=========================================")
 
-    total_new_jobs = 0
-    logs = []
-
     # We need app context to save the Log to the DB
     with app.app_context():
-        try:
-            for category in SEARCH_CATEGORIES:
-                print(f"\n--- Processing Category: {category} ---")
-                
-                # 1. Extract
-                raw_data = extract_jobs(query=category, location="South Africa")
-                
-                if not raw_data:
-                    print(f"Skipping {category}: No data found.")
-                    continue
-
-                # 2. Transform
-                clean_data = transform_jobs(raw_data)
-
-                # 3. Load
-                # We need to capture how many were actually added (vs duplicates)
-                # Note: We are approximating here based on list size for simplicity
-                load_jobs_to_db(clean_data)
-                total_new_jobs += len(clean_data)
-
-            # 4. Log Success
-            log_entry = PipelineLog(
-                status='Success',
-                jobs_found=total_new_jobs,
-                details=f"Ran categories: {', '.join(SEARCH_CATEGORIES)}"
-            )
-            db.session.add(log_entry)
-            db.session.commit()
-            print("\n>> Pipeline Logged to Database: SUCCESS")
+        # 1. Queue the run through the same run lock the web trigger uses,
+        # so a cron run and a browser-triggered run never overlap.
+        log, created = enqueue_run(categories=SEARCH_CATEGORIES, batch_size=batch_size,
+                                   max_pages=max_pages, transform_workers=transform_workers,
+                                   full_refresh=full_refresh, cache_dir=cache_dir, replay=replay)
+        if not created and log.status != QUEUED:
+            print(f"Run #{log.id} is already {log.status.lower()}; nothing to do.")
+            return
 
-        except Exception as e:
-            # 5. Log Failure
-            print(f"CRITICAL PIPELINE ERROR: {e}")
-            log_entry = PipelineLog(
-                status='Failed',
-                jobs_found=0,
-                details=str(e)
-            )
-            db.session.add(log_entry)
-            db.session.commit()
+        # 2. Claim it (or a run queued from the web that no worker has taken
+        # yet, with its own options) and run Extract -> Transform -> Load in
+        # this process. Progress is written to pipeline_progress after every chunk.
+        run_id = claim_run(log.id)
+        if run_id is None:
+            print(f"Run #{log.id} was picked up by a background worker.")
+            return
+        status = execute_run(run_id)
+        print(f"\n>> Pipeline Logged to Database: {status.upper()}")
 
     print("=========================================")
     print("   PIPELINE FINISHED")
     print("=========================================")
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the DevPulse ETL pipeline.")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                        help='Jobs committed per loader transaction')
+    parser.add_argument('--max-pages', type=int, default=MAX_PAGES,
+                        help='Page limit per category (raise it for a historical backfill)')
+    parser.add_argument('--transform-workers', type=int, default=TRANSFORM_WORKERS,
+                        help='Processes used to clean HTML and match skills')
+    parser.add_argument('--full-refresh', action='store_true',
+                        help='Ignore the per-category watermarks and re-walk every page')
+    parser.add_argument('--http-cache', default=HTTP_CACHE_DIR, metavar='DIR',
+                        help='Record raw API pages in DIR and reuse them while fresh')
+    parser.add_argument('--replay', action='store_true',
+                        help='Run from the pages recorded in --http-cache only (no network)')
+    args = parser.parse_args()
+    if args.replay and not args.http_cache:
+        parser.error('--replay needs --http-cache DIR (or HTTP_CACHE_DIR)')
+    run(batch_size=args.batch_size, max_pages=args.max_pages, transform_workers=args.transform_workers,
+        full_refresh=args.full_refresh, cache_dir=args.http_cache, replay=args.replay)
\ No newline at end of file
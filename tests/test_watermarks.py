@@ -0,0 +1,103 @@
+"""
+Watermarks across runs, against a stub of the search API.
+
+Usage:
+    python -m pytest -q tests
+"""
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(_tmp.name, 'test.db')
+os.environ.setdefault('ADZUNA_APP_ID', 'test')
+os.environ.setdefault('ADZUNA_APP_KEY', 'test')
+
+from app import create_app, db, init_schema
+from app.models import JobPosting
+from etl.pipeline import run_streaming
+from etl.watermarks import CREATED_FORMAT, load_watermarks
+
+CATEGORY = 'A'
+LOCATION = 'South Africa'
+PER_PAGE = 50
+
+
+def posting(n, created):
+    return {'title': f'Engineer {n}', 'company': {'display_name': 'Acme'},
+            'location': {'display_name': 'Cape Town'}, 'description': 'python',
+            'redirect_url': f'https://stub.example/{n}', 'created': created.strftime(CREATED_FORMAT)}
+
+
+class StubApi(BaseHTTPRequestHandler):
+    """Serves `postings` newest first, paged by the path, honouring max_days_old."""
+    postings = []
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        page = int(url.path.rsplit('/', 1)[-1])
+        params = parse_qs(url.query)
+        results = sorted(self.postings, key=lambda job: job['created'], reverse=True)
+        if 'max_days_old' in params:
+            oldest = datetime.utcnow() - timedelta(days=int(params['max_days_old'][0]))
+            results = [job for job in results if job['created'] >= oldest.strftime(CREATED_FORMAT)]
+        per_page = int(params['results_per_page'][0])
+        body = json.dumps({'results': results[(page - 1) * per_page:page * per_page]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubApi)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    now = datetime.utcnow().replace(microsecond=0)
+    StubApi.postings = [posting(n, now - timedelta(hours=n + 1)) for n in range(120)]
+    yield f'http://127.0.0.1:{server.server_port}/jobs/{{page}}'
+    server.shutdown()
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    with app.app_context():
+        db.drop_all()
+        init_schema()
+        yield app
+
+
+def run(search_url, **kwargs):
+    return run_streaming([CATEGORY], LOCATION, results_per_page=PER_PAGE, transform_workers=1,
+                         search_url=search_url, cache_dir=None, **kwargs)[CATEGORY]
+
+
+def test_truncated_run_then_full_run(app, api):
+    # 1. Cut short by the page limit: newest 100 loaded, no watermark
+    assert run(api, max_pages=2)['inserted'] == 100
+    assert load_watermarks([CATEGORY], LOCATION) == {}
+
+    # 2. Page 1 is all known URLs: the walk stops, and must not save a
+    #    watermark, or the 20 older postings could never be fetched
+    assert run(api, max_pages=10)['transformed'] == 0
+    assert load_watermarks([CATEGORY], LOCATION) == {}
+
+    # 3. A full walk reaches the last page: the rest is loaded, the mark saved
+    assert run(api, max_pages=10, full_refresh=True)['inserted'] == 20
+    assert JobPosting.query.count() == 120
+    assert CATEGORY in load_watermarks([CATEGORY], LOCATION)
+
+    # 4. From then on only postings newer than the watermark are fetched
+    StubApi.postings.append(posting(120, datetime.utcnow().replace(microsecond=0)))
+    assert run(api, max_pages=10) == {'transformed': 1, 'inserted': 1, 'skipped': 0, 'failed': 0}
+    assert JobPosting.query.count() == 121